@@ -0,0 +1,41 @@
+"""add version columns for optimistic concurrency
+
+Revision ID: 5e2a9c1f7d3b
+Revises: 1c4bd058a11d
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2a9c1f7d3b"
+down_revision: Union[str, Sequence[str], None] = "1c4bd058a11d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = (
+    "offers",
+    "applications",
+    "institutions",
+    "programs",
+    "candidate_profiles",
+)
+
+
+def upgrade():
+    # a constant server default makes this a metadata-only change on
+    # PostgreSQL 11+, existing rows start at version 1 without a rewrite
+    for table in VERSIONED_TABLES:
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.drop_column(table, "version")
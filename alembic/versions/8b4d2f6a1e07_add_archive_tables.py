@@ -0,0 +1,69 @@
+"""add archive tables for retention of soft-deleted rows
+
+Revision ID: 8b4d2f6a1e07
+Revises: 5e2a9c1f7d3b
+Create Date: 2026-10-19 10:03:17.482911
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8b4d2f6a1e07"
+down_revision: Union[str, Sequence[str], None] = "5e2a9c1f7d3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Archive tables mirror the live table's columns (no FKs, no unique
+# constraints besides the PK) plus `archived_at`. Migrations that add
+# columns to a live table must add them to its archive too: the retention
+# job copies every mapped column except those in retention._NOT_ARCHIVED.
+# candidate_profiles is archived so deleted users are not pinned by it.
+ARCHIVED_TABLES = ("offers", "applications", "candidate_profiles", "users")
+
+
+def upgrade():
+    for table in ARCHIVED_TABLES:
+        op.execute(
+            f"CREATE TABLE {table}_archive "
+            f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        op.add_column(
+            f"{table}_archive",
+            sa.Column(
+                "archived_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.text("now()"),
+            ),
+        )
+        op.create_primary_key(f"pk_{table}_archive", f"{table}_archive", ["id"])
+        op.create_index(
+            f"ix_{table}_archive_archived_at", f"{table}_archive", ["archived_at"]
+        )
+    # credentials are not kept once the account is archived
+    op.drop_column("users_archive", "hashed_password")
+    # user_roles rows are removed by ON DELETE CASCADE; keep the role names
+    op.add_column(
+        "users_archive",
+        sa.Column("roles", sa.ARRAY(sa.String(length=100)), nullable=True),
+    )
+
+    # the job scans `deleted_at < cutoff`; partial indexes keep that cheap
+    # without growing the indexes used by the hot (deleted_at IS NULL) paths
+    for table in ARCHIVED_TABLES:
+        op.create_index(
+            f"ix_{table}_deleted_at_not_null",
+            table,
+            ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+        )
+
+
+def downgrade():
+    for table in ARCHIVED_TABLES:
+        op.drop_index(f"ix_{table}_deleted_at_not_null", table_name=table)
+        op.drop_table(f"{table}_archive")
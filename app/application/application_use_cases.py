@@ -15,6 +15,7 @@ from app.domain.errors import (
     BusinessRuleViolation,
 )
 from app.domain.offer import OfferStatus
+from app.domain.unit_of_work import UnitOfWork
 
 
 class CreateApplication:
@@ -23,10 +24,12 @@ class CreateApplication:
         repo: ApplicationRepository,
         offer_repo: OfferRepository,
         profile_repo: CandidateProfileRepository,
+        uow: UnitOfWork,
     ):
         self.repo = repo
         self.offer_repo = offer_repo
         self.profile_repo = profile_repo
+        self.uow = uow
 
     async def execute(self, candidate_profile_id: UUID, offer_id: UUID) -> Application:
         # validate offer exists and not expired
@@ -74,7 +77,10 @@ class CreateApplication:
         application = Application(
             candidate_profile_id=candidate_profile_id, offer_id=offer_id
         )
-        return await self.repo.create(application)
+        async with self.uow:
+            created = await self.repo.create(application)
+            await self.uow.commit()
+        return created
 
 
 class ListApplicationsByOffer:
@@ -148,22 +154,31 @@ class ListApplicationsByCandidate:
 
 
 class UpdateApplication:
-    def __init__(self, repo: ApplicationRepository):
+    def __init__(self, repo: ApplicationRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
-    async def execute(self, application: Application) -> Application:
-        current = await self.repo.get_by_id(application.id)
-        if not current:
-            raise NotFoundError(
-                message="Application not found",
-                details=[{"field": "id", "reason": "not found"}],
-            )
-        return await self.repo.update(application)
+    async def execute(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Application:
+        # single conditional UPDATE; no read-before-write
+        async with self.uow:
+            updated = await self.repo.update_fields(id, changes, expected_version)
+            if not updated:
+                raise NotFoundError(
+                    message="Application not found",
+                    details=[{"field": "id", "reason": "not found"}],
+                )
+            await self.uow.commit()
+        return updated
 
 
 class DeleteApplication:
-    def __init__(self, repo: ApplicationRepository):
+    def __init__(self, repo: ApplicationRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(self, id: UUID, deleted_by: UUID, reason: Optional[str] = None):
-        return await self.repo.soft_delete(id, deleted_by, reason)
+        async with self.uow:
+            await self.repo.soft_delete(id, deleted_by, reason)
+            await self.uow.commit()
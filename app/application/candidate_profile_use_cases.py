@@ -2,14 +2,22 @@ from typing import Optional
 from uuid import UUID
 from app.domain.candidate_profile import CandidateProfile
 from app.domain.candidate_profile_repository import CandidateProfileRepository
+from app.domain.user import User
 from app.domain.user_repository import UserRepository
 from app.domain.errors import ValidationError, NotFoundError, ConflictError
+from app.domain.unit_of_work import UnitOfWork
 
 
 class CreateCandidateProfile:
-    def __init__(self, repo: CandidateProfileRepository, user_repo: UserRepository):
+    def __init__(
+        self,
+        repo: CandidateProfileRepository,
+        user_repo: UserRepository,
+        uow: UnitOfWork,
+    ):
         self.repo = repo
         self.user_repo = user_repo
+        self.uow = uow
 
     async def execute(
         self,
@@ -17,26 +25,36 @@ class CreateCandidateProfile:
         full_name: str,
         date_of_birth: Optional[str] = None,
         cpf: Optional[str] = None,
+        created_user: Optional[User] = None,
     ) -> CandidateProfile:
-        # validate user exists
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            raise NotFoundError(
-                message="User not found",
-                details=[{"field": "user_id", "reason": "not found"}],
-            )
-        # ensure unique: no existing profile for user
-        existing = await self.repo.get_by_user_id(user_id)
-        if existing:
-            raise ConflictError(
-                message="CandidateProfile already exists for user",
-                details=[{"field": "user_id", "reason": "unique"}],
-            )
+        """
+        `created_user`: the user a nested use case just inserted in this unit
+        of work (RegisterUser); it is neither read back nor checked for an
+        existing profile.
+        """
+        if created_user is None:
+            # validate user exists
+            user = await self.user_repo.get_by_id(user_id)
+            if not user:
+                raise NotFoundError(
+                    message="User not found",
+                    details=[{"field": "user_id", "reason": "not found"}],
+                )
+            # ensure unique: no existing profile for user
+            existing = await self.repo.get_by_user_id(user_id)
+            if existing:
+                raise ConflictError(
+                    message="CandidateProfile already exists for user",
+                    details=[{"field": "user_id", "reason": "unique"}],
+                )
 
         profile = CandidateProfile(
             user_id=user_id, full_name=full_name, date_of_birth=date_of_birth, cpf=cpf
         )
-        return await self.repo.create(profile)
+        async with self.uow:
+            created = await self.repo.create(profile)
+            await self.uow.commit()
+        return created
 
 
 class GetCandidateProfileById:
@@ -56,22 +74,31 @@ class GetCandidateProfileByUserId:
 
 
 class UpdateCandidateProfile:
-    def __init__(self, repo: CandidateProfileRepository):
+    def __init__(self, repo: CandidateProfileRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
-    async def execute(self, profile: CandidateProfile) -> CandidateProfile:
-        current = await self.repo.get_by_id(profile.id)
-        if not current:
-            raise NotFoundError(
-                message="CandidateProfile not found",
-                details=[{"field": "id", "reason": "not found"}],
-            )
-        return await self.repo.update(profile)
+    async def execute(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> CandidateProfile:
+        # single conditional UPDATE; no read-before-write
+        async with self.uow:
+            updated = await self.repo.update_fields(id, changes, expected_version)
+            if not updated:
+                raise NotFoundError(
+                    message="CandidateProfile not found",
+                    details=[{"field": "id", "reason": "not found"}],
+                )
+            await self.uow.commit()
+        return updated
 
 
 class DeleteCandidateProfile:
-    def __init__(self, repo: CandidateProfileRepository):
+    def __init__(self, repo: CandidateProfileRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(self, id: UUID, deleted_by: UUID, reason: Optional[str] = None):
-        return await self.repo.soft_delete(id, deleted_by, reason)
+        async with self.uow:
+            await self.repo.soft_delete(id, deleted_by, reason)
+            await self.uow.commit()
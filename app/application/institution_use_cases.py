@@ -5,17 +5,22 @@ from datetime import datetime
 from app.domain.institution import Institution
 from app.domain.institution_repository import InstitutionRepository
 from app.domain.errors import NotFoundError
+from app.domain.unit_of_work import UnitOfWork
 
 
 class CreateInstitution:
-    def __init__(self, repo: InstitutionRepository):
+    def __init__(self, repo: InstitutionRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(
         self, name: str, description: Optional[str] = None
     ) -> Institution:
         institution = Institution(name=name, description=description)
-        return await self.repo.create(institution)
+        async with self.uow:
+            created = await self.repo.create(institution)
+            await self.uow.commit()
+        return created
 
 
 class ListInstitutions:
@@ -37,25 +42,38 @@ class GetInstitutionById:
 
 
 class UpdateInstitution:
-    def __init__(self, repo: InstitutionRepository):
+    def __init__(self, repo: InstitutionRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
-    async def execute(self, institution: Institution) -> Institution:
-        current = await self.repo.get_by_id(institution.id)
-        if not current:
-            raise NotFoundError(
-                message="Institution not found",
-                details=[{"field": "id", "reason": "not found"}],
+    async def execute(
+        self,
+        institution_id: UUID,
+        changes: dict,
+        expected_version: Optional[int] = None,
+    ) -> Institution:
+        # single conditional UPDATE; no read-before-write
+        async with self.uow:
+            updated = await self.repo.update_fields(
+                institution_id, changes, expected_version
             )
-        # basic update
-        return await self.repo.update(institution)
+            if not updated:
+                raise NotFoundError(
+                    message="Institution not found",
+                    details=[{"field": "id", "reason": "not found"}],
+                )
+            await self.uow.commit()
+        return updated
 
 
 class DeleteInstitution:
-    def __init__(self, repo: InstitutionRepository):
+    def __init__(self, repo: InstitutionRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(
         self, institution_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ):
-        return await self.repo.soft_delete(institution_id, deleted_by, reason)
+        async with self.uow:
+            await self.repo.soft_delete(institution_id, deleted_by, reason)
+            await self.uow.commit()
@@ -6,6 +6,7 @@ from app.domain.offer import Offer, OfferStatus, OfferType
 from app.domain.offer_repository import OfferRepository
 from app.domain.institution_repository import InstitutionRepository
 from app.domain.program_repository import ProgramRepository
+from app.domain.unit_of_work import UnitOfWork
 from app.domain.errors import ValidationError, NotFoundError
 
 
@@ -15,10 +16,12 @@ class CreateOffer:
         repo: OfferRepository,
         institution_repo: InstitutionRepository,
         program_repo: ProgramRepository,
+        uow: UnitOfWork,
     ):
         self.repo = repo
         self.institution_repo = institution_repo
         self.program_repo = program_repo
+        self.uow = uow
 
     async def execute(
         self,
@@ -68,7 +71,10 @@ class CreateOffer:
             publication_date=publication_date,
             application_deadline=application_deadline,
         )
-        return await self.repo.create(offer)
+        async with self.uow:
+            created = await self.repo.create(offer)
+            await self.uow.commit()
+        return created
 
 
 class ListOffers:
@@ -101,47 +107,47 @@ class GetOfferById:
 
 
 class UpdateOffer:
-    def __init__(self, repo: OfferRepository):
+    def __init__(self, repo: OfferRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
-    async def execute(self, offer: Offer) -> Offer:
-        # Buscar registro atual
-        current = await self.repo.get_by_id(offer.id)
-        if not current:
-            raise NotFoundError(
-                message="Offer not found",
-                details=[{"field": "id", "reason": "not found"}],
+    async def execute(
+        self, offer_id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Offer:
+        # Quando as duas datas vêm no payload valida aqui; quando só uma muda,
+        # a constraint ck_offer_deadline_after_publication valida contra o
+        # registro atual no próprio UPDATE (sem leitura prévia)
+        pub = changes.get("publication_date")
+        deadline = changes.get("application_deadline")
+        if pub and deadline and deadline <= pub:
+            raise ValidationError(
+                message="application_deadline must be after publication_date",
+                details=[
+                    {
+                        "field": "application_deadline",
+                        "reason": "must be after publication_date",
+                    }
+                ],
             )
-        # Verifica se algum dos campos foi alterado
-        pub_changed = (
-            offer.publication_date
-            and offer.publication_date != current.publication_date
-        )
-        deadline_changed = (
-            offer.application_deadline
-            and offer.application_deadline != current.application_deadline
-        )
-        if pub_changed or deadline_changed:
-            pub = offer.publication_date or current.publication_date
-            deadline = offer.application_deadline or current.application_deadline
-            if deadline <= pub:
-                raise ValidationError(
-                    message="application_deadline must be after publication_date",
-                    details=[
-                        {
-                            "field": "application_deadline",
-                            "reason": "must be after publication_date",
-                        }
-                    ],
+        async with self.uow:
+            updated = await self.repo.update_fields(offer_id, changes, expected_version)
+            if not updated:
+                raise NotFoundError(
+                    message="Offer not found",
+                    details=[{"field": "id", "reason": "not found"}],
                 )
-        return await self.repo.update(offer)
+            await self.uow.commit()
+        return updated
 
 
 class DeleteOffer:
-    def __init__(self, repo: OfferRepository):
+    def __init__(self, repo: OfferRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(
         self, offer_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ):
-        return await self.repo.soft_delete(offer_id, deleted_by, reason)
+        async with self.uow:
+            await self.repo.soft_delete(offer_id, deleted_by, reason)
+            await self.uow.commit()
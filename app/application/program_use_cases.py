@@ -6,14 +6,19 @@ from app.domain.program import Program
 from app.domain.program_repository import ProgramRepository
 from app.domain.institution_repository import InstitutionRepository
 from app.domain.errors import NotFoundError
+from app.domain.unit_of_work import UnitOfWork
 
 
 class CreateProgram:
     def __init__(
-        self, repo: ProgramRepository, institution_repo: InstitutionRepository
+        self,
+        repo: ProgramRepository,
+        institution_repo: InstitutionRepository,
+        uow: UnitOfWork,
     ):
         self.repo = repo
         self.institution_repo = institution_repo
+        self.uow = uow
 
     async def execute(
         self, institution_id: UUID, name: str, description: Optional[str] = None
@@ -28,7 +33,10 @@ class CreateProgram:
         program = Program(
             institution_id=institution_id, name=name, description=description
         )
-        return await self.repo.create(program)
+        async with self.uow:
+            created = await self.repo.create(program)
+            await self.uow.commit()
+        return created
 
 
 class ListPrograms:
@@ -52,24 +60,35 @@ class GetProgramById:
 
 
 class UpdateProgram:
-    def __init__(self, repo: ProgramRepository):
+    def __init__(self, repo: ProgramRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
-    async def execute(self, program: Program) -> Program:
-        current = await self.repo.get_by_id(program.id)
-        if not current:
-            raise NotFoundError(
-                message="Program not found",
-                details=[{"field": "id", "reason": "not found"}],
+    async def execute(
+        self, program_id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Program:
+        # single conditional UPDATE; no read-before-write
+        async with self.uow:
+            updated = await self.repo.update_fields(
+                program_id, changes, expected_version
             )
-        return await self.repo.update(program)
+            if not updated:
+                raise NotFoundError(
+                    message="Program not found",
+                    details=[{"field": "id", "reason": "not found"}],
+                )
+            await self.uow.commit()
+        return updated
 
 
 class DeleteProgram:
-    def __init__(self, repo: ProgramRepository):
+    def __init__(self, repo: ProgramRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(
         self, program_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ):
-        return await self.repo.soft_delete(program_id, deleted_by, reason)
+        async with self.uow:
+            await self.repo.soft_delete(program_id, deleted_by, reason)
+            await self.uow.commit()
@@ -7,6 +7,7 @@ from app.domain.user_repository import UserRepository
 from app.domain.candidate_profile_repository import CandidateProfileRepository
 from app.domain.institution_repository import InstitutionRepository
 from app.domain.role_repository import RoleRepository
+from app.domain.unit_of_work import UnitOfWork
 from app.domain.errors import ValidationError
 
 
@@ -17,11 +18,13 @@ class RegisterUser:
         institution_repo: InstitutionRepository,
         candidate_repo: CandidateProfileRepository,
         role_repo: RoleRepository,
+        uow: UnitOfWork,
     ):
         self.user_repo = user_repo
         self.institution_repo = institution_repo
         self.candidate_repo = candidate_repo
         self.role_repo = role_repo
+        self.uow = uow
 
     async def execute(
         self,
@@ -67,32 +70,43 @@ class RegisterUser:
                 ],
             )
 
-        # delegate core user creation
-        create_user_uc = CreateUser(self.user_repo, self.institution_repo)
+        # if candidate role present, candidate profile is mandatory
+        if "candidate" in normalized and (
+            not candidate_profile or not isinstance(candidate_profile, dict)
+        ):
+            raise ValidationError(
+                message="candidate_profile is required for candidate role",
+                details=[{"field": "candidate_profile", "reason": "required"}],
+            )
 
-        user = await create_user_uc.execute(
-            email=email,
-            password=password,
-            roles=selected_roles,
-            institution_id=institution_id,
-        )
+        # user, roles and candidate profile are committed together; the nested
+        # use cases share this unit of work, so their commits are deferred
+        async with self.uow:
+            # delegate core user creation
+            create_user_uc = CreateUser(self.user_repo, self.institution_repo, self.uow)
+
+            user = await create_user_uc.execute(
+                email=email,
+                password=password,
+                roles=selected_roles,
+                institution_id=institution_id,
+            )
 
-        # if candidate role present, create candidate profile
-        if "candidate" in normalized:
-            if not candidate_profile or not isinstance(candidate_profile, dict):
-                raise ValidationError(
-                    message="candidate_profile is required for candidate role",
-                    details=[{"field": "candidate_profile", "reason": "required"}],
+            if "candidate" in normalized:
+                create_profile_uc = CreateCandidateProfile(
+                    self.candidate_repo, self.user_repo, self.uow
+                )
+                cpf = candidate_profile.get("cpf")
+                dob = candidate_profile.get("date_of_birth")
+                full_name_cp = candidate_profile.get("full_name")
+                await create_profile_uc.execute(
+                    user_id=user.id,
+                    full_name=full_name_cp,
+                    date_of_birth=dob,
+                    cpf=cpf,
+                    created_user=user,
                 )
 
-            create_profile_uc = CreateCandidateProfile(
-                self.candidate_repo, self.user_repo
-            )
-            cpf = candidate_profile.get("cpf")
-            dob = candidate_profile.get("date_of_birth")
-            full_name_cp = candidate_profile.get("full_name")
-            await create_profile_uc.execute(
-                user_id=user.id, full_name=full_name_cp, date_of_birth=dob, cpf=cpf
-            )
+            await self.uow.commit()
 
         return user
@@ -7,6 +7,7 @@ from app.domain.role import Role
 from app.domain.user import User
 from app.domain.user_repository import UserRepository
 from app.domain.candidate_profile_repository import CandidateProfileRepository
+from app.domain.unit_of_work import UnitOfWork
 from app.infrastructure.security import (
     create_access_token,
     hash_password,
@@ -15,9 +16,15 @@ from app.infrastructure.security import (
 
 
 class CreateUser:
-    def __init__(self, repo: UserRepository, institution_repo: InstitutionRepository):
+    def __init__(
+        self,
+        repo: UserRepository,
+        institution_repo: InstitutionRepository,
+        uow: UnitOfWork,
+    ):
         self.repo = repo
         self.institution_repo = institution_repo
+        self.uow = uow
 
     async def execute(
         self,
@@ -74,7 +81,10 @@ class CreateUser:
             roles=roles,
             institution_id=institution_id,
         )
-        return await self.repo.create(user)
+        async with self.uow:
+            created = await self.repo.create(user)
+            await self.uow.commit()
+        return created
 
     def _password_issues(self, pw: str) -> list:
         issues = []
@@ -134,10 +144,12 @@ class UpdateUser:
         self,
         repo: UserRepository,
         institution_repo: InstitutionRepository,
+        uow: UnitOfWork,
         profile_repo: CandidateProfileRepository = None,
     ):
         self.repo = repo
         self.institution_repo = institution_repo
+        self.uow = uow
         self.profile_repo = profile_repo
 
     async def execute(
@@ -225,27 +237,6 @@ class UpdateUser:
         if "roles" in updates and updates["roles"] is not None:
             current.roles = updates["roles"]
 
-        # handle candidate_profile updates
-        if "candidate_profile" in updates:
-            if not is_candidate:
-                raise ForbiddenError(
-                    message="Only candidate can update candidate_profile",
-                    details=[{"field": "candidate_profile", "reason": "forbidden"}],
-                )
-            if not self.profile_repo:
-                raise ValidationError(
-                    message="candidate_profile repository not configured",
-                )
-            profile = await self.profile_repo.get_by_user_id(user_id)
-            if not profile:
-                raise NotFoundError(
-                    message="CandidateProfile not found",
-                    details=[{"field": "user_id", "reason": "not found"}],
-                )
-            for p_field, p_value in updates["candidate_profile"].items():
-                setattr(profile, p_field, p_value)
-            await self.profile_repo.update(profile)
-
         # apply remaining top-level fields
         skip_fields = {"password", "roles", "candidate_profile"}
         for field, value in updates.items():
@@ -253,14 +244,42 @@ class UpdateUser:
                 continue
             setattr(current, field, value)
 
-        return await self.repo.update(current)
+        # profile and user are written in the same transaction
+        async with self.uow:
+            # handle candidate_profile updates
+            if "candidate_profile" in updates:
+                if not is_candidate:
+                    raise ForbiddenError(
+                        message="Only candidate can update candidate_profile",
+                        details=[{"field": "candidate_profile", "reason": "forbidden"}],
+                    )
+                if not self.profile_repo:
+                    raise ValidationError(
+                        message="candidate_profile repository not configured",
+                    )
+                profile = await self.profile_repo.get_by_user_id(user_id)
+                if not profile:
+                    raise NotFoundError(
+                        message="CandidateProfile not found",
+                        details=[{"field": "user_id", "reason": "not found"}],
+                    )
+                for p_field, p_value in updates["candidate_profile"].items():
+                    setattr(profile, p_field, p_value)
+                await self.profile_repo.update(profile)
+
+            updated = await self.repo.update(current)
+            await self.uow.commit()
+        return updated
 
 
 class DeleteUser:
-    def __init__(self, repo: UserRepository):
+    def __init__(self, repo: UserRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
 
     async def execute(
         self, user_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ):
-        return await self.repo.soft_delete(user_id, deleted_by, reason)
+        async with self.uow:
+            await self.repo.soft_delete(user_id, deleted_by, reason)
+            await self.uow.commit()
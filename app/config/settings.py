@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -9,7 +10,131 @@ class Settings(BaseSettings):
     APP_ENV: str = "dev"
     APP_VERSION: str = "0.1.0"
     LOG_LEVEL: str = "INFO"
+    # /openapi.json written at build time by scripts/build_openapi.py and
+    # served verbatim; when unset the schema is generated on the first request
+    OPENAPI_PREBUILT_FILE: Optional[str] = None
+    # bounded buffer of the background log writer; records are dropped (and
+    # counted) when it is full
+    LOG_QUEUE_SIZE: int = 10000
+    # request_completed sampling: errors and requests >= LOG_SLOW_REQUEST_MS are
+    # always logged; fast 2xx/3xx at LOG_SAMPLE_RATE (per-route overrides as
+    # JSON, e.g. {"/health": 0.01})
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_SLOW_REQUEST_MS: int = 500
+    LOG_SAMPLE_RATE_BY_ROUTE: dict[str, float] = {}
+    # /metrics (Prometheus text format). With several workers, point
+    # METRICS_MULTIPROC_DIR at a directory shared by them (cleared on deploy)
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL_S: float = 5.0
+    # Tracing (see tracing.py): head-based sampling of new traces; an incoming
+    # traceparent's sampled flag wins. Exporter: memory | otlp_file | none
+    OTEL_ENABLED: bool = False
+    OTEL_SAMPLING_RATIO: float = 1.0
+    OTEL_TRACES_EXPORTER: str = "memory"
+    OTEL_EXPORTER_OTLP_FILE: str = "traces.jsonl"
     DATABASE_URL: str
+    # Optional read replica; plain SELECTs are routed there (see read_replica.py)
+    DATABASE_READ_URL: Optional[str] = None
+    DB_REPLICA_LAG_CHECK_INTERVAL_MS: int = 200
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: float = 10.0
+    DB_COMMAND_TIMEOUT: Optional[float] = None
+    # Session defaults sent when each pooled connection is opened (asyncpg
+    # server_settings, no extra round trip); 0 keeps the server's own
+    DB_STATEMENT_TIMEOUT_MS: int = 3000
+    DB_LOCK_TIMEOUT_MS: int = 2000
+    # Named pools on DATABASE_URL (bulkheads, see db.py), per worker process
+    # and on top of the pool above: {"name": {"pool_size": n, "max_overflow": m}},
+    # optionally with their own "statement_timeout_ms" / "lock_timeout_ms"
+    DB_POOLS: dict[str, dict[str, int]] = {
+        "bulk": {"pool_size": 2, "max_overflow": 2, "statement_timeout_ms": 25000},
+    }
+    # Per-request SQL instrumentation: statements repeated at least
+    # DB_N_PLUS_ONE_THRESHOLD times in a request are logged as a likely N+1
+    # (default: on in dev only). DB_STRICT_LOADING makes lazy relationship
+    # loads raise, like lazy="raise" on every relationship
+    DB_DETECT_N_PLUS_ONE: Optional[bool] = None
+    DB_N_PLUS_ONE_THRESHOLD: int = 3
+    DB_STRICT_LOADING: bool = False
+    # Slow query recorder (0 disables); plans are captured with EXPLAIN
+    # outside prod unless DB_SLOW_QUERY_EXPLAIN says otherwise
+    DB_SLOW_QUERY_MS: int = 0
+    DB_SLOW_QUERY_BUFFER_SIZE: int = 100
+    DB_SLOW_QUERY_EXPLAIN: Optional[bool] = None
+    # asyncpg prepared statement cache per connection (0 disables, e.g. pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # roles are cached per process (see role_repository_sqlalchemy); 0 disables
+    ROLE_CACHE_TTL_S: float = 300.0
+    # Startup warm-up (see warmup.py): WARMUP_CONNECTIONS defaults to
+    # DB_POOL_SIZE; readiness stays false until it finishes or times out
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: Optional[int] = None
+    WARMUP_TIMEOUT_S: float = 30.0
+    # GET /health/ready (see health.py): DB ping cached between probes; not
+    # ready when a pool is this saturated or the event loop this late
+    HEALTH_DB_PING_CACHE_S: float = 2.0
+    HEALTH_DB_PING_TIMEOUT_S: float = 1.0
+    HEALTH_MAX_POOL_SATURATION: float = 1.0
+    HEALTH_MAX_LOOP_LAG_MS: float = 500.0
+    HEALTH_LOOP_LAG_INTERVAL_S: float = 0.5
+    # Admission control (see admission.py): concurrent requests per route
+    # class; 503 + Retry-After once the expected queue wait exceeds the
+    # budget. Unless ADMISSION_LIMITS is set, the limits are derived at
+    # startup from the pool sizes: each class gets its ADMISSION_POOL_SHARES
+    # of DB_POOL_SIZE + DB_MAX_OVERFLOW, exports the whole "bulk" pool when
+    # it is configured. Critical routes are "METHOD /path"
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: Optional[dict[str, int]] = None
+    ADMISSION_POOL_SHARES: dict[str, float] = {
+        "auth": 0.2,
+        "writes": 0.3,
+        "reads": 0.4,
+        "exports": 0.1,
+    }
+    ADMISSION_MAX_QUEUE_MS: int = 500
+    ADMISSION_CRITICAL_MAX_QUEUE_MS: int = 5000
+    ADMISSION_CRITICAL_ROUTES: list[str] = [
+        "POST /api/v1/auth/login",
+        "POST /api/v1/applications/",
+    ]
+    # Request deadlines (see deadlines.py), per route class: the request is
+    # cancelled with 504 after REQUEST_TIMEOUTS_MS. A transaction that starts
+    # with less time left than its connection's statement timeout gets
+    # SET LOCAL statement_timeout = the time left
+    REQUEST_DEADLINES_ENABLED: bool = True
+    REQUEST_TIMEOUTS_MS: dict[str, int] = {
+        "auth": 5000,
+        "writes": 10000,
+        "reads": 5000,
+        "exports": 30000,
+    }
+    # Database circuit breaker (see circuit_breaker.py): opens after this many
+    # consecutive connection failures, then fails fast with 503 and probes
+    # again after the reset timeout. While open, the last response of these
+    # public listings is served stale
+    DB_BREAKER_ENABLED: bool = True
+    DB_BREAKER_FAILURE_THRESHOLD: int = 5
+    DB_BREAKER_RESET_TIMEOUT_S: float = 5.0
+    DB_BREAKER_STALE_PATHS: list[str] = [
+        "/api/v1/offers/",
+        "/api/v1/institutions/",
+        "/api/v1/programs/",
+    ]
+    DB_BREAKER_STALE_CACHE_SIZE: int = 256
+    # rows per UPDATE when cascading soft deletes (institution/program/offer)
+    SOFT_DELETE_CHUNK_SIZE: int = 5000
+    # Retention: rows soft-deleted more than RETENTION_DAYS ago move to *_archive
+    RETENTION_DAYS: int = 365
+    RETENTION_BATCH_SIZE: int = 1000
+    RETENTION_SLEEP_MS: int = 200
+    RETENTION_SCHEDULE_ENABLED: bool = False
+    RETENTION_SCHEDULE_INTERVAL_HOURS: float = 24.0
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRES_IN: int = 3600
@@ -4,6 +4,19 @@ from uuid import UUID, uuid4
 
 
 class Application:
+    __slots__ = (
+        "id",
+        "candidate_profile_id",
+        "offer_id",
+        "status",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by",
+        "deletion_reason",
+        "version",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -15,6 +28,7 @@ class Application:
         deleted_at: Optional[datetime] = None,
         deleted_by: Optional[UUID] = None,
         deletion_reason: Optional[str] = None,
+        version: int = 1,
     ):
         self.id = id or uuid4()
         self.candidate_profile_id = candidate_profile_id
@@ -25,3 +39,33 @@ class Application:
         self.deleted_at = deleted_at
         self.deleted_by = deleted_by
         self.deletion_reason = deletion_reason
+        # optimistic concurrency token, bumped by every update
+        self.version = version
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        candidate_profile_id: Optional[UUID],
+        offer_id: Optional[UUID],
+        status: str,
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+        deleted_by: Optional[UUID],
+        deletion_reason: Optional[str],
+        version: int,
+    ) -> "Application":
+        application = cls.__new__(cls)
+        application.id = id
+        application.candidate_profile_id = candidate_profile_id
+        application.offer_id = offer_id
+        application.status = status
+        application.created_at = created_at
+        application.updated_at = updated_at
+        application.deleted_at = deleted_at
+        application.deleted_by = deleted_by
+        application.deletion_reason = deletion_reason
+        application.version = version
+        return application
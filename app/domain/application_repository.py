@@ -35,6 +35,18 @@ class ApplicationRepository(ABC):
     async def update(self, application: Application) -> Application:
         pass
 
+    @abstractmethod
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[Application]:
+        """
+        Apply `changes` in a single conditional UPDATE and bump the version.
+
+        Returns None when the record doesn't exist; raises
+        PreconditionFailedError when `expected_version` is stale.
+        """
+        pass
+
     @abstractmethod
     async def soft_delete(
         self, id: UUID, deleted_by: UUID, reason: Optional[str] = None
@@ -4,6 +4,20 @@ from uuid import UUID, uuid4
 
 
 class CandidateProfile:
+    __slots__ = (
+        "id",
+        "user_id",
+        "full_name",
+        "date_of_birth",
+        "cpf",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by",
+        "deletion_reason",
+        "version",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -16,6 +30,7 @@ class CandidateProfile:
         deleted_at: Optional[datetime] = None,
         deleted_by: Optional[UUID] = None,
         deletion_reason: Optional[str] = None,
+        version: int = 1,
     ):
         self.id = id or uuid4()
         self.user_id = user_id
@@ -27,3 +42,35 @@ class CandidateProfile:
         self.deleted_at = deleted_at
         self.deleted_by = deleted_by
         self.deletion_reason = deletion_reason
+        # optimistic concurrency token, bumped by every update
+        self.version = version
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        user_id: Optional[UUID],
+        full_name: Optional[str],
+        date_of_birth: Optional[str],
+        cpf: Optional[str],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+        deleted_by: Optional[UUID],
+        deletion_reason: Optional[str],
+        version: int,
+    ) -> "CandidateProfile":
+        profile = cls.__new__(cls)
+        profile.id = id
+        profile.user_id = user_id
+        profile.full_name = full_name
+        profile.date_of_birth = date_of_birth
+        profile.cpf = cpf
+        profile.created_at = created_at
+        profile.updated_at = updated_at
+        profile.deleted_at = deleted_at
+        profile.deleted_by = deleted_by
+        profile.deletion_reason = deletion_reason
+        profile.version = version
+        return profile
@@ -101,6 +101,25 @@ class ConflictError(AppError):
         )
 
 
+class PreconditionFailedError(AppError):
+    """
+    The resource changed since the client read it (stale If-Match version).
+    """
+
+    def __init__(
+        self,
+        message: str = "Resource was modified by another request.",
+        details: Optional[list[dict[str, Any]]] = None,
+        code: str = "PRECONDITION_FAILED",
+    ) -> None:
+        super().__init__(
+            code=code,
+            message=message,
+            http_status=412,
+            details=details,
+        )
+
+
 class UnauthorizedError(AppError):
     def __init__(
         self,
@@ -129,3 +148,50 @@ class ForbiddenError(AppError):
             http_status=403,
             details=details,
         )
+
+
+# -----------------------------
+# Availability errors
+# -----------------------------
+
+
+class ServiceUnavailableError(AppError):
+    """
+    Temporary overload / dependency outage; clients should retry after
+    `retry_after_s` seconds (sent as Retry-After).
+    """
+
+    def __init__(
+        self,
+        message: str = "Service temporarily unavailable.",
+        details: Optional[list[dict[str, Any]]] = None,
+        code: str = "SERVICE_UNAVAILABLE",
+        retry_after_s: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            code=code,
+            message=message,
+            http_status=503,
+            details=details,
+        )
+        self.retry_after_s = retry_after_s
+
+
+class DeadlineExceededError(AppError):
+    """
+    The request ran out of time (request deadline, statement_timeout or
+    lock_timeout) and its work was cancelled.
+    """
+
+    def __init__(
+        self,
+        message: str = "Request took too long and was cancelled.",
+        details: Optional[list[dict[str, Any]]] = None,
+        code: str = "DEADLINE_EXCEEDED",
+    ) -> None:
+        super().__init__(
+            code=code,
+            message=message,
+            http_status=504,
+            details=details,
+        )
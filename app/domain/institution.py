@@ -4,6 +4,18 @@ from uuid import UUID, uuid4
 
 
 class Institution:
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by",
+        "deletion_reason",
+        "version",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -14,6 +26,7 @@ class Institution:
         deleted_at: Optional[datetime] = None,
         deleted_by: Optional[UUID] = None,
         deletion_reason: Optional[str] = None,
+        version: int = 1,
     ):
         self.id = id or uuid4()
         self.name = name
@@ -23,3 +36,31 @@ class Institution:
         self.deleted_at = deleted_at
         self.deleted_by = deleted_by
         self.deletion_reason = deletion_reason
+        # optimistic concurrency token, bumped by every update
+        self.version = version
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        name: str,
+        description: Optional[str],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+        deleted_by: Optional[UUID],
+        deletion_reason: Optional[str],
+        version: int,
+    ) -> "Institution":
+        institution = cls.__new__(cls)
+        institution.id = id
+        institution.name = name
+        institution.description = description
+        institution.created_at = created_at
+        institution.updated_at = updated_at
+        institution.deleted_at = deleted_at
+        institution.deleted_by = deleted_by
+        institution.deletion_reason = deletion_reason
+        institution.version = version
+        return institution
@@ -23,6 +23,18 @@ class InstitutionRepository(ABC):
     async def update(self, institution: Institution) -> Institution:
         pass
 
+    @abstractmethod
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[Institution]:
+        """
+        Apply `changes` in a single conditional UPDATE and bump the version.
+
+        Returns None when the record doesn't exist; raises
+        PreconditionFailedError when `expected_version` is stale.
+        """
+        pass
+
     @abstractmethod
     async def soft_delete(
         self, institution_id: UUID, deleted_by: UUID, reason: Optional[str] = None
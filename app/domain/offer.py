@@ -18,6 +18,24 @@ class OfferStatus(str, Enum):
 
 
 class Offer:
+    __slots__ = (
+        "id",
+        "institution_id",
+        "program_id",
+        "title",
+        "description",
+        "type",
+        "status",
+        "publication_date",
+        "application_deadline",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by",
+        "deletion_reason",
+        "version",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -34,6 +52,7 @@ class Offer:
         deleted_at: Optional[datetime] = None,
         deleted_by: Optional[UUID] = None,
         deletion_reason: Optional[str] = None,
+        version: int = 1,
     ):
         self.id = id or uuid4()
         self.institution_id = institution_id
@@ -49,3 +68,47 @@ class Offer:
         self.deleted_at = deleted_at
         self.deleted_by = deleted_by
         self.deletion_reason = deletion_reason
+        # optimistic concurrency token, bumped by every update
+        self.version = version
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        institution_id: UUID,
+        program_id: Optional[UUID],
+        title: str,
+        description: str,
+        type: OfferType,
+        status: OfferStatus,
+        publication_date: Optional[datetime],
+        application_deadline: Optional[datetime],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+        deleted_by: Optional[UUID],
+        deletion_reason: Optional[str],
+        version: int,
+    ) -> "Offer":
+        """
+        Rebuilds an offer loaded from the database. Unlike __init__ it does
+        not generate an id or timestamps; every slot must be passed.
+        """
+        offer = cls.__new__(cls)
+        offer.id = id
+        offer.institution_id = institution_id
+        offer.program_id = program_id
+        offer.title = title
+        offer.description = description
+        offer.type = type
+        offer.status = status
+        offer.publication_date = publication_date
+        offer.application_deadline = application_deadline
+        offer.created_at = created_at
+        offer.updated_at = updated_at
+        offer.deleted_at = deleted_at
+        offer.deleted_by = deleted_by
+        offer.deletion_reason = deletion_reason
+        offer.version = version
+        return offer
@@ -28,6 +28,18 @@ class OfferRepository(ABC):
     async def update(self, offer: Offer) -> Offer:
         pass
 
+    @abstractmethod
+    async def update_fields(
+        self, offer_id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[Offer]:
+        """
+        Apply `changes` in a single conditional UPDATE and bump the version.
+
+        Returns None when the record doesn't exist; raises
+        PreconditionFailedError when `expected_version` is stale.
+        """
+        pass
+
     @abstractmethod
     async def soft_delete(
         self, offer_id: UUID, deleted_by: UUID, reason: Optional[str] = None
@@ -4,6 +4,19 @@ from uuid import UUID, uuid4
 
 
 class Program:
+    __slots__ = (
+        "id",
+        "institution_id",
+        "name",
+        "description",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by",
+        "deletion_reason",
+        "version",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -15,6 +28,7 @@ class Program:
         deleted_at: Optional[datetime] = None,
         deleted_by: Optional[UUID] = None,
         deletion_reason: Optional[str] = None,
+        version: int = 1,
     ):
         self.id = id or uuid4()
         self.institution_id = institution_id
@@ -25,3 +39,33 @@ class Program:
         self.deleted_at = deleted_at
         self.deleted_by = deleted_by
         self.deletion_reason = deletion_reason
+        # optimistic concurrency token, bumped by every update
+        self.version = version
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        institution_id: UUID,
+        name: str,
+        description: Optional[str],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+        deleted_by: Optional[UUID],
+        deletion_reason: Optional[str],
+        version: int,
+    ) -> "Program":
+        program = cls.__new__(cls)
+        program.id = id
+        program.institution_id = institution_id
+        program.name = name
+        program.description = description
+        program.created_at = created_at
+        program.updated_at = updated_at
+        program.deleted_at = deleted_at
+        program.deleted_by = deleted_by
+        program.deletion_reason = deletion_reason
+        program.version = version
+        return program
@@ -23,6 +23,18 @@ class ProgramRepository(ABC):
     async def update(self, program: Program) -> Program:
         pass
 
+    @abstractmethod
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[Program]:
+        """
+        Apply `changes` in a single conditional UPDATE and bump the version.
+
+        Returns None when the record doesn't exist; raises
+        PreconditionFailedError when `expected_version` is stale.
+        """
+        pass
+
     @abstractmethod
     async def soft_delete(
         self, program_id: UUID, deleted_by: UUID, reason: Optional[str] = None
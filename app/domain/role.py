@@ -4,6 +4,15 @@ from uuid import UUID, uuid4
 
 
 class Role:
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -19,3 +28,23 @@ class Role:
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
         self.deleted_at = deleted_at
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        name: str | None,
+        description: Optional[str],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+    ) -> "Role":
+        role = cls.__new__(cls)
+        role.id = id
+        role.name = name
+        role.description = description
+        role.created_at = created_at
+        role.updated_at = updated_at
+        role.deleted_at = deleted_at
+        return role
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+
+
+class UnitOfWork(ABC):
+    """
+    Transaction boundary for a use case.
+
+    Repositories bound to a unit of work share one session/transaction and
+    never commit on their own; the use case commits once at the end:
+
+        async with self.uow:
+            ...
+            await self.uow.commit()
+
+    Nested use cases may enter the same unit of work; only the outermost
+    `commit()` is effective. Leaving the block with an exception rolls back.
+    """
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            await self.rollback()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
@@ -6,6 +6,19 @@ from app.domain.role import Role
 
 
 class User:
+    __slots__ = (
+        "id",
+        "email",
+        "hashed_password",
+        "roles",
+        "institution_id",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "deleted_by",
+        "deletion_reason",
+    )
+
     def __init__(
         self,
         id: Optional[UUID] = None,
@@ -31,3 +44,31 @@ class User:
         self.deleted_at = deleted_at
         self.deleted_by = deleted_by
         self.deletion_reason = deletion_reason
+
+    @classmethod
+    def from_persistence(
+        cls,
+        *,
+        id: Optional[UUID],
+        email: str,
+        hashed_password: str,
+        roles: Optional[List[Role]],
+        institution_id: Optional[UUID],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        deleted_at: Optional[datetime],
+        deleted_by: Optional[UUID],
+        deletion_reason: Optional[str],
+    ) -> "User":
+        user = cls.__new__(cls)
+        user.id = id
+        user.email = email
+        user.hashed_password = hashed_password
+        user.roles = roles
+        user.institution_id = institution_id
+        user.created_at = created_at
+        user.updated_at = updated_at
+        user.deleted_at = deleted_at
+        user.deleted_by = deleted_by
+        user.deletion_reason = deletion_reason
+        return user
@@ -0,0 +1,246 @@
+"""
+Admission control (ADMISSION_ENABLED): concurrency limits per route class
+and queue-time based load shedding, in front of the routers.
+
+Route classes (`classify`):
+- auth: /api/v1/auth/* (login, register)
+- exports: GETs returning a whole child collection
+  (/offers/{id}/applications, /users/{id}/applications)
+- writes: any other POST / PUT / PATCH / DELETE
+- reads: any other GET
+Health probes, /metrics and the API docs are never limited.
+
+Each class runs at most its limit of requests at once, so a burst of
+browsing cannot take every database connection away from submissions. The
+limits follow the pools (`pool_limits`): a class gets its
+ADMISSION_POOL_SHARES of DB_POOL_SIZE + DB_MAX_OVERFLOW, and exports, which
+run on the "bulk" pool, get that pool's capacity. ADMISSION_LIMITS
+overrides them. Requests over the limit wait in a FIFO queue and are shed
+with 503 + Retry-After:
+- on arrival, when the estimated wait - (requests ahead + 1) / limit x the
+  average time a slot is held (EWMA) - exceeds the queue budget;
+- once they have actually waited the whole budget.
+Shedding early keeps the queue short, so requests that are admitted still
+finish within their clients' timeouts instead of everything timing out.
+
+Critical routes (ADMISSION_CRITICAL_ROUTES, login and application submission
+by default) are dequeued before every other waiter of their class and get
+ADMISSION_CRITICAL_MAX_QUEUE_MS instead of ADMISSION_MAX_QUEUE_MS: under load
+browsing is shed first.
+
+Metrics: `admission_status()` is exported on /metrics (limits, in flight,
+queued, admitted, shed by reason, queue wait histogram).
+"""
+
+import asyncio
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config.settings import get_settings
+from app.domain.errors import ServiceUnavailableError
+from app.infrastructure.asgi_errors import send_error
+
+settings = get_settings()
+
+QUEUE_WAIT_BUCKETS_S = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_EXEMPT_PREFIXES = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+_EXPORT_PATH = re.compile(r"^/api/v1/(offers|users)/[^/]+/applications/?$")
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    if path.startswith(_EXEMPT_PREFIXES) or method == "OPTIONS":
+        return None
+    if path.startswith("/api/v1/auth/"):
+        return "auth"
+    if method in ("GET", "HEAD"):
+        return "exports" if _EXPORT_PATH.match(path) else "reads"
+    return "writes"
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str, estimated_wait_ms: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_s = max(1, math.ceil(estimated_wait_ms / 1000))
+
+
+class ConcurrencyLimiter:
+    def __init__(self, name: str, limit: int, ewma_alpha: float = 0.2):
+        self.name = name
+        self.limit = max(limit, 1)
+        self.in_flight = 0
+        # critical waiters first
+        self._critical: Deque[asyncio.Future] = deque()
+        self._normal: Deque[asyncio.Future] = deque()
+        self._alpha = ewma_alpha
+        # average time a slot is held; 0 until the first request finishes
+        self.service_ms = 0.0
+        self.admitted = 0
+        self.shed: Dict[str, int] = {"queue_estimate": 0, "queue_timeout": 0}
+        self.wait_counts = [0] * (len(QUEUE_WAIT_BUCKETS_S) + 1)
+        self.wait_sum = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._critical) + len(self._normal)
+
+    def estimated_wait_ms(self, critical: bool) -> float:
+        ahead = len(self._critical) if critical else self.queued
+        return (ahead + 1) / self.limit * self.service_ms
+
+    def _admit(self, waited_s: float) -> None:
+        self.admitted += 1
+        self.wait_counts[bisect_left(QUEUE_WAIT_BUCKETS_S, waited_s)] += 1
+        self.wait_sum += waited_s
+
+    async def acquire(self, critical: bool, max_wait_ms: float) -> float:
+        """Takes a slot, waiting up to `max_wait_ms`; returns the seconds waited."""
+        if self.in_flight < self.limit:
+            self.in_flight += 1
+            self._admit(0.0)
+            return 0.0
+        estimate = self.estimated_wait_ms(critical)
+        if estimate > max_wait_ms:
+            self.shed["queue_estimate"] += 1
+            raise Overloaded("queue_estimate", estimate)
+
+        queue = self._critical if critical else self._normal
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        started = time.perf_counter()
+        try:
+            # release() hands the slot over by resolving the future
+            await asyncio.wait_for(waiter, max_wait_ms / 1000)
+        except asyncio.TimeoutError as exc:
+            _discard(queue, waiter)
+            self.shed["queue_timeout"] += 1
+            raise Overloaded("queue_timeout", self.estimated_wait_ms(critical)) from exc
+        except asyncio.CancelledError:
+            _discard(queue, waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over just before
+            raise
+        waited = time.perf_counter() - started
+        self._admit(waited)
+        return waited
+
+    def release(self, held_s: Optional[float] = None) -> None:
+        if held_s is not None:
+            held_ms = held_s * 1000
+            if self.service_ms == 0.0:
+                self.service_ms = held_ms
+            else:
+                self.service_ms += self._alpha * (held_ms - self.service_ms)
+        for queue in (self._critical, self._normal):
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "class": self.name,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "service_ms": round(self.service_ms, 3),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "wait_counts": list(self.wait_counts),
+            "wait_sum": self.wait_sum,
+        }
+
+
+def _discard(queue: Deque[asyncio.Future], waiter: asyncio.Future) -> None:
+    try:
+        queue.remove(waiter)
+    except ValueError:
+        pass
+
+
+def _critical_routes(routes: List[str]) -> set:
+    parsed = set()
+    for route in routes:
+        method, _, path = route.partition(" ")
+        parsed.add((method.upper(), path.rstrip("/")))
+    return parsed
+
+
+def pool_limits(settings=settings) -> Dict[str, int]:
+    """Per class limits from the pool sizes (exports: the "bulk" pool)."""
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    limits = {
+        name: max(int(capacity * share), 1)
+        for name, share in settings.ADMISSION_POOL_SHARES.items()
+    }
+    bulk = settings.DB_POOLS.get("bulk")
+    if bulk is not None and "exports" in limits:
+        limits["exports"] = max(
+            bulk.get("pool_size", 0) + bulk.get("max_overflow", 0), 1
+        )
+    return limits
+
+
+limiters: Dict[str, ConcurrencyLimiter] = {
+    name: ConcurrencyLimiter(name, limit)
+    for name, limit in (settings.ADMISSION_LIMITS or pool_limits()).items()
+}
+
+
+def admission_status() -> List[Dict[str, Any]]:
+    return [limiter.snapshot() for limiter in limiters.values()]
+
+
+class AdmissionControlMiddleware:
+    """Runs inside ObservabilityMiddleware, so shed requests are logged and counted."""
+
+    def __init__(self, app, limiters: Dict[str, ConcurrencyLimiter] = limiters):
+        self.app = app
+        self.limiters = limiters
+        self.critical = _critical_routes(settings.ADMISSION_CRITICAL_ROUTES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        path = scope["path"]
+        limiter = self.limiters.get(classify(method, path))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        critical = (method, path.rstrip("/")) in self.critical
+        try:
+            await limiter.acquire(
+                critical,
+                (
+                    settings.ADMISSION_CRITICAL_MAX_QUEUE_MS
+                    if critical
+                    else settings.ADMISSION_MAX_QUEUE_MS
+                ),
+            )
+        except Overloaded as exc:
+            await self._reject(scope, send, limiter.name, exc)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+    async def _reject(self, scope, send, route_class: str, exc: Overloaded) -> None:
+        error = ServiceUnavailableError(
+            message="Server is overloaded, retry later.",
+            details=[{"reason": exc.reason, "route_class": route_class}],
+            code="OVERLOADED",
+            retry_after_s=exc.retry_after_s,
+        )
+        await send_error(send, error, scope.get("request_id"))
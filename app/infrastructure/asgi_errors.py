@@ -0,0 +1,33 @@
+from typing import Optional
+
+import orjson
+
+from app.domain.errors import AppError
+
+
+async def send_error(send, error: AppError, request_id: Optional[str]) -> None:
+    """
+    Sends `error` in the ADR-008 envelope straight to the ASGI `send`, for
+    pure ASGI middlewares that run outside the exception handlers.
+    """
+    body = orjson.dumps(
+        {
+            "error": {
+                "code": error.code,
+                "message": error.message,
+                "details": error.details,
+                "request_id": request_id,
+            }
+        }
+    )
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    retry_after_s = getattr(error, "retry_after_s", None)
+    if retry_after_s is not None:
+        headers.append((b"retry-after", str(retry_after_s).encode()))
+    await send(
+        {"type": "http.response.start", "status": error.http_status, "headers": headers}
+    )
+    await send({"type": "http.response.body", "body": body})
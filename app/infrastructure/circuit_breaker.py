@@ -0,0 +1,270 @@
+"""
+Database circuit breaker (DB_BREAKER_ENABLED), around the repositories'
+session use (`SQLAlchemyRepository._session`) and the unit of work's commit.
+
+- closed: calls go through. DB_BREAKER_FAILURE_THRESHOLD consecutive
+  connection failures (refused / reset connections, connect timeouts,
+  Postgres shutting down or not accepting connections) open it. Any call
+  the database answers - including with an ordinary SQL error - resets the
+  count. statement_timeout / lock_timeout and pool checkout timeouts give
+  no verdict either way: one slow query says nothing about the server, and
+  an exhausted pool only means this worker is saturated (during an outage
+  the pool fills with hung connects, whose failures do count).
+- open: calls fail immediately with 503 DATABASE_UNAVAILABLE + Retry-After,
+  instead of every request waiting out the connect timeout while
+  the worker fills up with hung coroutines.
+- half-open: after DB_BREAKER_RESET_TIMEOUT_S one call is let through as a
+  probe, the others still fail fast. Success closes the circuit, a failure
+  opens it for another period.
+
+Nested repository calls are judged by the outermost one. Cancelled calls
+(request deadline, client gone) give no verdict; a half-open probe without
+a verdict leaves the circuit half-open for the next call. Rollbacks are
+never rejected; they only report connection failures (`record_failures`).
+
+While the circuit rejects calls, `StaleReadsMiddleware` answers GETs of
+DB_BREAKER_STALE_PATHS (public listings) with the last 200 response it saw
+for the same path and query, marked `X-Cache: stale`.
+
+Health probes ping the database directly and are not affected.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import exc as sa_exc
+
+from app.config.settings import get_settings
+from app.domain.errors import ServiceUnavailableError
+from app.infrastructure.deadlines import db_timeout_reason
+from app.infrastructure.logging import JsonLogger
+
+settings = get_settings()
+logger = JsonLogger(service="circuit_breaker")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# connection_exception class, admin/crash shutdown, cannot_connect_now
+_UNAVAILABLE_SQLSTATES = ("08", "57P01", "57P02", "57P03")
+
+_guarded: ContextVar[bool] = ContextVar("db_breaker_guarded", default=False)
+
+
+def is_connection_failure(exc: BaseException) -> bool:
+    # refused / reset connections and connect timeouts (TimeoutError is an
+    # OSError); sa_exc.TimeoutError (pool checkout) is neither
+    if isinstance(exc, OSError):
+        return True
+    if isinstance(exc, sa_exc.DBAPIError):
+        if db_timeout_reason(exc) is not None:
+            return False
+        sqlstate = getattr(exc.orig, "sqlstate", None) or ""
+        return (
+            exc.connection_invalidated
+            or isinstance(exc, sa_exc.InterfaceError)
+            or sqlstate.startswith(_UNAVAILABLE_SQLSTATES)
+        )
+    return False
+
+
+def is_inconclusive(exc: BaseException) -> bool:
+    """Pool checkout, statement and lock timeouts: neither up nor down."""
+    return isinstance(exc, sa_exc.TimeoutError) or db_timeout_reason(exc) is not None
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_s: float):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout_s = reset_timeout_s
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.opened_total = 0
+        self.rejected_total = 0
+        # responses replayed by StaleReadsMiddleware
+        self.stale_served_total = 0
+
+    def rejecting(self) -> bool:
+        """True when a call made now would be rejected."""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at < self.reset_timeout_s
+        return self.state == HALF_OPEN and self._probing
+
+    def _reject(self) -> ServiceUnavailableError:
+        self.rejected_total += 1
+        remaining_s = self.reset_timeout_s - (time.monotonic() - self.opened_at)
+        return ServiceUnavailableError(
+            message="Database unavailable, retry later.",
+            details=[{"reason": "circuit_open", "dependency": self.name}],
+            code="DATABASE_UNAVAILABLE",
+            retry_after_s=max(1, math.ceil(remaining_s)),
+        )
+
+    def _before_call(self) -> bool:
+        """Raises while open; returns True when this call is the half-open probe."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout_s:
+                raise self._reject()
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probing:
+                raise self._reject()
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != OPEN:
+                self.opened_total += 1
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        log = logger.warning if state == OPEN else logger.info
+        log(
+            f"db_circuit_{state}",
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "circuit.name": self.name,
+                "circuit.failures": self.failures,
+            },
+        )
+
+    @asynccontextmanager
+    async def guard(self):
+        if not settings.DB_BREAKER_ENABLED or _guarded.get():
+            yield
+            return
+        probe = self._before_call()
+        token = _guarded.set(True)
+        try:
+            yield
+        except Exception as exc:
+            if is_connection_failure(exc):
+                self.record_failure()
+            elif not is_inconclusive(exc):
+                self.record_success()
+            raise
+        else:
+            self.record_success()
+        finally:
+            _guarded.reset(token)
+            if probe:
+                self._probing = False
+
+    @asynccontextmanager
+    async def record_failures(self):
+        """For calls that must not be rejected: only counts connection failures."""
+        if not settings.DB_BREAKER_ENABLED or _guarded.get():
+            yield
+            return
+        try:
+            yield
+        except Exception as exc:
+            if is_connection_failure(exc):
+                self.record_failure()
+            raise
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "breaker": self.name,
+            "state": self.state,
+            "opened": self.opened_total,
+            "rejected": self.rejected_total,
+            "stale_served": self.stale_served_total,
+        }
+
+
+database_breaker = CircuitBreaker(
+    "database",
+    failure_threshold=settings.DB_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout_s=settings.DB_BREAKER_RESET_TIMEOUT_S,
+)
+
+
+def breaker_status() -> List[Dict[str, Any]]:
+    return [database_breaker.snapshot()]
+
+
+class StaleReadsMiddleware:
+    """
+    Keeps the last 200 response of each whitelisted GET (path + query, LRU of
+    DB_BREAKER_STALE_CACHE_SIZE) and replays it while the breaker rejects
+    calls. Whitelisted paths must not depend on the caller.
+    """
+
+    def __init__(self, app, breaker: CircuitBreaker = database_breaker):
+        self.app = app
+        self.breaker = breaker
+        self.paths = frozenset(settings.DB_BREAKER_STALE_PATHS)
+        self.cache: "OrderedDict[Tuple[str, bytes], Tuple[list, bytes, float]]" = (
+            OrderedDict()
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+            or not settings.DB_BREAKER_ENABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+        key = (scope["path"], scope.get("query_string", b""))
+        if self.breaker.rejecting():
+            cached = self.cache.get(key)
+            if cached is not None:
+                await self._replay(send, *cached)
+                return
+
+        status: Optional[int] = None
+        headers: list = []
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and status == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self._store(key, headers, b"".join(chunks))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _store(self, key, headers: list, body: bytes) -> None:
+        # per-response headers are regenerated by the outer middlewares
+        headers = [(k, v) for k, v in headers if k.lower() != b"x-request-id"]
+        self.cache[key] = (headers, body, time.time())
+        self.cache.move_to_end(key)
+        while len(self.cache) > settings.DB_BREAKER_STALE_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    async def _replay(self, send, headers: list, body: bytes, stored_at: float):
+        self.breaker.stale_served_total += 1
+        age = str(int(time.time() - stored_at)).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": headers + [(b"x-cache", b"stale"), (b"age", age)],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,18 +1,177 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.expression import Select, UpdateBase
 from app.config.settings import get_settings
+from app.infrastructure.db_stats import track_queries
+from app.infrastructure.metrics import registry as metrics_registry
+from app.infrastructure.pool_metrics import InstrumentedAsyncQueuePool, instrument_pool
+from app.infrastructure.slow_queries import recorder as slow_query_recorder
+from app.infrastructure import deadlines, tracing
+from app.infrastructure.read_replica import mark_primary_write, reads_pinned_to_primary
 
 settings = get_settings()
 
 DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+DATABASE_READ_URL = (
+    settings.DATABASE_READ_URL.replace("postgresql://", "postgresql+asyncpg://")
+    if settings.DATABASE_READ_URL
+    else None
+)
+
+
+def create_engine_from_settings(
+    url: str,
+    pool_name: str,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    statement_timeout_ms: Optional[int] = None,
+    lock_timeout_ms: Optional[int] = None,
+):
+    pool_size = settings.DB_POOL_SIZE if pool_size is None else pool_size
+    max_overflow = settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow
+    if statement_timeout_ms is None:
+        statement_timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if lock_timeout_ms is None:
+        lock_timeout_ms = settings.DB_LOCK_TIMEOUT_MS
+    engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=pool_name,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # SQLAlchemy's asyncpg adapter keeps its own prepared statement
+            # cache; keep asyncpg's cache aligned with it
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "timeout": settings.DB_CONNECT_TIMEOUT,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+            "server_settings": deadlines.server_settings(
+                statement_timeout_ms, lock_timeout_ms
+            ),
+        },
+    )
+    deadlines.instrument_engine(engine, statement_timeout_ms)
+    instrument_pool(engine.pool, pool_name, max_overflow)
+    metrics_registry.instrument_engine(engine, pool_name)
+    track_queries(engine)
+    if settings.DB_SLOW_QUERY_MS > 0:
+        slow_query_recorder.instrument(engine)
+    if settings.OTEL_ENABLED:
+        tracing.instrument_engine(engine)
+    return engine
+
+
+engine = create_engine_from_settings(DATABASE_URL, pool_name="primary")
+
+read_engine = (
+    create_engine_from_settings(DATABASE_READ_URL, pool_name="replica")
+    if DATABASE_READ_URL
+    else None
+)
+
+# Named pools (bulkheads): extra pools on the primary, each with its own size
+# (DB_POOLS), so exports and bulk work queue on their own connections instead
+# of taking the ones login and browsing need. Routes opt in with
+# `dependencies=[Depends(use_pool("bulk"))]`, other code with
+# `with using_pool("bulk"):`; every session opened in that context runs all
+# its statements (reads included, no replica) on that pool. Names not in
+# DB_POOLS fall back to the default routing, so `DB_POOLS={}` turns
+# bulkheads off.
+pools: Dict[str, AsyncEngine] = {
+    name: create_engine_from_settings(DATABASE_URL, pool_name=name, **config)
+    for name, config in settings.DB_POOLS.items()
+}
+
+_pool_name: ContextVar[Optional[str]] = ContextVar("db_pool_name", default=None)
+
+
+def engine_for(pool_name: Optional[str]) -> AsyncEngine:
+    """Engine of a named pool, or the primary one when it is not configured."""
+    return pools.get(pool_name, engine)
+
+
+@contextmanager
+def using_pool(pool_name: str):
+    token = _pool_name.set(pool_name)
+    try:
+        yield
+    finally:
+        _pool_name.reset(token)
+
+
+def use_pool(pool_name: str):
+    """FastAPI dependency declaring the pool of a route or router."""
+
+    # async, so it runs in the request task and the endpoint sees the value;
+    # a generator, so the value is reset once the request is done with it
+    async def _use_pool() -> AsyncIterator[None]:
+        with using_pool(pool_name):
+            yield
+
+    return _use_pool
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to the read replica (when configured) and everything
+    else - flushes, INSERT/UPDATE/DELETE, locking reads, raw SQL - to the
+    primary. Once a session writes, its later reads stay on the primary.
+    Inside `using_pool` / `use_pool` everything goes to the named pool.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        named = pools.get(_pool_name.get())
+        if named is not None:
+            return named.sync_engine
+        if read_engine is None:
+            return engine.sync_engine
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+            mark_primary_write()
+            return engine.sync_engine
+        if (
+            not isinstance(clause, Select)
+            or clause._for_update_arg is not None
+            or self.info.get("wrote")
+            or reads_pinned_to_primary()
+        ):
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+
+def _raise_on_lazy_load(execute_state):
+    # same contract as lazy="raise": relationships must be loaded eagerly
+    # (selectinload / joinedload) or not touched at all
+    if execute_state.is_select and execute_state.lazy_loaded_from is not None:
+        prop = execute_state.loader_strategy_path.prop
+        raise exc.InvalidRequestError(
+            f"'{prop}' is not available due to DB_STRICT_LOADING; load it "
+            "eagerly (selectinload / joinedload) in the query"
+        )
+
+
+if settings.DB_STRICT_LOADING:
+    event.listen(RoutingSession, "do_orm_execute", _raise_on_lazy_load)
+if settings.REQUEST_DEADLINES_ENABLED:
+    deadlines.instrument_session(RoutingSession)
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
@@ -0,0 +1,108 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestDbStats:
+    """Database counters accumulated while serving a single request."""
+
+    __slots__ = (
+        "pool_wait_ms",
+        "pool_timeouts",
+        "queries",
+        "query_time_ms",
+        "statements",
+        "request_id",
+    )
+
+    def __init__(self, track_statements: bool = False):
+        self.pool_wait_ms = 0.0
+        self.pool_timeouts = 0
+        self.queries = 0
+        self.query_time_ms = 0.0
+        # SQL text -> executions, only kept for N+1 detection
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+        # set by ObservabilityMiddleware
+        self.request_id: Optional[str] = None
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times (likely N+1)."""
+        if not self.statements:
+            return []
+        return [
+            (statement, count)
+            for statement, count in self.statements.items()
+            if count >= threshold
+        ]
+
+
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def start_request_db_stats(track_statements: bool = False) -> RequestDbStats:
+    # A mutable holder is stored (instead of plain values) so updates made
+    # inside SQLAlchemy's greenlets and child tasks are visible to the caller.
+    stats = RequestDbStats(track_statements)
+    _request_db_stats.set(stats)
+    return stats
+
+
+def current_db_stats() -> Optional[RequestDbStats]:
+    return _request_db_stats.get()
+
+
+def track_queries(engine) -> None:
+    """Adds statement count / time to the current request's RequestDbStats."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, params, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, params, context, executemany):
+        stats = _request_db_stats.get()
+        if stats is None:
+            return
+        stats.queries += 1
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            stats.query_time_ms += (time.perf_counter() - started) * 1000
+        if stats.statements is not None:
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[List[str]]:
+    """
+    Fails with AssertionError when the block runs more than `max_queries`
+    SQL statements, on any engine. Meant for tests; it listens on the Engine
+    class, so it also sees statements run by a TestClient's worker thread:
+
+        with query_budget(2):
+            assert client.get("/api/v1/offers/").status_code == 200
+
+    Yields the list of statements executed so far.
+    """
+    statements: List[str] = []
+
+    def _count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "after_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "after_cursor_execute", _count)
+    if len(statements) > max_queries:
+        listing = "\n".join(statements)
+        raise AssertionError(
+            f"{len(statements)} SQL statements, budget is {max_queries}:\n{listing}"
+        )
@@ -0,0 +1,155 @@
+"""
+Request deadlines (REQUEST_DEADLINES_ENABLED), from the ASGI layer down to
+Postgres.
+
+`DeadlineMiddleware` gives each request REQUEST_TIMEOUTS_MS[route class]
+(same classes as admission control, see `admission.classify`) and runs it
+under `asyncio.timeout`. When the deadline passes the request task is
+cancelled: asyncpg cancels the running query, the session's connection goes
+back to the pool and the admission slot is released. The client gets 504
+DEADLINE_EXCEEDED, unless the response had already started.
+
+Postgres enforces its own limits too. Every pooled connection is opened with
+statement_timeout / lock_timeout as session defaults (DB_STATEMENT_TIMEOUT_MS
+/ DB_LOCK_TIMEOUT_MS, or the named pool's own, sent as asyncpg
+server_settings in the startup packet), so they cost nothing per
+transaction. Only a transaction that starts with less time left than its
+connection's statement_timeout gets
+
+    SET LOCAL statement_timeout = time left
+
+(one `set_config(..., true)` round trip), so Postgres stops a query that
+would outlive the request even when the worker is busy elsewhere. Both
+errors (57014 query_canceled, 55P03 lock_not_available) are mapped to the
+same 504 by the exception handlers.
+
+Work outside requests (warm-up, retention, health probes) has no deadline
+and runs with the connection defaults; the retention job uses the "bulk"
+pool, which allows longer statements.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, text
+
+from app.config.settings import get_settings
+from app.domain.errors import DeadlineExceededError
+from app.infrastructure.admission import classify
+from app.infrastructure.asgi_errors import send_error
+
+settings = get_settings()
+
+# SQLSTATEs raised by statement_timeout and lock_timeout
+DB_TIMEOUT_SQLSTATES = {
+    "57014": "statement_timeout",
+    "55P03": "lock_timeout",
+}
+
+_SET_STATEMENT_TIMEOUT = text(
+    "SELECT set_config('statement_timeout', :statement_timeout, true)"
+)
+
+
+class Deadline:
+    __slots__ = ("route_class", "expires_at")
+
+    def __init__(self, route_class: str, timeout_ms: int):
+        self.route_class = route_class
+        self.expires_at = time.monotonic() + timeout_ms / 1000
+
+    def remaining_ms(self) -> int:
+        return max(int((self.expires_at - time.monotonic()) * 1000), 0)
+
+
+_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+
+def db_timeout_reason(exc: BaseException) -> Optional[str]:
+    """'statement_timeout' / 'lock_timeout' when a DBAPIError comes from one."""
+    orig = getattr(exc, "orig", None)
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return DB_TIMEOUT_SQLSTATES.get(sqlstate)
+
+
+def server_settings(statement_timeout_ms: int, lock_timeout_ms: int) -> dict:
+    """asyncpg `server_settings` applying the session defaults at connect."""
+    return {
+        "statement_timeout": str(statement_timeout_ms),
+        "lock_timeout": str(lock_timeout_ms),
+    }
+
+
+def instrument_engine(engine, statement_timeout_ms: int) -> None:
+    """Records on each new connection the statement_timeout it was opened with."""
+
+    def _remember(dbapi_connection, connection_record) -> None:
+        connection_record.info["statement_timeout_ms"] = statement_timeout_ms
+
+    event.listen(engine.sync_engine, "connect", _remember)
+
+
+def _apply_db_timeouts(session, transaction, connection) -> None:
+    deadline = _deadline.get()
+    if deadline is None or connection.dialect.name != "postgresql":
+        return
+    remaining_ms = deadline.remaining_ms()
+    default_ms = connection.info.get("statement_timeout_ms", 0)
+    if default_ms and remaining_ms >= default_ms:
+        # the connection's own timeout fires before the deadline
+        return
+    # 0 would mean "no timeout" to Postgres
+    connection.execute(
+        _SET_STATEMENT_TIMEOUT, {"statement_timeout": str(max(remaining_ms, 1))}
+    )
+
+
+def instrument_session(session_class) -> None:
+    event.listen(session_class, "after_begin", _apply_db_timeouts)
+
+
+class DeadlineMiddleware:
+    """Runs inside AdmissionControlMiddleware: time spent queued is not counted."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.REQUEST_DEADLINES_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        timeout_ms = settings.REQUEST_TIMEOUTS_MS.get(route_class)
+        if not timeout_ms:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = _deadline.set(Deadline(route_class, timeout_ms))
+        timeout = asyncio.timeout(timeout_ms / 1000)
+        try:
+            async with timeout:
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            # a TimeoutError of the app's own (e.g. wait_for) is not ours
+            if not timeout.expired() or response_started:
+                raise
+            error = DeadlineExceededError(
+                details=[{"reason": "request_timeout", "route_class": route_class}]
+            )
+            await send_error(send, error, scope.get("request_id"))
+        finally:
+            _deadline.reset(token)
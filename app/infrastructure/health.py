@@ -0,0 +1,146 @@
+"""
+Readiness checks behind GET /health/ready.
+
+A worker is ready when:
+- the startup warm-up has finished (warmup.py);
+- `SELECT 1` answers within HEALTH_DB_PING_TIMEOUT_S on every engine. The
+  result is cached for HEALTH_DB_PING_CACHE_S and concurrent probes share
+  one ping, so probes add at most one query per engine per interval;
+- no pool is saturated: checked-out connections below
+  HEALTH_MAX_POOL_SATURATION of pool_size + max_overflow (read from the
+  pool, no query). A saturated pool is reported without pinging, since the
+  ping would only queue behind the requests already waiting;
+- the event loop is not lagging: `EventLoopLagMonitor` sleeps
+  HEALTH_LOOP_LAG_INTERVAL_S in a loop and records how late it wakes up;
+  the last sample must stay under HEALTH_MAX_LOOP_LAG_MS.
+
+Liveness (GET /health/live) checks none of this: restarting a worker
+because the database is down would not help.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.config.settings import get_settings
+from app.infrastructure import warmup
+
+settings = get_settings()
+
+_PING = text("SELECT 1")
+
+
+class CachedDbPing:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.result: Optional[Dict[str, Any]] = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self.result is not None
+            and time.monotonic() - self.checked_at < settings.HEALTH_DB_PING_CACHE_S
+        )
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(_PING)
+
+    async def check(self) -> Dict[str, Any]:
+        if self._fresh():
+            return self.result
+        async with self._lock:
+            # another probe may have pinged while this one waited
+            if self._fresh():
+                return self.result
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(
+                    self._select_one(), settings.HEALTH_DB_PING_TIMEOUT_S
+                )
+                result = {"ok": True}
+            except Exception as exc:
+                result = {"ok": False, "error": exc.__class__.__name__}
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self.result = result
+            self.checked_at = time.monotonic()
+        return self.result
+
+
+class EventLoopLagMonitor:
+    def __init__(self, interval_s: float, samples: int = 20):
+        self.interval_s = interval_s
+        self.samples: Deque[float] = deque(maxlen=samples)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_s)
+            late = loop.time() - started - self.interval_s
+            self.samples.append(max(late, 0.0) * 1000)
+
+    @property
+    def lag_ms(self) -> float:
+        return self.samples[-1] if self.samples else 0.0
+
+    @property
+    def max_lag_ms(self) -> float:
+        return max(self.samples, default=0.0)
+
+
+loop_lag_monitor = EventLoopLagMonitor(settings.HEALTH_LOOP_LAG_INTERVAL_S)
+
+
+def pool_saturation(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None)
+    if isinstance(pool, QueuePool):
+        # max_overflow is only known for pools set up by instrument_pool()
+        max_overflow = metrics.max_overflow if metrics is not None else 0
+        capacity = pool.size() + max_overflow
+        checked_out = pool.checkedout()
+    else:
+        # NullPool / StaticPool: nothing to saturate
+        capacity = checked_out = 0
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+        "ok": saturation < settings.HEALTH_MAX_POOL_SATURATION,
+    }
+
+
+class ReadinessProbe:
+    def __init__(self, engines: List[Tuple[str, AsyncEngine]]):
+        self.engines = engines
+        self.pings = {name: CachedDbPing(engine) for name, engine in engines}
+
+    async def check(self) -> Tuple[bool, Dict[str, Any]]:
+        checks: Dict[str, Any] = {
+            "warmup": {
+                "ok": warmup.state.ready,
+                "duration_ms": warmup.state.duration_ms,
+                "error": warmup.state.error,
+            },
+            "event_loop": {
+                "ok": loop_lag_monitor.lag_ms < settings.HEALTH_MAX_LOOP_LAG_MS,
+                "lag_ms": round(loop_lag_monitor.lag_ms, 2),
+                "max_lag_ms": round(loop_lag_monitor.max_lag_ms, 2),
+            },
+        }
+        for name, engine in self.engines:
+            pool = pool_saturation(engine)
+            checks[f"pool.{name}"] = pool
+            if pool["ok"]:
+                checks[f"database.{name}"] = await self.pings[name].check()
+            else:
+                checks[f"database.{name}"] = {"ok": False, "error": "pool_saturated"}
+        return all(check["ok"] for check in checks.values()), checks
@@ -0,0 +1,47 @@
+"""
+Sampling of `request_completed` log lines.
+
+Errors (an exception or a 4xx/5xx status) and slow requests (at or above
+LOG_SLOW_REQUEST_MS) are always logged. Fast 2xx/3xx requests are logged
+with probability LOG_SAMPLE_RATE, which can be overridden per route template
+(LOG_SAMPLE_RATE_BY_ROUTE, e.g. `{"/health": 0.01}`).
+
+Every logged line carries `log.sample_weight` = 1 / rate (1 for lines that
+are always logged), so downstream counts are reconstructed by summing the
+weights instead of counting lines.
+"""
+
+import random
+from typing import Callable, Mapping, Optional
+
+
+class RequestLogSampler:
+    def __init__(
+        self,
+        rate: float = 1.0,
+        slow_request_ms: int = 500,
+        route_rates: Optional[Mapping[str, float]] = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.rate = rate
+        self.slow_request_ms = slow_request_ms
+        self.route_rates = dict(route_rates or {})
+        # uniform in [0, 1); injectable for tests
+        self.rng = rng
+
+    def weight(
+        self,
+        route: str,
+        status_code: int,
+        duration_ms: float,
+        failed: bool = False,
+    ) -> Optional[float]:
+        """The sample weight to log this request with, or None to skip it."""
+        if failed or status_code >= 400 or duration_ms >= self.slow_request_ms:
+            return 1.0
+        rate = self.route_rates.get(route, self.rate)
+        if rate >= 1.0:
+            return 1.0
+        if rate <= 0.0 or self.rng() >= rate:
+            return None
+        return round(1.0 / rate, 3)
@@ -1,7 +1,108 @@
+import atexit
 import logging
-import json
 import os
-from typing import Any, Dict
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        if not isinstance(record.msg, dict):
+            return record.getMessage()
+        return orjson.dumps(record.msg, default=str).decode()
+
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the stock put_nowait raises queue.Full on a full buffer; the thread
+        # is still draining it, so wait for room instead
+        self.queue.put(self._sentinel)
+
+
+class BackgroundLogHandler(QueueHandler):
+    """
+    Log records go into a bounded queue; a QueueListener thread encodes them
+    (orjson) and writes them to stderr, so the event loop never blocks on
+    json encoding or a slow stdout/stderr consumer.
+
+    When the queue is full the record is dropped and counted instead of
+    blocking the caller. The process entry point (app lifespan, retention
+    CLI) starts and stops the listener; while it is stopped (imports,
+    scripts, after shutdown) records are written synchronously.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.stream_handler = logging.StreamHandler()
+        self.stream_handler.setFormatter(_JsonFormatter())
+        self.listener = _DrainingQueueListener(self.queue, self.stream_handler)
+        self.running = False
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def start(self, maxsize: Optional[int] = None) -> None:
+        with self._lock:
+            if self.running:
+                return
+            if maxsize is not None and maxsize != self.queue.maxsize:
+                # nothing is queued while stopped, so the queue can be swapped
+                self.queue = queue.Queue(maxsize=maxsize)
+                self.listener = _DrainingQueueListener(self.queue, self.stream_handler)
+            self.listener.start()
+            self.running = True
+
+    def stop(self) -> None:
+        """Writes everything still queued, then stops the listener thread."""
+        with self._lock:
+            if self.running:
+                self.running = False
+                self.listener.stop()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # same process: hand the record over as-is, encoding happens on the
+        # listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if not self.running:
+            self.stream_handler.handle(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "dropped": self.dropped,
+        }
+
+
+# sized from Settings.LOG_QUEUE_SIZE by start_logging()
+_handler = BackgroundLogHandler(maxsize=10000)
+
+
+def start_logging(queue_size: Optional[int] = None) -> None:
+    _handler.start(queue_size)
+
+
+def shutdown_logging() -> None:
+    _handler.stop()
+
+
+def log_pipeline_stats() -> Dict[str, int]:
+    """Queue depth, capacity and records dropped because the queue was full."""
+    return _handler.stats()
+
+
+atexit.register(shutdown_logging)
 
 
 class JsonLogger:
@@ -11,9 +112,7 @@ class JsonLogger:
         self.level = os.getenv("LOG_LEVEL", "INFO")
         self.logger = logging.getLogger(service)
         self.logger.setLevel(self.level)
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter("%(message)s"))
-        self.logger.handlers = [handler]
+        self.logger.handlers = [_handler]
 
     def log(self, level: str, message: str, extra: Dict[str, Any]):
         log_entry = {
@@ -28,17 +127,38 @@ class JsonLogger:
         for field in [
             "http.method",
             "http.path",
+            "http.route",
             "http.status_code",
             "duration_ms",
             "error.code",
+            "error.type",
+            "trace_id",
             "user_id",
             "client_ip",
+            "db.pool_wait_ms",
+            "db.pool_timeouts",
+            "db.queries",
+            "db.time_ms",
+            "db.statement",
+            "db.executions",
+            "db.params",
+            "db.caller",
+            "retention.table",
+            "retention.rows_moved",
+            "retention.batches",
+            "warmup.duration_ms",
+            "warmup.connections",
+            "warmup.queries",
+            "warmup.roles",
+            "circuit.name",
+            "circuit.failures",
+            "log.dropped",
+            "log.sample_weight",
         ]:
             if field in extra:
                 log_entry[field] = extra[field]
-        self.logger.log(
-            getattr(logging, level), json.dumps(log_entry, ensure_ascii=False)
-        )
+        # encoded by the background handler
+        self.logger.log(getattr(logging, level), log_entry)
 
     def info(self, message: str, extra: Dict[str, Any]):
         self.log("INFO", message, extra)
@@ -0,0 +1,468 @@
+"""
+In-process metrics registry, exposed in Prometheus text format on /metrics.
+
+Series:
+- http_requests_total / http_request_duration_seconds (histogram), labelled
+  by method, route template and status class (2xx, 4xx, ...). Error rate is
+  `http_requests_total{status_class=~"5xx"}` over the total.
+- http_request_db_queries_total / http_request_db_seconds_total: SQL
+  statements and SQL time of those requests (see db_stats.py).
+- db_pool_* gauges (incl. db_pool_saturation) and the pool wait histogram,
+  labelled by pool: primary, replica and the named pools (from pool_metrics).
+- cache_hits_total / cache_misses_total / cache_hit_ratio, for the
+  SQLAlchemy compiled-statement cache of each engine and for registered
+  `functools.lru_cache`s.
+- log_records_dropped_total (background log writer, see logging.py).
+- admission_* per route class: limit / in flight / queued gauges, admitted
+  and shed counters and the queue wait histogram (see admission.py).
+- db_circuit_* per breaker: open flag, times opened, calls rejected and
+  stale responses served (see circuit_breaker.py).
+
+Recording a request is a dict lookup plus a bisect on the event loop; pool,
+cache and log figures are read only when /metrics is scraped.
+
+Multiple workers: with METRICS_MULTIPROC_DIR set, every worker writes its
+snapshot to `<dir>/metrics_<pid>.json` every METRICS_FLUSH_INTERVAL_S (and
+on shutdown), and a scrape served by any worker merges all files. Counters
+and histograms are summed, including those of workers that have exited;
+gauges only come from live workers. Clear the directory on deploy.
+"""
+
+import asyncio
+import glob
+import os
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+from app.infrastructure.admission import QUEUE_WAIT_BUCKETS_S, admission_status
+from app.infrastructure.circuit_breaker import breaker_status
+from app.infrastructure.logging import log_pipeline_stats
+from app.infrastructure.pool_metrics import POOL_WAIT_BUCKETS_MS, pool_status
+
+REQUEST_DURATION_BUCKETS_S = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _RequestSeries:
+    __slots__ = ("counts", "sum", "count", "db_queries", "db_time")
+
+    def __init__(self):
+        # last slot is the +Inf bucket
+        self.counts = [0] * (len(REQUEST_DURATION_BUCKETS_S) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.db_queries = 0
+        self.db_time = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, str], _RequestSeries] = {}
+        self.caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+        self.sql_cache: Dict[str, List[int]] = {}
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        duration_s: float,
+        db_queries: int = 0,
+        db_time_s: float = 0.0,
+    ) -> None:
+        key = (method, route, f"{status_code // 100}xx")
+        series = self.requests.get(key)
+        if series is None:
+            series = self.requests[key] = _RequestSeries()
+        series.counts[bisect_left(REQUEST_DURATION_BUCKETS_S, duration_s)] += 1
+        series.sum += duration_s
+        series.count += 1
+        series.db_queries += db_queries
+        series.db_time += db_time_s
+
+    def register_cache(self, name: str, hits_misses: Callable[[], Tuple[int, int]]):
+        self.caches[name] = hits_misses
+
+    def register_lru_cache(self, name: str, fn) -> None:
+        def hits_misses():
+            info = fn.cache_info()
+            return info.hits, info.misses
+
+        self.register_cache(name, hits_misses)
+
+    def instrument_engine(self, engine, name: str) -> None:
+        """Counts compiled-statement cache hits/misses of an (async) engine."""
+        counters = self.sql_cache.setdefault(name, [0, 0])
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _count_cache_hit(conn, cursor, statement, params, context, executemany):
+            cache_hit = getattr(context, "cache_hit", None)
+            if cache_hit is CACHE_HIT:
+                counters[0] += 1
+            elif cache_hit is CACHE_MISS:
+                counters[1] += 1
+
+        self.register_cache(f"sql_compiled:{name}", lambda: tuple(counters))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "requests": [
+                [
+                    method,
+                    route,
+                    status_class,
+                    s.counts,
+                    s.sum,
+                    s.count,
+                    s.db_queries,
+                    s.db_time,
+                ]
+                for (method, route, status_class), s in self.requests.items()
+            ],
+            "pools": pool_status(),
+            "caches": {name: list(fn()) for name, fn in self.caches.items()},
+            "log_dropped": log_pipeline_stats()["dropped"],
+            "admission": admission_status(),
+            "breakers": breaker_status(),
+        }
+
+
+registry = MetricsRegistry()
+
+
+# -----------------------------
+# Multiprocess snapshots
+# -----------------------------
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics_{pid}.json")
+
+
+def flush_snapshot(directory: str) -> None:
+    path = _snapshot_path(directory, os.getpid())
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(orjson.dumps(registry.snapshot()))
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect_snapshots(directory: Optional[str]) -> List[Dict[str, Any]]:
+    if not directory:
+        return [registry.snapshot()]
+    flush_snapshot(directory)
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+        try:
+            with open(path, "rb") as fh:
+                snapshots.append(orjson.loads(fh.read()))
+        except (OSError, orjson.JSONDecodeError):
+            continue  # being replaced / removed concurrently
+    return snapshots
+
+
+async def run_flusher(directory: str, interval_s: float) -> None:
+    """Writes this worker's snapshot periodically until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(interval_s)
+            flush_snapshot(directory)
+    finally:
+        flush_snapshot(directory)
+
+
+# -----------------------------
+# Prometheus text format
+# -----------------------------
+
+
+def _labels(**labels: Any) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram(lines, name, labels, bounds, counts, total_sum, total_count):
+    running = 0
+    # some callers keep a trailing +Inf slot in counts; it comes from total_count
+    for bound, count in zip(bounds, counts[: len(bounds)], strict=True):
+        running += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {running}")
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {total_count}')
+    lines.append(f"{name}_sum{_labels(**labels)} {_fmt(total_sum)}")
+    lines.append(f"{name}_count{_labels(**labels)} {total_count}")
+
+
+def render(snapshots: List[Dict[str, Any]]) -> str:
+    requests: Dict[Tuple[str, str, str], list] = {}
+    caches: Dict[str, List[int]] = {}
+    pools: Dict[str, Dict[str, Any]] = {}
+    admission: Dict[str, Dict[str, Any]] = {}
+    breakers: Dict[str, Dict[str, int]] = {}
+    log_dropped = 0
+    for snap in snapshots:
+        for method, route, status_class, counts, *totals in snap["requests"]:
+            acc = requests.setdefault(
+                (method, route, status_class), [[0] * len(counts), 0.0, 0, 0, 0.0]
+            )
+            acc[0] = [a + b for a, b in zip(acc[0], counts, strict=True)]
+            for i, value in enumerate(totals, start=1):
+                acc[i] += value
+        for name, (hits, misses) in snap["caches"].items():
+            acc = caches.setdefault(name, [0, 0])
+            acc[0] += hits
+            acc[1] += misses
+        log_dropped += snap.get("log_dropped", 0)
+        live = snap["pid"] == os.getpid() or _pid_alive(snap["pid"])
+        for limiter in snap.get("admission", []):
+            acc = admission.setdefault(
+                limiter["class"],
+                {
+                    "limit": 0,
+                    "in_flight": 0,
+                    "queued": 0,
+                    "admitted": 0,
+                    "shed": {},
+                    "wait": [0] * len(limiter["wait_counts"]),
+                    "wait_sum": 0.0,
+                },
+            )
+            if live:
+                acc["limit"] += limiter["limit"]
+                acc["in_flight"] += limiter["in_flight"]
+                acc["queued"] += limiter["queued"]
+            acc["admitted"] += limiter["admitted"]
+            for reason, count in limiter["shed"].items():
+                acc["shed"][reason] = acc["shed"].get(reason, 0) + count
+            acc["wait"] = [
+                a + b for a, b in zip(acc["wait"], limiter["wait_counts"], strict=True)
+            ]
+            acc["wait_sum"] += limiter["wait_sum"]
+        for breaker in snap.get("breakers", []):
+            acc = breakers.setdefault(
+                breaker["breaker"],
+                {"open": 0, "opened": 0, "rejected": 0, "stale_served": 0},
+            )
+            if live and breaker["state"] != "closed":
+                acc["open"] += 1
+            for key in ("opened", "rejected", "stale_served"):
+                acc[key] += breaker[key]
+        for pool in snap["pools"]:
+            acc = pools.setdefault(
+                pool["pool"],
+                {
+                    "size": 0,
+                    "max_overflow": 0,
+                    "checked_out": 0,
+                    "overflow": 0,
+                    "acquire_timeouts": 0,
+                    "wait": [0] * len(POOL_WAIT_BUCKETS_MS),
+                    "wait_sum": 0.0,
+                    "wait_count": 0,
+                },
+            )
+            if live:
+                acc["size"] += pool["size"]
+                acc["max_overflow"] += pool["max_overflow"]
+                acc["checked_out"] += pool["checked_out"]
+                acc["overflow"] += pool["overflow"]
+            acc["acquire_timeouts"] += pool["acquire_timeouts"]
+            # pool_status() buckets are cumulative, keyed by the ms bound
+            previous = 0
+            for i, bound in enumerate(POOL_WAIT_BUCKETS_MS):
+                cumulative = pool["wait_ms"]["buckets"][str(bound)]
+                acc["wait"][i] += cumulative - previous
+                previous = cumulative
+            acc["wait_sum"] += pool["wait_ms"]["sum"] / 1000
+            acc["wait_count"] += pool["wait_ms"]["count"]
+
+    lines: List[str] = []
+    lines.append("# HELP http_requests_total HTTP requests served.")
+    lines.append("# TYPE http_requests_total counter")
+    for (method, route, status_class), acc in sorted(requests.items()):
+        labels = _labels(method=method, route=route, status_class=status_class)
+        lines.append(f"http_requests_total{labels} {acc[2]}")
+    lines.append("# HELP http_request_duration_seconds HTTP request latency.")
+    lines.append("# TYPE http_request_duration_seconds histogram")
+    for (method, route, status_class), (counts, total, count, *_) in sorted(
+        requests.items()
+    ):
+        _histogram(
+            lines,
+            "http_request_duration_seconds",
+            dict(method=method, route=route, status_class=status_class),
+            REQUEST_DURATION_BUCKETS_S,
+            counts,
+            total,
+            count,
+        )
+    # per-request averages: rate(<metric>) / rate(http_requests_total)
+    lines.append("# HELP http_request_db_queries_total SQL statements run by requests.")
+    lines.append("# TYPE http_request_db_queries_total counter")
+    for (method, route, status_class), acc in sorted(requests.items()):
+        labels = _labels(method=method, route=route, status_class=status_class)
+        lines.append(f"http_request_db_queries_total{labels} {acc[3]}")
+    lines.append("# HELP http_request_db_seconds_total Time requests spent in SQL.")
+    lines.append("# TYPE http_request_db_seconds_total counter")
+    for (method, route, status_class), acc in sorted(requests.items()):
+        labels = _labels(method=method, route=route, status_class=status_class)
+        lines.append(f"http_request_db_seconds_total{labels} {_fmt(acc[4])}")
+
+    for metric, key, kind, help_text in (
+        ("db_pool_size", "size", "gauge", "Configured pool size."),
+        (
+            "db_pool_max_overflow",
+            "max_overflow",
+            "gauge",
+            "Overflow connections allowed.",
+        ),
+        ("db_pool_checked_out", "checked_out", "gauge", "Connections in use."),
+        ("db_pool_overflow", "overflow", "gauge", "Overflow connections open."),
+        (
+            "db_pool_acquire_timeouts_total",
+            "acquire_timeouts",
+            "counter",
+            "Connection acquisitions that timed out.",
+        ),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, acc in sorted(pools.items()):
+            lines.append(f"{metric}{_labels(pool=name)} {acc[key]}")
+    lines.append(
+        "# HELP db_pool_saturation Connections in use over pool_size + max_overflow."
+    )
+    lines.append("# TYPE db_pool_saturation gauge")
+    for name, acc in sorted(pools.items()):
+        capacity = acc["size"] + acc["max_overflow"]
+        saturation = acc["checked_out"] / capacity if capacity else 0.0
+        lines.append(
+            f"db_pool_saturation{_labels(pool=name)} {_fmt(round(saturation, 3))}"
+        )
+    lines.append("# HELP db_pool_wait_seconds Time waited for a pool connection.")
+    lines.append("# TYPE db_pool_wait_seconds histogram")
+    for name, acc in sorted(pools.items()):
+        _histogram(
+            lines,
+            "db_pool_wait_seconds",
+            dict(pool=name),
+            [bound / 1000 for bound in POOL_WAIT_BUCKETS_MS],
+            acc["wait"],
+            acc["wait_sum"],
+            acc["wait_count"],
+        )
+
+    lines.append("# HELP cache_hits_total Cache lookups served from the cache.")
+    lines.append("# TYPE cache_hits_total counter")
+    for name, (hits, _) in sorted(caches.items()):
+        lines.append(f"cache_hits_total{_labels(cache=name)} {hits}")
+    lines.append("# HELP cache_misses_total Cache lookups that missed.")
+    lines.append("# TYPE cache_misses_total counter")
+    for name, (_, misses) in sorted(caches.items()):
+        lines.append(f"cache_misses_total{_labels(cache=name)} {misses}")
+    lines.append("# HELP cache_hit_ratio Hits over lookups since start.")
+    lines.append("# TYPE cache_hit_ratio gauge")
+    for name, (hits, misses) in sorted(caches.items()):
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f"cache_hit_ratio{_labels(cache=name)} {_fmt(round(ratio, 4))}")
+
+    for metric, key, kind, help_text in (
+        ("admission_limit", "limit", "gauge", "Concurrent requests allowed."),
+        ("admission_in_flight", "in_flight", "gauge", "Requests holding a slot."),
+        ("admission_queued", "queued", "gauge", "Requests waiting for a slot."),
+        (
+            "admission_admitted_total",
+            "admitted",
+            "counter",
+            "Requests admitted.",
+        ),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, acc in sorted(admission.items()):
+            lines.append(f"{metric}{_labels(route_class=name)} {acc[key]}")
+    lines.append("# HELP admission_shed_total Requests rejected with 503 (overload).")
+    lines.append("# TYPE admission_shed_total counter")
+    for name, acc in sorted(admission.items()):
+        for reason, count in sorted(acc["shed"].items()):
+            lines.append(
+                f"admission_shed_total{_labels(route_class=name, reason=reason)} {count}"
+            )
+    lines.append("# HELP admission_queue_wait_seconds Time admitted requests queued.")
+    lines.append("# TYPE admission_queue_wait_seconds histogram")
+    for name, acc in sorted(admission.items()):
+        _histogram(
+            lines,
+            "admission_queue_wait_seconds",
+            dict(route_class=name),
+            QUEUE_WAIT_BUCKETS_S,
+            acc["wait"],
+            acc["wait_sum"],
+            sum(acc["wait"]),
+        )
+
+    for metric, key, kind, help_text in (
+        (
+            "db_circuit_open",
+            "open",
+            "gauge",
+            "Workers whose circuit is open or half-open.",
+        ),
+        ("db_circuit_opened_total", "opened", "counter", "Times the circuit opened."),
+        (
+            "db_circuit_rejected_total",
+            "rejected",
+            "counter",
+            "Calls failed fast with 503 while open.",
+        ),
+        (
+            "db_circuit_stale_served_total",
+            "stale_served",
+            "counter",
+            "Stale responses served while open.",
+        ),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, acc in sorted(breakers.items()):
+            lines.append(f"{metric}{_labels(breaker=name)} {acc[key]}")
+
+    lines.append("# HELP log_records_dropped_total Log records dropped (full buffer).")
+    lines.append("# TYPE log_records_dropped_total counter")
+    lines.append(f"log_records_dropped_total {log_dropped}")
+    return "\n".join(lines) + "\n"
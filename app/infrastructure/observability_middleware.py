@@ -0,0 +1,149 @@
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import Request
+
+from app.infrastructure import metrics
+from app.infrastructure.db_stats import start_request_db_stats
+from app.infrastructure.log_sampling import RequestLogSampler
+from app.infrastructure.logging import JsonLogger, mask_ip, mask_user_id
+
+REQUEST_ID_HEADER = "X-Request-Id"
+_REQUEST_ID_KEY = REQUEST_ID_HEADER.lower().encode()
+_REQUEST_ID_HEADER = REQUEST_ID_HEADER.encode()
+
+
+class ObservabilityMiddleware:
+    """
+    Request id, timing, per-request DB stats, RED metrics and the sampled
+    `request_completed` log in a single pure ASGI middleware (outermost).
+
+    Unlike `@app.middleware("http")` (BaseHTTPMiddleware) there is no extra
+    task or response body stream per request, and headers are scanned once
+    for X-Request-Id instead of being copied into a dict. Flags are read from
+    `settings` on every request, so they can be toggled at runtime.
+    """
+
+    def __init__(self, app, settings, logger: JsonLogger, sampler: RequestLogSampler):
+        self.app = app
+        self.settings = settings
+        self.logger = logger
+        self.sampler = sampler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        settings = self.settings
+        detect_n_plus_one = (
+            settings.APP_ENV == "dev"
+            if settings.DB_DETECT_N_PLUS_ONE is None
+            else settings.DB_DETECT_N_PLUS_ONE
+        )
+        db_stats = start_request_db_stats(track_statements=detect_n_plus_one)
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == _REQUEST_ID_KEY:
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = f"req_{uuid.uuid4().hex[:16]}"
+        scope["request_id"] = request_id
+        db_stats.request_id = request_id
+        encoded_request_id = request_id.encode("latin-1")
+
+        status_code = 500
+        error_code = None
+        error_type = None
+        failed = False
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = message.setdefault("headers", [])
+                # error responses already carry it (exception_handlers)
+                if not any(key.lower() == _REQUEST_ID_KEY for key, _ in headers):
+                    headers.append((_REQUEST_ID_HEADER, encoded_request_id))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as exc:
+            status_code = 500
+            error_code = getattr(exc, "error_code", None)
+            error_type = exc.__class__.__name__
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            duration_ms = int(elapsed * 1000)
+            method = scope["method"]
+            route = scope.get("route")
+            path_template = getattr(route, "path", scope["path"])
+            if settings.METRICS_ENABLED:
+                # requests that never matched a route (404, shed by admission
+                # control) share one label to keep series cardinality bounded
+                metrics.registry.observe_request(
+                    method,
+                    "<unmatched>" if route is None else path_template,
+                    status_code,
+                    elapsed,
+                    db_stats.queries,
+                    db_stats.query_time_ms / 1000,
+                )
+            if detect_n_plus_one:
+                for statement, executions in db_stats.repeated_statements(
+                    settings.DB_N_PLUS_ONE_THRESHOLD
+                ):
+                    self.logger.warning(
+                        "n_plus_one_suspected",
+                        {
+                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            "request_id": request_id,
+                            "http.method": method,
+                            "http.route": path_template,
+                            "db.statement": statement[:500],
+                            "db.executions": executions,
+                        },
+                    )
+            # errors and slow requests are always logged, fast ones are sampled
+            sample_weight = self.sampler.weight(
+                path_template, status_code, duration_ms, failed
+            )
+
+            if sample_weight is not None:
+                client = scope.get("client")
+                client_ip = mask_ip(client[0] if client else None)
+                user_id = None
+
+                self.logger.info(
+                    "request_completed",
+                    {
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "request_id": request_id,
+                        "http.method": method,
+                        "http.path": scope["path"],
+                        "http.route": path_template,
+                        "http.status_code": status_code,
+                        "duration_ms": duration_ms,
+                        "client_ip": client_ip,
+                        "user_id": mask_user_id(user_id) if user_id else None,
+                        "error.code": error_code,
+                        "error.type": error_type,
+                        "trace_id": scope.get("trace_id"),
+                        "db.pool_wait_ms": round(db_stats.pool_wait_ms, 2),
+                        "db.pool_timeouts": db_stats.pool_timeouts,
+                        "db.queries": db_stats.queries,
+                        "db.time_ms": round(db_stats.query_time_ms, 2),
+                        "log.sample_weight": sample_weight,
+                    },
+                )
+
+
+def get_request_id(request: Request) -> str:
+    return getattr(request, "scope", {}).get("request_id", None)
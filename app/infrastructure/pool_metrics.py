@@ -0,0 +1,130 @@
+"""
+Connection pool instrumentation.
+
+Every engine created through `app.infrastructure.db` uses
+`InstrumentedAsyncQueuePool`, which records, per pool:
+- how long each connection acquisition waited (histogram, in ms)
+- how many acquisitions timed out (`pool_timeout` exceeded)
+- live checked-out / overflow counts, read from the pool itself
+
+Metrics are keyed by the pool name given to `create_engine_from_settings`
+and attached with `instrument_pool`; they follow the pool through
+re-creation (e.g. after `engine.dispose()`).
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.infrastructure.db_stats import current_db_stats
+
+POOL_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        # last slot is the +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self.counts[:-1], strict=True):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "sum": round(self.sum, 3), "count": self.count}
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[AsyncAdaptedQueuePool] = None
+        # configured on the engine; QueuePool does not expose it publicly
+        self.max_overflow = 0
+        self.wait_ms = Histogram(POOL_WAIT_BUCKETS_MS)
+        self.timeouts = 0
+
+    def attach(self, pool: "InstrumentedAsyncQueuePool") -> None:
+        self.pool = pool
+        pool.metrics = self
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        return {
+            "pool": self.name,
+            "size": pool.size() if pool else 0,
+            "checked_out": pool.checkedout() if pool else 0,
+            "checked_in": pool.checkedin() if pool else 0,
+            # QueuePool reports -size while no overflow connection is open
+            "overflow": max(pool.overflow(), 0) if pool else 0,
+            "max_overflow": self.max_overflow if pool else 0,
+            "acquire_timeouts": self.timeouts,
+            "wait_ms": self.wait_ms.snapshot(),
+        }
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    metrics = _pool_metrics.get(name)
+    if metrics is None:
+        metrics = _pool_metrics[name] = PoolMetrics(name)
+    return metrics
+
+
+def pool_status() -> list[Dict[str, Any]]:
+    return [m.snapshot() for m in _pool_metrics.values()]
+
+
+def instrument_pool(pool, name: str, max_overflow: int) -> PoolMetrics:
+    metrics = get_pool_metrics(name)
+    metrics.max_overflow = max_overflow
+    metrics.attach(pool)
+    return metrics
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    # set by instrument_pool(); connections are only timed once attached
+    metrics: Optional[PoolMetrics] = None
+
+    def recreate(self):
+        pool = super().recreate()
+        if self.metrics is not None:
+            self.metrics.attach(pool)
+        return pool
+
+    def connect(self):
+        if self.metrics is None:
+            return super().connect()
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - start) * 1000
+            self.metrics.wait_ms.observe(waited_ms)
+            if timed_out:
+                self.metrics.timeouts += 1
+            stats = current_db_stats()
+            if stats is not None:
+                stats.pool_wait_ms += waited_ms
+                if timed_out:
+                    stats.pool_timeouts += 1
@@ -0,0 +1,181 @@
+"""
+Read-replica routing with read-your-writes consistency tokens.
+
+When `DATABASE_READ_URL` is set, `RoutingSession` (see `app.infrastructure.db`)
+sends plain SELECTs to the replica and everything else to the primary.
+
+Consistency:
+- Requests with unsafe methods (POST/PUT/PATCH/DELETE) are pinned to the
+  primary for all their reads.
+- When such a request writes, the response carries the primary WAL position
+  (LSN) as a consistency token, both in the `X-Consistency-Token` header and
+  in a cookie.
+- Follow-up reads presenting the token are pinned to the primary until the
+  replica has replayed up to that LSN; then the cookie is cleared.
+
+Pointing `DATABASE_READ_URL` at the primary itself (one instance behind two
+URLs) is supported: the LSN probe falls back to `pg_current_wal_lsn()` when
+the server is not in recovery.
+"""
+
+import asyncio
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import text
+from starlette.datastructures import MutableHeaders
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
+CONSISTENCY_COOKIE = "vlab_consistency"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_LSN_RE = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+_PRIMARY_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+_REPLICA_LSN_SQL = text(
+    "SELECT (CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() "
+    "ELSE pg_current_wal_lsn() END)::text"
+)
+
+
+class _RoutingState:
+    __slots__ = ("pin_primary", "wrote")
+
+    def __init__(self, pin_primary: bool = False):
+        self.pin_primary = pin_primary
+        self.wrote = False
+
+
+_routing_state: ContextVar[Optional[_RoutingState]] = ContextVar(
+    "replica_routing_state", default=None
+)
+
+
+def start_routing(pin_primary: bool = False) -> _RoutingState:
+    state = _RoutingState(pin_primary)
+    _routing_state.set(state)
+    return state
+
+
+def reads_pinned_to_primary() -> bool:
+    state = _routing_state.get()
+    return state is not None and state.pin_primary
+
+
+def mark_primary_write() -> None:
+    state = _routing_state.get()
+    if state is not None:
+        state.wrote = True
+        # read-your-writes inside the same request
+        state.pin_primary = True
+
+
+def parse_lsn(value: Optional[str]) -> Optional[int]:
+    if not value or not _LSN_RE.match(value):
+        return None
+    high, low = value.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+class ReplicaLagTracker:
+    """Caches the replica replay position so token checks don't hit the DB per request."""
+
+    def __init__(self, replica_engine, refresh_interval_ms: int = 200):
+        self.replica_engine = replica_engine
+        self.refresh_interval = refresh_interval_ms / 1000
+        self._lsn: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return time.monotonic() - self._checked_at < self.refresh_interval
+
+    async def replayed_lsn(self) -> Optional[int]:
+        if self._fresh():
+            return self._lsn
+        async with self._lock:
+            if not self._fresh():
+                try:
+                    async with self.replica_engine.connect() as conn:
+                        value = (await conn.execute(_REPLICA_LSN_SQL)).scalar()
+                    self._lsn = parse_lsn(value)
+                except Exception:
+                    # unknown replica position: behave as if it is lagging
+                    self._lsn = None
+                self._checked_at = time.monotonic()
+        return self._lsn
+
+    async def caught_up(self, token_lsn: int) -> bool:
+        replayed = await self.replayed_lsn()
+        return replayed is not None and replayed >= token_lsn
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app, primary_engine, replica_engine=None, **tracker_kwargs):
+        self.app = app
+        self.primary_engine = primary_engine
+        self.replica_engine = replica_engine
+        self.tracker = (
+            ReplicaLagTracker(replica_engine, **tracker_kwargs)
+            if replica_engine is not None
+            else None
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.tracker is None:
+            await self.app(scope, receive, send)
+            return
+
+        pin_primary = scope["method"] not in SAFE_METHODS
+        token_lsn = parse_lsn(self._token_from_scope(scope))
+        clear_token = False
+        if token_lsn is not None and not pin_primary:
+            if await self.tracker.caught_up(token_lsn):
+                clear_token = True
+            else:
+                pin_primary = True
+
+        state = start_routing(pin_primary)
+
+        async def send_with_token(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if state.wrote and message["status"] < 400:
+                    lsn = await self._primary_lsn()
+                    if lsn:
+                        headers.append(CONSISTENCY_HEADER, lsn)
+                        headers.append(
+                            "set-cookie",
+                            f"{CONSISTENCY_COOKIE}={lsn}; Path=/; HttpOnly; SameSite=Lax",
+                        )
+                elif clear_token:
+                    headers.append(
+                        "set-cookie",
+                        f"{CONSISTENCY_COOKIE}=; Path=/; Max-Age=0; HttpOnly; SameSite=Lax",
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_token)
+
+    async def _primary_lsn(self) -> Optional[str]:
+        try:
+            async with self.primary_engine.connect() as conn:
+                return (await conn.execute(_PRIMARY_LSN_SQL)).scalar()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _token_from_scope(scope) -> Optional[str]:
+        header_name = CONSISTENCY_HEADER.lower().encode()
+        cookie_value = None
+        for name, value in scope["headers"]:
+            if name == header_name:
+                return value.decode("latin-1")
+            if name == b"cookie":
+                for part in value.decode("latin-1").split(";"):
+                    key, _, val = part.strip().partition("=")
+                    if key == CONSISTENCY_COOKIE and val:
+                        cookie_value = val
+        return cookie_value
@@ -1,24 +1,54 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from app.domain.application_repository import ApplicationRepository
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    SQLAlchemyRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_models import ApplicationModel
-from datetime import datetime
 from app.domain.errors import ConflictError, NotFoundError
 
+# prebuilt, parameterized hot reads (see offer_repository_sqlalchemy)
+_LIVE = ApplicationModel.deleted_at.is_(None)
+_GET_BY_ID = select(ApplicationModel).where(
+    ApplicationModel.id == bindparam("id"), _LIVE
+)
+_GET_BY_CANDIDATE_AND_OFFER = select(ApplicationModel).where(
+    ApplicationModel.candidate_profile_id == bindparam("candidate_profile_id"),
+    ApplicationModel.offer_id == bindparam("offer_id"),
+    _LIVE,
+)
+# lists select Core rows and map them straight to domain objects
+_LIST_BY_CANDIDATE_PROFILE = (
+    select(ApplicationModel.__table__)
+    .where(
+        ApplicationModel.candidate_profile_id == bindparam("candidate_profile_id"),
+        _LIVE,
+    )
+    .offset(bindparam("offset"))
+    .limit(bindparam("limit"))
+)
+_LIST_BY_OFFER = (
+    select(ApplicationModel.__table__)
+    .where(ApplicationModel.offer_id == bindparam("offer_id"), _LIVE)
+    .offset(bindparam("offset"))
+    .limit(bindparam("limit"))
+)
 
-class ApplicationRepositorySQLAlchemy(ApplicationRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
 
+class ApplicationRepositorySQLAlchemy(SQLAlchemyRepository, ApplicationRepository):
     async def create(self, application) -> ApplicationModel:
-        async with self.session_factory() as session:
-            db_obj = ApplicationModel.from_domain(application)
-            session.add(db_obj)
+        async with self._session() as session:
             try:
-                await session.commit()
+                db_obj = await self._insert_returning(
+                    session,
+                    ApplicationModel,
+                    ApplicationModel.values_from_domain(application),
+                )
+                await self._commit(session)
             except IntegrityError:
                 await session.rollback()
                 raise ConflictError(
@@ -30,29 +60,21 @@ class ApplicationRepositorySQLAlchemy(ApplicationRepository):
                         }
                     ],
                 )
-            await session.refresh(db_obj)
             return db_obj.to_domain()
 
     async def get_by_id(self, id: UUID) -> Optional[ApplicationModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(ApplicationModel).where(
-                    ApplicationModel.id == id, ApplicationModel.deleted_at.is_(None)
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": id})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def get_by_candidate_and_offer(
         self, candidate_profile_id: UUID, offer_id: UUID
     ) -> Optional[ApplicationModel]:
-        async with self.session_factory() as session:
+        async with self._session() as session:
             result = await session.execute(
-                select(ApplicationModel).where(
-                    ApplicationModel.candidate_profile_id == candidate_profile_id,
-                    ApplicationModel.offer_id == offer_id,
-                    ApplicationModel.deleted_at.is_(None),
-                )
+                _GET_BY_CANDIDATE_AND_OFFER,
+                {"candidate_profile_id": candidate_profile_id, "offer_id": offer_id},
             )
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
@@ -60,51 +82,58 @@ class ApplicationRepositorySQLAlchemy(ApplicationRepository):
     async def list_by_candidate_profile(
         self, candidate_profile_id: UUID, limit: int = 20, offset: int = 0
     ) -> List[ApplicationModel]:
-        async with self.session_factory() as session:
+        async with self._session() as session:
             result = await session.execute(
-                select(ApplicationModel)
-                .where(
-                    ApplicationModel.candidate_profile_id == candidate_profile_id,
-                    ApplicationModel.deleted_at.is_(None),
-                )
-                .offset(offset)
-                .limit(limit)
+                _LIST_BY_CANDIDATE_PROFILE,
+                {
+                    "candidate_profile_id": candidate_profile_id,
+                    "limit": limit,
+                    "offset": offset,
+                },
             )
-            return [row.to_domain() for row in result.scalars().all()]
+            return [ApplicationModel.row_to_domain(row) for row in result]
 
     async def list_by_offer(
         self, offer_id: UUID, limit: int = 20, offset: int = 0
     ) -> List[ApplicationModel]:
-        async with self.session_factory() as session:
+        async with self._session() as session:
             result = await session.execute(
-                select(ApplicationModel)
-                .where(
-                    ApplicationModel.offer_id == offer_id,
-                    ApplicationModel.deleted_at.is_(None),
-                )
-                .offset(offset)
-                .limit(limit)
+                _LIST_BY_OFFER, {"offer_id": offer_id, "limit": limit, "offset": offset}
             )
-            return [row.to_domain() for row in result.scalars().all()]
+            return [ApplicationModel.row_to_domain(row) for row in result]
 
     async def update(self, application) -> ApplicationModel:
-        async with self.session_factory() as session:
-            db_obj = await session.get(ApplicationModel, application.id)
-            if not db_obj or db_obj.deleted_at:
+        async with self._session() as session:
+            db_obj = await self._update_returning(
+                session,
+                ApplicationModel,
+                application.id,
+                ApplicationModel.update_values(application),
+            )
+            if not db_obj:
+                return None
+            await self._commit(session)
+            return db_obj.to_domain()
+
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[ApplicationModel]:
+        async with self._session() as session:
+            db_obj = await self._update_returning(
+                session,
+                ApplicationModel,
+                id,
+                {**changes, "updated_at": datetime.utcnow()},
+                expected_version,
+            )
+            if not db_obj:
                 return None
-            db_obj.update_from_domain(application)
-            db_obj.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(db_obj)
+            await self._commit(session)
             return db_obj.to_domain()
 
     async def soft_delete(
         self, id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ) -> None:
-        async with self.session_factory() as session:
-            db_obj = await session.get(ApplicationModel, id)
-            if db_obj and not db_obj.deleted_at:
-                db_obj.deleted_at = datetime.utcnow()
-                db_obj.deleted_by = deleted_by
-                db_obj.deletion_reason = reason
-                await session.commit()
+        async with self._session() as session:
+            await self._soft_delete(session, ApplicationModel, id, deleted_by, reason)
+            await self._commit(session)
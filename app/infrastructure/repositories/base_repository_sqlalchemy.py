@@ -0,0 +1,160 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
+
+from app.domain.errors import PreconditionFailedError
+from app.infrastructure.circuit_breaker import database_breaker
+from app.infrastructure.db import SessionLocal
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
+
+# integrity_constraint_violation SQLSTATEs (class 23)
+NOT_NULL_VIOLATION = "23502"
+FOREIGN_KEY_VIOLATION = "23503"
+UNIQUE_VIOLATION = "23505"
+CHECK_VIOLATION = "23514"
+
+
+class IntegrityViolation(NamedTuple):
+    sqlstate: Optional[str]
+    constraint: Optional[str]
+    column: Optional[str]
+
+
+def integrity_violation(exc: IntegrityError) -> IntegrityViolation:
+    """
+    SQLSTATE, constraint and column of an IntegrityError, from the driver's
+    structured fields (the message text varies with driver and locale).
+    """
+    orig = exc.orig
+    # asyncpg: SQLAlchemy's adapter error is raised from the asyncpg one;
+    # psycopg: the fields are on `diag`
+    source = getattr(orig, "diag", None) or getattr(orig, "__cause__", None)
+    return IntegrityViolation(
+        sqlstate=getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None),
+        constraint=getattr(source, "constraint_name", None),
+        column=getattr(source, "column_name", None),
+    )
+
+
+class SQLAlchemyRepository:
+    """
+    Session handling shared by the SQLAlchemy repositories.
+
+    - Bound to a unit of work: every call uses the unit of work's session and
+      writes are only flushed; the use case owns the single commit.
+    - Standalone (`session_factory`): each call opens its own session and
+      commits its writes, as before.
+
+    Writes go through `_insert_returning` / `_update_returning`, so each one is
+    a single `INSERT ... RETURNING` / `UPDATE ... RETURNING` round trip instead
+    of add + flush + refresh (or get + flush + refresh). Relationships are left
+    unloaded on the returned rows (`lazyload`), so no follow-up SELECTs fire.
+
+    Every `_session()` goes through the database circuit breaker.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        uow: Optional[SQLAlchemyUnitOfWork] = None,
+    ):
+        self.session_factory = session_factory
+        self.uow = uow
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        # fails fast with 503 while the database circuit is open
+        async with database_breaker.guard():
+            if self.uow is not None:
+                yield self.uow.session
+                return
+            async with self.session_factory() as session:
+                yield session
+
+    async def _commit(self, session: AsyncSession) -> None:
+        if self.uow is not None:
+            await session.flush()
+        else:
+            await session.commit()
+
+    async def _insert_returning(self, session: AsyncSession, model, values: dict):
+        stmt = insert(model).values(**values).returning(model).options(lazyload("*"))
+        result = await session.execute(stmt)
+        return result.scalar_one()
+
+    async def _update_returning(
+        self,
+        session: AsyncSession,
+        model,
+        id: UUID,
+        values: dict,
+        expected_version: Optional[int] = None,
+    ):
+        """
+        UPDATE the live (not soft-deleted) row; returns None when none matched.
+
+        Versioned models get `version = version + 1`; with `expected_version`
+        the UPDATE is conditional on it and a miss on an existing row raises
+        PreconditionFailedError (one extra SELECT, only on the failure path).
+        """
+        stmt = update(model).where(model.id == id, model.deleted_at.is_(None))
+        if hasattr(model, "version"):
+            values = {**values, "version": model.version + 1}
+            if expected_version is not None:
+                stmt = stmt.where(model.version == expected_version)
+        stmt = (
+            stmt.values(**values)
+            .returning(model)
+            .options(lazyload("*"))
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        db_obj = result.scalar_one_or_none()
+        if db_obj is None and expected_version is not None:
+            current = await session.scalar(
+                select(model.version).where(model.id == id, model.deleted_at.is_(None))
+            )
+            if current is not None:
+                raise PreconditionFailedError(
+                    details=[
+                        {
+                            "field": "If-Match",
+                            "reason": f"expected version {expected_version}, "
+                            f"current is {current}",
+                        }
+                    ]
+                )
+        return db_obj
+
+    async def _soft_delete(
+        self,
+        session: AsyncSession,
+        model,
+        id: UUID,
+        deleted_by: Optional[UUID] = None,
+        reason: Optional[str] = None,
+        **values,
+    ) -> None:
+        values = dict(
+            deleted_at=datetime.utcnow(),
+            deleted_by=deleted_by,
+            deletion_reason=reason,
+            **values,
+        )
+        if hasattr(model, "version"):
+            values["version"] = model.version + 1
+        stmt = (
+            update(model)
+            .where(model.id == id, model.deleted_at.is_(None))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
@@ -1,24 +1,44 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from app.domain.candidate_profile_repository import CandidateProfileRepository
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    SQLAlchemyRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_models import CandidateProfileModel
-from datetime import datetime
 from app.domain.errors import ConflictError, NotFoundError
 
+# prebuilt, parameterized hot reads (see offer_repository_sqlalchemy)
+_LIVE = CandidateProfileModel.deleted_at.is_(None)
+_GET_BY_ID = select(CandidateProfileModel).where(
+    CandidateProfileModel.id == bindparam("id"), _LIVE
+)
+_GET_BY_USER_ID = select(CandidateProfileModel).where(
+    CandidateProfileModel.user_id == bindparam("user_id"), _LIVE
+)
+_LIST = (
+    select(CandidateProfileModel)
+    .where(_LIVE)
+    .offset(bindparam("offset"))
+    .limit(bindparam("limit"))
+)
 
-class CandidateProfileRepositorySQLAlchemy(CandidateProfileRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
 
+class CandidateProfileRepositorySQLAlchemy(
+    SQLAlchemyRepository, CandidateProfileRepository
+):
     async def create(self, profile: CandidateProfileModel) -> CandidateProfileModel:
-        async with self.session_factory() as session:
-            db_obj = CandidateProfileModel.from_domain(profile)
-            session.add(db_obj)
+        async with self._session() as session:
             try:
-                await session.commit()
+                db_obj = await self._insert_returning(
+                    session,
+                    CandidateProfileModel,
+                    CandidateProfileModel.values_from_domain(profile),
+                )
+                await self._commit(session)
             except IntegrityError:
                 await session.rollback()
                 raise ConflictError(
@@ -27,61 +47,61 @@ class CandidateProfileRepositorySQLAlchemy(CandidateProfileRepository):
                         {"field": "user_id", "reason": "duplicate or foreign key error"}
                     ],
                 )
-            await session.refresh(db_obj)
             return db_obj.to_domain()
 
     async def get_by_id(self, id: UUID) -> Optional[CandidateProfileModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(CandidateProfileModel).where(
-                    CandidateProfileModel.id == id,
-                    CandidateProfileModel.deleted_at.is_(None),
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": id})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def get_by_user_id(self, user_id: UUID) -> Optional[CandidateProfileModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(CandidateProfileModel).where(
-                    CandidateProfileModel.user_id == user_id,
-                    CandidateProfileModel.deleted_at.is_(None),
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_USER_ID, {"user_id": user_id})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def update(self, profile: CandidateProfileModel) -> CandidateProfileModel:
-        async with self.session_factory() as session:
-            db_obj = await session.get(CandidateProfileModel, profile.id)
-            if not db_obj or db_obj.deleted_at:
+        async with self._session() as session:
+            db_obj = await self._update_returning(
+                session,
+                CandidateProfileModel,
+                profile.id,
+                CandidateProfileModel.update_values(profile),
+            )
+            if not db_obj:
                 return None
-            db_obj.update_from_domain(profile)
-            db_obj.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(db_obj)
+            await self._commit(session)
+            return db_obj.to_domain()
+
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[CandidateProfileModel]:
+        async with self._session() as session:
+            db_obj = await self._update_returning(
+                session,
+                CandidateProfileModel,
+                id,
+                {**changes, "updated_at": datetime.utcnow()},
+                expected_version,
+            )
+            if not db_obj:
+                return None
+            await self._commit(session)
             return db_obj.to_domain()
 
     async def soft_delete(
         self, id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ) -> None:
-        async with self.session_factory() as session:
-            db_obj = await session.get(CandidateProfileModel, id)
-            if db_obj and not db_obj.deleted_at:
-                db_obj.deleted_at = datetime.utcnow()
-                db_obj.deleted_by = deleted_by
-                db_obj.deletion_reason = reason
-                await session.commit()
+        async with self._session() as session:
+            await self._soft_delete(
+                session, CandidateProfileModel, id, deleted_by, reason
+            )
+            await self._commit(session)
 
     async def list(
         self, limit: int = 20, offset: int = 0
     ) -> List[CandidateProfileModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(CandidateProfileModel)
-                .where(CandidateProfileModel.deleted_at.is_(None))
-                .offset(offset)
-                .limit(limit)
-            )
+        async with self._session() as session:
+            result = await session.execute(_LIST, {"limit": limit, "offset": offset})
             return [row.to_domain() for row in result.scalars().all()]
@@ -1,66 +1,99 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
 from app.domain.institution_repository import InstitutionRepository
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.metrics import registry as metrics_registry
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    SQLAlchemyRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_models import InstitutionModel
-from datetime import datetime
+from app.infrastructure.repositories.soft_delete_cascade import SoftDeleteCascade
+
+# prebuilt, parameterized hot reads (see offer_repository_sqlalchemy)
+_GET_BY_ID = select(InstitutionModel).where(
+    InstitutionModel.id == bindparam("id"), InstitutionModel.deleted_at.is_(None)
+)
+
 
+@lru_cache(maxsize=None)
+def _list_query(by_name: bool):
+    # Core rows -> domain objects, no ORM entities (see OfferModel.row_to_domain)
+    query = select(InstitutionModel.__table__).where(
+        InstitutionModel.deleted_at.is_(None)
+    )
+    if by_name:
+        query = query.where(InstitutionModel.name.ilike(bindparam("name")))
+    return query.offset(bindparam("offset")).limit(bindparam("limit"))
 
-class InstitutionRepositorySQLAlchemy(InstitutionRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
 
+metrics_registry.register_lru_cache("institution_list_query", _list_query)
+
+
+class InstitutionRepositorySQLAlchemy(SQLAlchemyRepository, InstitutionRepository):
     async def create(self, institution) -> InstitutionModel:
-        async with self.session_factory() as session:
-            db_inst = InstitutionModel.from_domain(institution)
-            session.add(db_inst)
-            await session.commit()
-            await session.refresh(db_inst)
+        async with self._session() as session:
+            db_inst = await self._insert_returning(
+                session,
+                InstitutionModel,
+                InstitutionModel.values_from_domain(institution),
+            )
+            await self._commit(session)
             return db_inst.to_domain()
 
     async def list(
         self, name: Optional[str] = None, limit: int = 20, offset: int = 0
     ) -> List[InstitutionModel]:
-        async with self.session_factory() as session:
-            query = select(InstitutionModel).where(
-                InstitutionModel.deleted_at.is_(None)
-            )
+        async with self._session() as session:
+            params = {"limit": limit, "offset": offset}
             if name:
-                query = query.where(InstitutionModel.name.ilike(f"%{name}%"))
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            return [row.to_domain() for row in result.scalars().all()]
+                params["name"] = f"%{name}%"
+            result = await session.execute(_list_query(bool(name)), params)
+            return [InstitutionModel.row_to_domain(row) for row in result]
 
     async def get_by_id(self, institution_id: UUID) -> Optional[InstitutionModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(InstitutionModel).where(
-                    InstitutionModel.id == institution_id,
-                    InstitutionModel.deleted_at.is_(None),
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": institution_id})
             db_inst = result.scalar_one_or_none()
             return db_inst.to_domain() if db_inst else None
 
     async def update(self, institution) -> InstitutionModel:
-        async with self.session_factory() as session:
-            db_inst = await session.get(InstitutionModel, institution.id)
-            if not db_inst or db_inst.deleted_at:
+        async with self._session() as session:
+            db_inst = await self._update_returning(
+                session,
+                InstitutionModel,
+                institution.id,
+                InstitutionModel.update_values(institution),
+            )
+            if not db_inst:
                 return None
-            db_inst.update_from_domain(institution)
-            db_inst.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(db_inst)
+            await self._commit(session)
+            return db_inst.to_domain()
+
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[InstitutionModel]:
+        async with self._session() as session:
+            db_inst = await self._update_returning(
+                session,
+                InstitutionModel,
+                id,
+                {**changes, "updated_at": datetime.utcnow()},
+                expected_version,
+            )
+            if not db_inst:
+                return None
+            await self._commit(session)
             return db_inst.to_domain()
 
     async def soft_delete(
         self, institution_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ) -> None:
-        async with self.session_factory() as session:
-            db_inst = await session.get(InstitutionModel, institution_id)
-            if db_inst and not db_inst.deleted_at:
-                db_inst.deleted_at = datetime.utcnow()
-                db_inst.deleted_by = deleted_by
-                db_inst.deletion_reason = reason
-                await session.commit()
+        async with self._session() as session:
+            # programs, offers and applications go with it (set-based, chunked)
+            await SoftDeleteCascade(session, deleted_by, reason).institution(
+                institution_id
+            )
+            await self._commit(session)
@@ -1,27 +1,57 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update
-from sqlalchemy.orm import selectinload
-from app.domain.offer import Offer, OfferType, OfferStatus
+from app.domain.offer import Offer, OfferType
 from app.domain.offer_repository import OfferRepository
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.metrics import registry as metrics_registry
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    CHECK_VIOLATION,
+    FOREIGN_KEY_VIOLATION,
+    NOT_NULL_VIOLATION,
+    SQLAlchemyRepository,
+    integrity_violation,
+)
 from app.infrastructure.repositories.sqlalchemy_models import OfferModel
-from datetime import datetime
+from app.infrastructure.repositories.soft_delete_cascade import SoftDeleteCascade
 from sqlalchemy.exc import IntegrityError
-from app.domain.errors import NotFoundError
+from app.domain.errors import NotFoundError, ValidationError
+
+# Hot reads are built once with bind parameters, so each call skips
+# statement construction and reuses the same cache key / SQL string
+# (compiled cache hit, and the same asyncpg prepared statement).
+_GET_BY_ID = select(OfferModel).where(
+    OfferModel.id == bindparam("id"), OfferModel.deleted_at.is_(None)
+)
+
 
+@lru_cache(maxsize=None)
+def _list_query(by_institution: bool, by_type: bool, by_status: bool):
+    # Core select of the table: rows map straight to domain objects, without
+    # ORM entities or the identity map (see OfferModel.row_to_domain)
+    query = select(OfferModel.__table__).where(OfferModel.deleted_at.is_(None))
+    if by_institution:
+        query = query.where(OfferModel.institution_id == bindparam("institution_id"))
+    if by_type:
+        query = query.where(OfferModel.type == bindparam("type"))
+    if by_status:
+        query = query.where(OfferModel.status == bindparam("status"))
+    return query.offset(bindparam("offset")).limit(bindparam("limit"))
 
-class OfferRepositorySQLAlchemy(OfferRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
 
+metrics_registry.register_lru_cache("offer_list_query", _list_query)
+
+
+class OfferRepositorySQLAlchemy(SQLAlchemyRepository, OfferRepository):
     async def create(self, offer: Offer) -> Offer:
-        async with self.session_factory() as session:
-            db_offer = OfferModel.from_domain(offer)
-            session.add(db_offer)
+        async with self._session() as session:
             try:
-                await session.commit()
+                db_offer = await self._insert_returning(
+                    session, OfferModel, OfferModel.values_from_domain(offer)
+                )
+                await self._commit(session)
             except IntegrityError:
                 await session.rollback()
                 # Could be missing institution_id or program_id
@@ -32,53 +62,93 @@ class OfferRepositorySQLAlchemy(OfferRepository):
                         {"field": "program_id", "reason": "not found"},
                     ],
                 )
-            await session.refresh(db_offer)
             return db_offer.to_domain()
 
     async def list(
         self, institution_id=None, type=None, status=None, limit=20, offset=0
     ) -> List[Offer]:
-        async with self.session_factory() as session:
-            query = select(OfferModel).where(OfferModel.deleted_at.is_(None))
+        async with self._session() as session:
+            params = {"limit": limit, "offset": offset}
             if institution_id:
-                query = query.where(OfferModel.institution_id == institution_id)
+                params["institution_id"] = institution_id
             if type:
-                query = query.where(OfferModel.type == type)
+                params["type"] = type
             if status:
-                query = query.where(OfferModel.status == status)
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            return [row.to_domain() for row in result.scalars().all()]
+                params["status"] = status
+            query = _list_query(bool(institution_id), bool(type), bool(status))
+            result = await session.execute(query, params)
+            return [OfferModel.row_to_domain(row) for row in result]
 
     async def get_by_id(self, offer_id: UUID) -> Optional[Offer]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(OfferModel).where(
-                    OfferModel.id == offer_id, OfferModel.deleted_at.is_(None)
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": offer_id})
             db_offer = result.scalar_one_or_none()
             return db_offer.to_domain() if db_offer else None
 
     async def update(self, offer: Offer) -> Offer:
-        async with self.session_factory() as session:
-            db_offer = await session.get(OfferModel, offer.id)
-            if not db_offer or db_offer.deleted_at:
+        async with self._session() as session:
+            db_offer = await self._update_returning(
+                session, OfferModel, offer.id, OfferModel.update_values(offer)
+            )
+            if not db_offer:
+                return None
+            await self._commit(session)
+            return db_offer.to_domain()
+
+    async def update_fields(
+        self, offer_id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[Offer]:
+        async with self._session() as session:
+            try:
+                db_offer = await self._update_returning(
+                    session,
+                    OfferModel,
+                    offer_id,
+                    {**changes, "updated_at": datetime.utcnow()},
+                    expected_version,
+                )
+            except IntegrityError as e:
+                await session.rollback()
+                violation = integrity_violation(e)
+                # dates are validated by ck_offer_deadline_after_publication
+                # against the stored row, so no read is needed beforehand
+                if (
+                    violation.sqlstate == CHECK_VIOLATION
+                    and violation.constraint == "ck_offer_deadline_after_publication"
+                ):
+                    raise ValidationError(
+                        message="application_deadline must be after publication_date",
+                        details=[
+                            {
+                                "field": "application_deadline",
+                                "reason": "must be after publication_date",
+                            }
+                        ],
+                    ) from e
+                # program_id is the only foreign key a PATCH can change
+                if (
+                    violation.sqlstate == FOREIGN_KEY_VIOLATION
+                    and violation.constraint == "offers_program_id_fkey"
+                ):
+                    raise NotFoundError(
+                        message="Program not found",
+                        details=[{"field": "program_id", "reason": "not found"}],
+                    ) from e
+                if violation.sqlstate == NOT_NULL_VIOLATION:
+                    raise ValidationError(
+                        message=f"{violation.column or 'field'} may not be null",
+                        details=[{"field": violation.column, "reason": "not null"}],
+                    ) from e
+                raise
+            if not db_offer:
                 return None
-            db_offer.update_from_domain(offer)
-            db_offer.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(db_offer)
+            await self._commit(session)
             return db_offer.to_domain()
 
     async def soft_delete(
         self, offer_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ) -> None:
-        async with self.session_factory() as session:
-            db_offer = await session.get(OfferModel, offer_id)
-            if db_offer and not db_offer.deleted_at:
-                db_offer.deleted_at = datetime.utcnow()
-                db_offer.deleted_by = deleted_by
-                db_offer.deletion_reason = reason
-                db_offer.status = OfferStatus.DELETED
-                await session.commit()
+        async with self._session() as session:
+            # also marks the offer's applications
+            await SoftDeleteCascade(session, deleted_by, reason).offer(offer_id)
+            await self._commit(session)
@@ -1,25 +1,46 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
 from app.domain.program import Program
 from app.domain.program_repository import ProgramRepository
 from sqlalchemy.exc import IntegrityError
 from app.domain.errors import NotFoundError
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.metrics import registry as metrics_registry
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    SQLAlchemyRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_models import ProgramModel
-from datetime import datetime
+from app.infrastructure.repositories.soft_delete_cascade import SoftDeleteCascade
+
+# prebuilt, parameterized hot reads (see offer_repository_sqlalchemy)
+_GET_BY_ID = select(ProgramModel).where(
+    ProgramModel.id == bindparam("id"), ProgramModel.deleted_at.is_(None)
+)
+
 
+@lru_cache(maxsize=None)
+def _list_query(by_institution: bool):
+    # Core rows -> domain objects, no ORM entities (see OfferModel.row_to_domain)
+    query = select(ProgramModel.__table__).where(ProgramModel.deleted_at.is_(None))
+    if by_institution:
+        query = query.where(ProgramModel.institution_id == bindparam("institution_id"))
+    return query.offset(bindparam("offset")).limit(bindparam("limit"))
 
-class ProgramRepositorySQLAlchemy(ProgramRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
 
+metrics_registry.register_lru_cache("program_list_query", _list_query)
+
+
+class ProgramRepositorySQLAlchemy(SQLAlchemyRepository, ProgramRepository):
     async def create(self, program: Program) -> Program:
-        async with self.session_factory() as session:
-            db_obj = ProgramModel.from_domain(program)
-            session.add(db_obj)
+        async with self._session() as session:
             try:
-                await session.commit()
+                db_obj = await self._insert_returning(
+                    session, ProgramModel, ProgramModel.values_from_domain(program)
+                )
+                await self._commit(session)
             except IntegrityError as e:
                 await session.rollback()
                 # Likely foreign key violation for institution_id — map to NotFoundError
@@ -27,48 +48,55 @@ class ProgramRepositorySQLAlchemy(ProgramRepository):
                     message="Institution not found",
                     details=[{"field": "institution_id", "reason": "not found"}],
                 )
-            await session.refresh(db_obj)
             return db_obj.to_domain()
 
     async def list(
         self, institution_id: Optional[UUID] = None, limit: int = 20, offset: int = 0
     ) -> List[Program]:
-        async with self.session_factory() as session:
-            query = select(ProgramModel).where(ProgramModel.deleted_at.is_(None))
+        async with self._session() as session:
+            params = {"limit": limit, "offset": offset}
             if institution_id:
-                query = query.where(ProgramModel.institution_id == institution_id)
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            return [row.to_domain() for row in result.scalars().all()]
+                params["institution_id"] = institution_id
+            query = _list_query(bool(institution_id))
+            result = await session.execute(query, params)
+            return [ProgramModel.row_to_domain(row) for row in result]
 
     async def get_by_id(self, program_id: UUID) -> Optional[Program]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(ProgramModel).where(
-                    ProgramModel.id == program_id, ProgramModel.deleted_at.is_(None)
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": program_id})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def update(self, program: Program) -> Program:
-        async with self.session_factory() as session:
-            db_obj = await session.get(ProgramModel, program.id)
-            if not db_obj or db_obj.deleted_at:
+        async with self._session() as session:
+            db_obj = await self._update_returning(
+                session, ProgramModel, program.id, ProgramModel.update_values(program)
+            )
+            if not db_obj:
+                return None
+            await self._commit(session)
+            return db_obj.to_domain()
+
+    async def update_fields(
+        self, id: UUID, changes: dict, expected_version: Optional[int] = None
+    ) -> Optional[Program]:
+        async with self._session() as session:
+            db_obj = await self._update_returning(
+                session,
+                ProgramModel,
+                id,
+                {**changes, "updated_at": datetime.utcnow()},
+                expected_version,
+            )
+            if not db_obj:
                 return None
-            db_obj.update_from_domain(program)
-            db_obj.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(db_obj)
+            await self._commit(session)
             return db_obj.to_domain()
 
     async def soft_delete(
         self, program_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ) -> None:
-        async with self.session_factory() as session:
-            db_obj = await session.get(ProgramModel, program_id)
-            if db_obj and not db_obj.deleted_at:
-                db_obj.deleted_at = datetime.utcnow()
-                db_obj.deleted_by = deleted_by
-                db_obj.deletion_reason = reason
-                await session.commit()
+        async with self._session() as session:
+            # offers and applications go with it (set-based, chunked)
+            await SoftDeleteCascade(session, deleted_by, reason).program(program_id)
+            await self._commit(session)
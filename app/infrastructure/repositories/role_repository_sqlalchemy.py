@@ -1,58 +1,124 @@
+import time
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import bindparam, update
 from sqlalchemy.future import select
+from sqlalchemy.orm import lazyload
+from app.config.settings import get_settings
+from app.domain.role import Role
 from app.domain.role_repository import RoleRepository
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    SQLAlchemyRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_models import RoleModel
 from datetime import datetime
 
+settings = get_settings()
 
-class RoleRepositorySQLAlchemy(RoleRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
+# prebuilt, parameterized hot reads (see offer_repository_sqlalchemy); roles
+# are mapped without their user_roles, which would be selectin-loaded (every
+# user of every role) and are never read
+_GET_BY_ID = (
+    select(RoleModel)
+    .where(RoleModel.id == bindparam("id"), RoleModel.deleted_at.is_(None))
+    .options(lazyload("*"))
+)
+_GET_BY_NAME = (
+    select(RoleModel)
+    .where(RoleModel.name == bindparam("name"), RoleModel.deleted_at.is_(None))
+    .options(lazyload("*"))
+)
+_LIST = (
+    select(RoleModel)
+    .where(RoleModel.deleted_at.is_(None))
+    .offset(bindparam("offset"))
+    .limit(bindparam("limit"))
+    .options(lazyload("*"))
+)
+_LIST_ALL = (
+    select(RoleModel)
+    .where(RoleModel.deleted_at.is_(None))
+    .order_by(RoleModel.name)
+    .options(lazyload("*"))
+)
 
+
+class RoleCache:
+    """
+    Process-local copy of the roles table: reference data, a handful of rows
+    read on every registration. Loaded at startup (warmup.py); role writes in
+    this process clear it, writes from other processes are picked up after
+    ROLE_CACHE_TTL_S.
+    """
+
+    def __init__(self):
+        self.roles: Optional[List[Role]] = None
+        self.loaded_at = 0.0
+
+    def get(self) -> Optional[List[Role]]:
+        if self.roles is None:
+            return None
+        if time.monotonic() - self.loaded_at > settings.ROLE_CACHE_TTL_S:
+            return None
+        return self.roles
+
+    def set(self, roles: List[Role]) -> None:
+        self.roles = roles
+        self.loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        self.roles = None
+
+
+role_cache = RoleCache()
+
+
+class RoleRepositorySQLAlchemy(SQLAlchemyRepository, RoleRepository):
     async def create(self, role) -> RoleModel:
-        async with self.session_factory() as session:
-            db_obj = RoleModel.from_domain(role)
-            session.add(db_obj)
-            await session.commit()
-            await session.refresh(db_obj)
+        async with self._session() as session:
+            db_obj = await self._insert_returning(
+                session, RoleModel, RoleModel.values_from_domain(role)
+            )
+            await self._commit(session)
+            role_cache.clear()
             return db_obj.to_domain()
 
     async def get_by_id(self, id: UUID) -> Optional[RoleModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(RoleModel).where(
-                    RoleModel.id == id, RoleModel.deleted_at.is_(None)
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": id})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def get_by_name(self, name: str) -> Optional[RoleModel]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(RoleModel).where(
-                    RoleModel.name == name, RoleModel.deleted_at.is_(None)
-                )
-            )
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_NAME, {"name": name})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def list(self, limit: int = 20, offset: int = 0) -> List[RoleModel]:
-        async with self.session_factory() as session:
-            query = (
-                select(RoleModel)
-                .where(RoleModel.deleted_at.is_(None))
-                .offset(offset)
-                .limit(limit)
-            )
-            result = await session.execute(query)
-            return [row.to_domain() for row in result.scalars().all()]
+        if settings.ROLE_CACHE_TTL_S <= 0:
+            async with self._session() as session:
+                result = await session.execute(
+                    _LIST, {"limit": limit, "offset": offset}
+                )
+                return [row.to_domain() for row in result.scalars().all()]
+        roles = role_cache.get()
+        if roles is None:
+            # the unit of work's session when there is one: the factory may not
+            # be the one the caller's session came from (tests, read replicas)
+            async with self._session() as session:
+                result = await session.execute(_LIST_ALL)
+                roles = [row.to_domain() for row in result.scalars().all()]
+            role_cache.set(roles)
+        return roles[offset : offset + limit]
 
     async def delete(self, id: UUID) -> None:
-        async with self.session_factory() as session:
-            db_obj = await session.get(RoleModel, id)
-            if db_obj and not db_obj.deleted_at:
-                db_obj.deleted_at = datetime.utcnow()
-                await session.commit()
+        async with self._session() as session:
+            await session.execute(
+                update(RoleModel)
+                .where(RoleModel.id == id, RoleModel.deleted_at.is_(None))
+                .values(deleted_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await self._commit(session)
+            role_cache.clear()
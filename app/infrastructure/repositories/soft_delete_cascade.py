@@ -0,0 +1,95 @@
+"""
+Set-based cascading soft delete: institution -> programs -> offers -> applications.
+
+Each level is marked with chunked `UPDATE ... WHERE id IN (SELECT id ... LIMIT n)`
+statements, bottom-up (children first, while their parents are still live),
+so a cascade costs a handful of statements regardless of how many rows it
+touches. All statements run on the caller's session, i.e. in one transaction.
+Every row gets the same deleted_at / deleted_by / deletion_reason.
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.domain.offer import OfferStatus
+from app.infrastructure.repositories.sqlalchemy_models import (
+    ApplicationModel,
+    InstitutionModel,
+    OfferModel,
+    ProgramModel,
+)
+
+
+class SoftDeleteCascade:
+    def __init__(
+        self,
+        session: AsyncSession,
+        deleted_by: Optional[UUID],
+        reason: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        self.session = session
+        self.deleted_by = deleted_by
+        self.reason = reason
+        self.chunk_size = chunk_size or get_settings().SOFT_DELETE_CHUNK_SIZE
+        self.deleted_at = datetime.utcnow()
+        self.counts: dict[str, int] = {}
+
+    async def _mark(self, model, *criteria, **values) -> int:
+        """Soft-deletes the live rows of `model` matching `criteria`, in chunks."""
+        values = dict(
+            deleted_at=self.deleted_at,
+            deleted_by=self.deleted_by,
+            deletion_reason=self.reason,
+            **values,
+        )
+        if hasattr(model, "version"):
+            values["version"] = model.version + 1
+        batch = (
+            select(model.id)
+            .where(model.deleted_at.is_(None), *criteria)
+            .limit(self.chunk_size)
+        )
+        stmt = (
+            update(model)
+            .where(model.id.in_(batch))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        total = 0
+        while True:
+            result = await self.session.execute(stmt)
+            total += result.rowcount
+            if result.rowcount < self.chunk_size:
+                break
+        table = model.__tablename__
+        self.counts[table] = self.counts.get(table, 0) + total
+        return total
+
+    def _live_offer_ids(self, *criteria):
+        return select(OfferModel.id).where(OfferModel.deleted_at.is_(None), *criteria)
+
+    async def offers(self, *criteria) -> int:
+        """Offers matching `criteria` and their applications."""
+        await self._mark(
+            ApplicationModel,
+            ApplicationModel.offer_id.in_(self._live_offer_ids(*criteria)),
+        )
+        return await self._mark(OfferModel, *criteria, status=OfferStatus.DELETED)
+
+    async def offer(self, offer_id: UUID) -> int:
+        return await self.offers(OfferModel.id == offer_id)
+
+    async def program(self, program_id: UUID) -> int:
+        await self.offers(OfferModel.program_id == program_id)
+        return await self._mark(ProgramModel, ProgramModel.id == program_id)
+
+    async def institution(self, institution_id: UUID) -> int:
+        await self.offers(OfferModel.institution_id == institution_id)
+        await self._mark(ProgramModel, ProgramModel.institution_id == institution_id)
+        return await self._mark(InstitutionModel, InstitutionModel.id == institution_id)
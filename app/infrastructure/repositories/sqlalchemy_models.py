@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
 from sqlalchemy import (
@@ -7,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     Date,
     ForeignKey,
+    Integer,
     String,
     Text,
     UniqueConstraint,
@@ -24,6 +26,9 @@ from app.domain.user import User
 from app.domain.role import Role
 from app.domain.application import Application
 
+if TYPE_CHECKING:
+    from app.domain.candidate_profile import CandidateProfile
+
 Base = declarative_base()
 
 
@@ -67,6 +72,7 @@ class OfferModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     deleted_by = Column(PG_UUID(as_uuid=True), nullable=True)
     deletion_reason = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Note: roles are associated to users via the `user_roles` association table.
     # Offers do not have a direct many-to-many to roles; the relationship
@@ -74,26 +80,33 @@ class OfferModel(Base):
     # NoForeignKeysError.
 
     def to_domain(self) -> Offer:
-        return Offer(
-            id=self.id,
-            institution_id=self.institution_id,
-            program_id=self.program_id,
-            title=self.title,
-            description=self.description,
-            type=self.type,
-            status=self.status,
-            publication_date=self.publication_date,
-            application_deadline=self.application_deadline,
-            created_at=self.created_at,
-            updated_at=self.updated_at,
-            deleted_at=self.deleted_at,
-            deleted_by=self.deleted_by,
-            deletion_reason=self.deletion_reason,
+        return self.row_to_domain(self)
+
+    @staticmethod
+    def row_to_domain(row) -> Offer:
+        # works for ORM instances and Core rows (same attribute names), so
+        # list reads can skip ORM entities / the identity map
+        return Offer.from_persistence(
+            id=row.id,
+            institution_id=row.institution_id,
+            program_id=row.program_id,
+            title=row.title,
+            description=row.description,
+            type=row.type,
+            status=row.status,
+            publication_date=row.publication_date,
+            application_deadline=row.application_deadline,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            deleted_at=row.deleted_at,
+            deleted_by=row.deleted_by,
+            deletion_reason=row.deletion_reason,
+            version=row.version,
         )
 
-    @classmethod
-    def from_domain(cls, offer: Offer) -> "OfferModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(offer: Offer) -> dict:
+        return dict(
             id=offer.id,
             institution_id=offer.institution_id,
             program_id=getattr(offer, "program_id", None),
@@ -108,20 +121,33 @@ class OfferModel(Base):
             deleted_at=offer.deleted_at,
             deleted_by=offer.deleted_by,
             deletion_reason=offer.deletion_reason,
+            version=offer.version,
         )
 
-    def update_from_domain(self, offer: Offer):
-        self.title = offer.title
-        self.description = offer.description
+    @classmethod
+    def from_domain(cls, offer: Offer) -> "OfferModel":
+        return cls(**cls.values_from_domain(offer))
+
+    @staticmethod
+    def update_values(offer: Offer) -> dict:
+        values = dict(
+            title=offer.title,
+            description=offer.description,
+            type=offer.type,
+            status=offer.status,
+            publication_date=offer.publication_date,
+            application_deadline=offer.application_deadline,
+            updated_at=datetime.utcnow(),
+        )
         # allow updating program_id when present
         if hasattr(offer, "program_id"):
-            self.program_id = offer.program_id
-        self.type = offer.type
-        self.status = offer.status
-        self.publication_date = offer.publication_date
-        self.application_deadline = offer.application_deadline
-        self.updated_at = datetime.utcnow()
+            values["program_id"] = offer.program_id
         # Não atualiza deleted_at, deleted_by, deletion_reason aqui
+        return values
+
+    def update_from_domain(self, offer: Offer):
+        for key, value in self.update_values(offer).items():
+            setattr(self, key, value)
 
     # relationships
     program = relationship("ProgramModel", backref="offers")
@@ -146,22 +172,28 @@ class InstitutionModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     deleted_by = Column(PG_UUID(as_uuid=True), nullable=True)
     deletion_reason = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     def to_domain(self) -> "Institution":
-        return Institution(
-            id=self.id,
-            name=self.name,
-            description=self.description,
-            created_at=self.created_at,
-            updated_at=self.updated_at,
-            deleted_at=self.deleted_at,
-            deleted_by=self.deleted_by,
-            deletion_reason=self.deletion_reason,
+        return self.row_to_domain(self)
+
+    @staticmethod
+    def row_to_domain(row) -> "Institution":
+        return Institution.from_persistence(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            deleted_at=row.deleted_at,
+            deleted_by=row.deleted_by,
+            deletion_reason=row.deletion_reason,
+            version=row.version,
         )
 
-    @classmethod
-    def from_domain(cls, institution: "Institution") -> "InstitutionModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(institution: "Institution") -> dict:
+        return dict(
             id=institution.id,
             name=institution.name,
             description=institution.description,
@@ -170,12 +202,24 @@ class InstitutionModel(Base):
             deleted_at=institution.deleted_at,
             deleted_by=institution.deleted_by,
             deletion_reason=institution.deletion_reason,
+            version=institution.version,
+        )
+
+    @classmethod
+    def from_domain(cls, institution: "Institution") -> "InstitutionModel":
+        return cls(**cls.values_from_domain(institution))
+
+    @staticmethod
+    def update_values(institution: "Institution") -> dict:
+        return dict(
+            name=institution.name,
+            description=institution.description,
+            updated_at=datetime.utcnow(),
         )
 
     def update_from_domain(self, institution: "Institution"):
-        self.name = institution.name
-        self.description = institution.description
-        self.updated_at = datetime.utcnow()
+        for key, value in self.update_values(institution).items():
+            setattr(self, key, value)
 
 
 class ProgramModel(Base):
@@ -202,26 +246,32 @@ class ProgramModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     deleted_by = Column(PG_UUID(as_uuid=True), nullable=True)
     deletion_reason = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     def to_domain(self) -> Program:
-        return Program(
-            id=self.id,
-            institution_id=self.institution_id,
-            name=self.name,
-            description=self.description,
-            created_at=self.created_at,
-            updated_at=self.updated_at,
-            deleted_at=self.deleted_at,
-            deleted_by=self.deleted_by,
-            deletion_reason=self.deletion_reason,
+        return self.row_to_domain(self)
+
+    @staticmethod
+    def row_to_domain(row) -> Program:
+        return Program.from_persistence(
+            id=row.id,
+            institution_id=row.institution_id,
+            name=row.name,
+            description=row.description,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            deleted_at=row.deleted_at,
+            deleted_by=row.deleted_by,
+            deletion_reason=row.deletion_reason,
+            version=row.version,
         )
 
     # relationship to InstitutionModel (optional convenience)
     institution = relationship("InstitutionModel", backref="programs")
 
-    @classmethod
-    def from_domain(cls, program: Program) -> "ProgramModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(program: Program) -> dict:
+        return dict(
             id=program.id,
             institution_id=program.institution_id,
             name=program.name,
@@ -231,12 +281,24 @@ class ProgramModel(Base):
             deleted_at=program.deleted_at,
             deleted_by=program.deleted_by,
             deletion_reason=program.deletion_reason,
+            version=program.version,
+        )
+
+    @classmethod
+    def from_domain(cls, program: Program) -> "ProgramModel":
+        return cls(**cls.values_from_domain(program))
+
+    @staticmethod
+    def update_values(program: Program) -> dict:
+        return dict(
+            name=program.name,
+            description=program.description,
+            updated_at=datetime.utcnow(),
         )
 
     def update_from_domain(self, program: Program):
-        self.name = program.name
-        self.description = program.description
-        self.updated_at = datetime.utcnow()
+        for key, value in self.update_values(program).items():
+            setattr(self, key, value)
 
 
 class RoleModel(Base):
@@ -257,16 +319,18 @@ class RoleModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
     def to_domain(self) -> Role:
-        return Role(
+        return Role.from_persistence(
             id=self.id,
             name=self.name,
             description=self.description,
             created_at=self.created_at,
+            updated_at=self.updated_at,
+            deleted_at=self.deleted_at,
         )
 
-    @classmethod
-    def from_domain(cls, role: Role) -> "RoleModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(role: Role) -> dict:
+        return dict(
             id=role.id,
             name=role.name,
             description=getattr(role, "description", None),
@@ -280,6 +344,10 @@ class RoleModel(Base):
             ),
         )
 
+    @classmethod
+    def from_domain(cls, role: Role) -> "RoleModel":
+        return cls(**cls.values_from_domain(role))
+
     def update_from_domain(self, role: Role):
         self.name = role.name
         self.description = getattr(role, "description", self.description)
@@ -347,23 +415,26 @@ class UserModel(Base):
     deleted_by = Column(PG_UUID(as_uuid=True), nullable=True)
     deletion_reason = Column(String(255), nullable=True)
 
-    def to_domain(self) -> "User":
+    def to_domain(self, roles: Optional[list] = None) -> "User":
         # map role string to Role enum if possible
-        # build roles list from related RoleModel objects if loaded
-        roles = []
-        if hasattr(self, "roles") and self.roles is not None:
-            for r in self.roles:
-                try:
-                    roles.append(Role(id=r.id, name=r.name, created_at=r.created_at))
-                except Exception:
-                    continue
-
-        return User(
+        # build roles list from related RoleModel objects if loaded; callers
+        # that already know the roles (e.g. after INSERT ... RETURNING) pass
+        # them in to avoid a lazy load of `user_roles`
+        if roles is None:
+            roles = []
+            if hasattr(self, "roles") and self.roles is not None:
+                for r in self.roles:
+                    try:
+                        roles.append(r.to_domain())
+                    except Exception:
+                        continue
+
+        return User.from_persistence(
             id=self.id,
             email=self.email,
             hashed_password=self.hashed_password,
             roles=roles,
-            institution_id=getattr(self, "institution_id", None),
+            institution_id=self.institution_id,
             created_at=self.created_at,
             updated_at=self.updated_at,
             deleted_at=self.deleted_at,
@@ -371,9 +442,9 @@ class UserModel(Base):
             deletion_reason=self.deletion_reason,
         )
 
-    @classmethod
-    def from_domain(cls, user: "User") -> "UserModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(user: "User") -> dict:
+        return dict(
             id=user.id,
             email=user.email,
             hashed_password=user.hashed_password,
@@ -386,14 +457,23 @@ class UserModel(Base):
             deletion_reason=user.deletion_reason,
         )
 
-    def update_from_domain(self, user: "User"):
-        self.email = user.email
+    @classmethod
+    def from_domain(cls, user: "User") -> "UserModel":
+        return cls(**cls.values_from_domain(user))
+
+    @staticmethod
+    def update_values(user: "User") -> dict:
+        values = dict(email=user.email, updated_at=datetime.utcnow())
         if hasattr(user, "institution_id"):
-            self.institution_id = user.institution_id
+            values["institution_id"] = user.institution_id
         if hasattr(user, "hashed_password") and user.hashed_password:
-            self.hashed_password = user.hashed_password
+            values["hashed_password"] = user.hashed_password
         # roles are managed via the `user_roles` association and repository logic
-        self.updated_at = datetime.utcnow()
+        return values
+
+    def update_from_domain(self, user: "User"):
+        for key, value in self.update_values(user).items():
+            setattr(self, key, value)
 
     # optional convenience relationship to InstitutionModel
     # explicit association object from User -> UserRoleModel
@@ -437,6 +517,7 @@ class CandidateProfileModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     deleted_by = Column(PG_UUID(as_uuid=True), nullable=True)
     deletion_reason = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # relationship to user (optional convenience)
     user = relationship("UserModel")
@@ -444,7 +525,7 @@ class CandidateProfileModel(Base):
     def to_domain(self) -> "CandidateProfile":
         from app.domain.candidate_profile import CandidateProfile
 
-        return CandidateProfile(
+        return CandidateProfile.from_persistence(
             id=self.id,
             user_id=self.user_id,
             full_name=self.full_name,
@@ -455,11 +536,12 @@ class CandidateProfileModel(Base):
             deleted_at=self.deleted_at,
             deleted_by=self.deleted_by,
             deletion_reason=self.deletion_reason,
+            version=self.version,
         )
 
-    @classmethod
-    def from_domain(cls, profile: "CandidateProfile") -> "CandidateProfileModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(profile: "CandidateProfile") -> dict:
+        return dict(
             id=profile.id,
             user_id=profile.user_id,
             full_name=profile.full_name,
@@ -470,13 +552,25 @@ class CandidateProfileModel(Base):
             deleted_at=profile.deleted_at,
             deleted_by=profile.deleted_by,
             deletion_reason=profile.deletion_reason,
+            version=profile.version,
+        )
+
+    @classmethod
+    def from_domain(cls, profile: "CandidateProfile") -> "CandidateProfileModel":
+        return cls(**cls.values_from_domain(profile))
+
+    @staticmethod
+    def update_values(profile: "CandidateProfile") -> dict:
+        return dict(
+            full_name=profile.full_name,
+            date_of_birth=profile.date_of_birth,
+            cpf=profile.cpf,
+            updated_at=datetime.utcnow(),
         )
 
     def update_from_domain(self, profile: "CandidateProfile"):
-        self.full_name = profile.full_name
-        self.date_of_birth = profile.date_of_birth
-        self.cpf = profile.cpf
-        self.updated_at = datetime.utcnow()
+        for key, value in self.update_values(profile).items():
+            setattr(self, key, value)
 
 
 class ApplicationModel(Base):
@@ -508,6 +602,7 @@ class ApplicationModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     deleted_by = Column(PG_UUID(as_uuid=True), nullable=True)
     deletion_reason = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     __table_args__ = (
         UniqueConstraint(
@@ -516,21 +611,26 @@ class ApplicationModel(Base):
     )
 
     def to_domain(self) -> Application:
-        return Application(
-            id=self.id,
-            candidate_profile_id=self.candidate_profile_id,
-            offer_id=self.offer_id,
-            status=self.status,
-            created_at=self.created_at,
-            updated_at=self.updated_at,
-            deleted_at=self.deleted_at,
-            deleted_by=self.deleted_by,
-            deletion_reason=self.deletion_reason,
+        return self.row_to_domain(self)
+
+    @staticmethod
+    def row_to_domain(row) -> Application:
+        return Application.from_persistence(
+            id=row.id,
+            candidate_profile_id=row.candidate_profile_id,
+            offer_id=row.offer_id,
+            status=row.status,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            deleted_at=row.deleted_at,
+            deleted_by=row.deleted_by,
+            deletion_reason=row.deletion_reason,
+            version=row.version,
         )
 
-    @classmethod
-    def from_domain(cls, application: Application) -> "ApplicationModel":
-        return cls(
+    @staticmethod
+    def values_from_domain(application: Application) -> dict:
+        return dict(
             id=application.id,
             candidate_profile_id=application.candidate_profile_id,
             offer_id=application.offer_id,
@@ -540,8 +640,17 @@ class ApplicationModel(Base):
             deleted_at=application.deleted_at,
             deleted_by=application.deleted_by,
             deletion_reason=application.deletion_reason,
+            version=application.version,
         )
 
+    @classmethod
+    def from_domain(cls, application: Application) -> "ApplicationModel":
+        return cls(**cls.values_from_domain(application))
+
+    @staticmethod
+    def update_values(application: Application) -> dict:
+        return dict(status=application.status, updated_at=datetime.utcnow())
+
     def update_from_domain(self, application: Application):
-        self.status = application.status
-        self.updated_at = datetime.utcnow()
+        for key, value in self.update_values(application).items():
+            setattr(self, key, value)
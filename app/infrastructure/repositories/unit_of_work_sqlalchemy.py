@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.unit_of_work import UnitOfWork
+from app.infrastructure.circuit_breaker import database_breaker
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._depth = 0
+
+    async def __aenter__(self) -> "SQLAlchemyUnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._depth -= 1
+        await super().__aexit__(exc_type, exc, tb)
+
+    async def commit(self) -> None:
+        # nested use cases share the outer transaction
+        if self._depth > 1:
+            return
+        if not self.session.in_transaction():
+            # nothing to send: no verdict for the breaker either
+            await self.session.commit()
+            return
+        async with database_breaker.guard():
+            await self.session.commit()
+
+    async def rollback(self) -> None:
+        async with database_breaker.record_failures():
+            await self.session.rollback()
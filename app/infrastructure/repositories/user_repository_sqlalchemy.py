@@ -1,142 +1,165 @@
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import bindparam, delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.future import select
-from sqlalchemy import delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, selectinload
 from sqlalchemy.exc import IntegrityError
 from app.domain.user import User
 from app.domain.user_repository import UserRepository
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    SQLAlchemyRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_models import UserModel
 from app.infrastructure.repositories.sqlalchemy_models import RoleModel, UserRoleModel
+from app.infrastructure.repositories.role_repository_sqlalchemy import role_cache
 from app.domain.role import Role as RoleDomain
 from datetime import datetime
 from app.domain.errors import ConflictError, NotFoundError
 
+# prebuilt, parameterized hot reads (see offer_repository_sqlalchemy)
+_WITH_ROLES = selectinload(UserModel.user_roles).selectinload(UserRoleModel.role)
+_GET_BY_ID = (
+    select(UserModel)
+    .where(UserModel.id == bindparam("id"), UserModel.deleted_at.is_(None))
+    .options(_WITH_ROLES)
+)
+_GET_BY_EMAIL = (
+    select(UserModel)
+    .where(UserModel.email == bindparam("email"), UserModel.deleted_at.is_(None))
+    .options(_WITH_ROLES)
+)
+_LIST = (
+    select(UserModel)
+    .where(UserModel.deleted_at.is_(None))
+    .offset(bindparam("offset"))
+    .limit(bindparam("limit"))
+)
+_ROLES_BY_NAME = (
+    select(RoleModel)
+    .where(
+        RoleModel.name.in_(bindparam("names", expanding=True)),
+        RoleModel.deleted_at.is_(None),
+    )
+    .options(lazyload("*"))
+)
 
-class UserRepositorySQLAlchemy(UserRepository):
-    def __init__(self, session_factory=SessionLocal):
-        self.session_factory = session_factory
 
-    async def create(self, user: User) -> User:
-        async with self.session_factory() as session:
-            db_obj = UserModel.from_domain(user)
-            session.add(db_obj)
-            try:
-                # flush to persist the user and generate any DB-side defaults/ids
-                await session.flush()
-            except IntegrityError:
-                await session.rollback()
-                raise ConflictError(
-                    message="Email already exists",
-                    details=[{"field": "email", "reason": "duplicate"}],
-                )
+class UserRepositorySQLAlchemy(SQLAlchemyRepository, UserRepository):
+    async def _get_or_create_roles(self, session, roles) -> List[RoleModel]:
+        names = [r.name if hasattr(r, "name") else str(r) for r in roles]
+        result = await session.execute(_ROLES_BY_NAME, {"names": names})
+        by_name = {role_db.name: role_db for role_db in result.scalars().all()}
+        # create roles that don't exist yet in a single multi-row INSERT
+        missing = [
+            RoleModel.values_from_domain(RoleDomain(name=name))
+            for name in dict.fromkeys(names)
+            if name not in by_name
+        ]
+        if missing:
+            result = await session.execute(
+                insert(RoleModel)
+                .values(missing)
+                .returning(RoleModel)
+                .options(lazyload("*"))
+            )
+            by_name.update({role_db.name: role_db for role_db in result.scalars()})
+            role_cache.clear()
+        return [by_name[name] for name in names]
 
-            # handle roles associations if provided on domain object
-            if hasattr(user, "roles") and user.roles:
-                for r in user.roles:
-                    role_name = r.name if hasattr(r, "name") else str(r)
-                    result = await session.execute(
-                        select(RoleModel).where(
-                            RoleModel.name == role_name, RoleModel.deleted_at.is_(None)
-                        )
-                    )
-                    role_db = result.scalar_one_or_none()
-                    if not role_db:
-                        # create role if it doesn't exist
-                        role_db = RoleModel.from_domain(RoleDomain(name=role_name))
-                        session.add(role_db)
-                        await session.flush()
-                    # create association row explicitly to avoid touching
-                    # potential lazy-loaded collection on `db_obj.roles`
-                    session.add(UserRoleModel(user_id=db_obj.id, role_id=role_db.id))
+    async def _set_roles(self, session, user_id: UUID, role_dbs, replace: bool):
+        role_ids = [r.id for r in role_dbs]
+        if replace:
+            # drop associations for roles the user no longer has; the ones kept
+            # are skipped by ON CONFLICT below, so their rows are left untouched
+            await session.execute(
+                delete(UserRoleModel).where(
+                    UserRoleModel.user_id == user_id,
+                    UserRoleModel.role_id.notin_(role_ids),
+                )
+            )
+        if role_ids:
+            await session.execute(
+                pg_insert(UserRoleModel)
+                .values(
+                    [
+                        {
+                            "user_id": user_id,
+                            "role_id": role_id,
+                            "created_at": datetime.utcnow(),
+                        }
+                        for role_id in dict.fromkeys(role_ids)
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+        return [
+            RoleDomain(id=r.id, name=r.name, created_at=r.created_at) for r in role_dbs
+        ]
 
+    async def create(self, user: User) -> User:
+        async with self._session() as session:
             try:
-                await session.commit()
+                db_obj = await self._insert_returning(
+                    session, UserModel, UserModel.values_from_domain(user)
+                )
             except IntegrityError:
                 await session.rollback()
                 raise ConflictError(
                     message="Email already exists",
                     details=[{"field": "email", "reason": "duplicate"}],
                 )
-
-            await session.refresh(db_obj)
-            return db_obj.to_domain()
+            # handle roles associations if provided on domain object; the
+            # resulting roles are handed to to_domain() so it doesn't lazy load
+            roles = []
+            if hasattr(user, "roles") and user.roles:
+                role_dbs = await self._get_or_create_roles(session, user.roles)
+                roles = await self._set_roles(session, db_obj.id, role_dbs, False)
+            await self._commit(session)
+            return db_obj.to_domain(roles=roles)
 
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
-        async with self.session_factory() as session:
-            stmt = (
-                select(UserModel)
-                .where(UserModel.id == user_id, UserModel.deleted_at.is_(None))
-                .options(
-                    selectinload(UserModel.user_roles).selectinload(UserRoleModel.role)
-                )
-            )
-            result = await session.execute(stmt)
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_ID, {"id": user_id})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        async with self.session_factory() as session:
-            stmt = (
-                select(UserModel)
-                .where(UserModel.email == email, UserModel.deleted_at.is_(None))
-                .options(
-                    selectinload(UserModel.user_roles).selectinload(UserRoleModel.role)
-                )
-            )
-            result = await session.execute(stmt)
+        async with self._session() as session:
+            result = await session.execute(_GET_BY_EMAIL, {"email": email})
             db_obj = result.scalar_one_or_none()
             return db_obj.to_domain() if db_obj else None
 
     async def update(self, user: User) -> User:
-        async with self.session_factory() as session:
-            db_obj = await session.get(UserModel, user.id)
-            if not db_obj or db_obj.deleted_at:
+        async with self._session() as session:
+            try:
+                db_obj = await self._update_returning(
+                    session, UserModel, user.id, UserModel.update_values(user)
+                )
+            except IntegrityError:
+                await session.rollback()
+                raise ConflictError(
+                    message="Email already exists",
+                    details=[{"field": "email", "reason": "duplicate"}],
+                )
+            if not db_obj:
                 return None
-            db_obj.update_from_domain(user)
             # sync roles if provided
+            roles = None
             if hasattr(user, "roles"):
-                # delete existing association rows for this user and add new ones
-                await session.execute(
-                    delete(UserRoleModel).where(UserRoleModel.user_id == db_obj.id)
-                )
-                for r in user.roles:
-                    role_name = r.name if hasattr(r, "name") else str(r)
-                    result = await session.execute(
-                        select(RoleModel).where(
-                            RoleModel.name == role_name, RoleModel.deleted_at.is_(None)
-                        )
-                    )
-                    role_db = result.scalar_one_or_none()
-                    if not role_db:
-                        role_db = RoleModel.from_domain(RoleDomain(name=role_name))
-                        session.add(role_db)
-                        await session.flush()
-                    session.add(UserRoleModel(user_id=db_obj.id, role_id=role_db.id))
-
-            db_obj.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(db_obj)
-            return db_obj.to_domain()
+                role_dbs = await self._get_or_create_roles(session, user.roles or [])
+                roles = await self._set_roles(session, db_obj.id, role_dbs, True)
+            await self._commit(session)
+            return db_obj.to_domain(roles=roles)
 
     async def soft_delete(
         self, user_id: UUID, deleted_by: UUID, reason: Optional[str] = None
     ) -> None:
-        async with self.session_factory() as session:
-            db_obj = await session.get(UserModel, user_id)
-            if db_obj and not db_obj.deleted_at:
-                db_obj.deleted_at = datetime.utcnow()
-                db_obj.deleted_by = deleted_by
-                db_obj.deletion_reason = reason
-                await session.commit()
+        async with self._session() as session:
+            await self._soft_delete(session, UserModel, user_id, deleted_by, reason)
+            await self._commit(session)
 
     async def list(self, limit: int = 20, offset: int = 0) -> List[User]:
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(UserModel)
-                .where(UserModel.deleted_at.is_(None))
-                .offset(offset)
-                .limit(limit)
-            )
+        async with self._session() as session:
+            result = await session.execute(_LIST, {"limit": limit, "offset": offset})
             return [row.to_domain() for row in result.scalars().all()]
@@ -0,0 +1,268 @@
+"""
+Retention job: moves rows soft-deleted longer than N days into `*_archive`.
+
+Each batch is one statement, committed on its own:
+
+    WITH batch AS (SELECT id ... LIMIT n FOR UPDATE SKIP LOCKED),
+         moved AS (DELETE FROM t USING batch ... RETURNING t.*)
+    INSERT INTO t_archive (...) SELECT ... FROM moved
+
+so the job is resumable (a crash loses at most the in-flight batch, which is
+rolled back), safe to run concurrently (SKIP LOCKED), and throttled by a
+pause between batches.
+
+Tables are processed children first. A user's candidate profile is archived
+before the user (with the user, even if the profile itself was never
+deleted), since it would otherwise keep the user in place through its FK.
+Rows still referenced by a live FK (an offer with applications, a profile
+with applications, hence its user) are skipped rather than failing the
+batch; the number left behind is logged per table as `rows_skipped`.
+
+Credentials are not archived: `users_archive` has no `hashed_password`.
+
+Usage:
+    python -m app.infrastructure.retention --days 365 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    and_,
+    column,
+    exists,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.settings import get_settings
+from app.infrastructure.logging import JsonLogger, shutdown_logging, start_logging
+from app.infrastructure.repositories.sqlalchemy_models import (
+    ApplicationModel,
+    CandidateProfileModel,
+    OfferModel,
+    RoleModel,
+    UserModel,
+    UserRoleModel,
+)
+
+logger = JsonLogger(service="retention")
+
+# live columns left out of the archive copy
+_NOT_ARCHIVED = {"users": {"hashed_password"}}
+
+
+@dataclass
+class RetentionResult:
+    table: str
+    rows_moved: int = 0
+    rows_skipped: int = 0
+    batches: int = 0
+    duration_ms: int = 0
+
+
+def _expired(model, cutoff: datetime):
+    return and_(model.deleted_at.is_not(None), model.deleted_at < cutoff)
+
+
+def _archive_statement(model, batch_size: int, *criteria):
+    live = model.__table__
+    batch = (
+        select(live.c.id)
+        .where(*criteria)
+        .order_by(live.c.deleted_at, live.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("batch")
+    )
+    excluded = _NOT_ARCHIVED.get(live.name, set())
+    kept = [c for c in live.c if c.name not in excluded]
+    moved = live.delete().where(live.c.id == batch.c.id).returning(*kept).cte("moved")
+    names = [c.name for c in kept]
+    values = [moved.c[name] for name in names]
+    if model is UserModel:
+        # user_roles go away with the user (ON DELETE CASCADE); keep the names
+        names.append("roles")
+        values.append(
+            select(func.array_agg(RoleModel.name))
+            .join(UserRoleModel, UserRoleModel.role_id == RoleModel.id)
+            .where(UserRoleModel.user_id == moved.c.id)
+            .scalar_subquery()
+        )
+    names.append("archived_at")
+    values.append(literal_column("now()"))
+    archive = table(f"{live.name}_archive", *[column(name) for name in names])
+    return insert(archive).from_select(names, select(*values))
+
+
+def _skipped_statement(model, cutoff: datetime):
+    """Expired rows a run leaves in the live table (still referenced)."""
+    return select(func.count()).select_from(model).where(_expired(model, cutoff))
+
+
+def _plan(cutoff: datetime, batch_size: int):
+    """(model, archive statement) pairs, children before parents."""
+    profile_user_expired = exists().where(
+        UserModel.id == CandidateProfileModel.user_id, _expired(UserModel, cutoff)
+    )
+    return [
+        (
+            ApplicationModel,
+            _archive_statement(
+                ApplicationModel, batch_size, _expired(ApplicationModel, cutoff)
+            ),
+        ),
+        (
+            OfferModel,
+            _archive_statement(
+                OfferModel,
+                batch_size,
+                _expired(OfferModel, cutoff),
+                ~exists().where(ApplicationModel.offer_id == OfferModel.id),
+            ),
+        ),
+        (
+            CandidateProfileModel,
+            _archive_statement(
+                CandidateProfileModel,
+                batch_size,
+                or_(_expired(CandidateProfileModel, cutoff), profile_user_expired),
+                ~exists().where(
+                    ApplicationModel.candidate_profile_id == CandidateProfileModel.id
+                ),
+            ),
+        ),
+        (
+            UserModel,
+            _archive_statement(
+                UserModel,
+                batch_size,
+                _expired(UserModel, cutoff),
+                ~exists().where(CandidateProfileModel.user_id == UserModel.id),
+            ),
+        ),
+    ]
+
+
+async def archive_soft_deleted(
+    engine: AsyncEngine,
+    days: int,
+    batch_size: int,
+    sleep_ms: int = 0,
+    max_batches: Optional[int] = None,
+) -> list[RetentionResult]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    results = []
+    for model, stmt in _plan(cutoff, batch_size):
+        result = RetentionResult(table=model.__tablename__)
+        started = time.perf_counter()
+        while max_batches is None or result.batches < max_batches:
+            async with engine.begin() as conn:
+                moved = (await conn.execute(stmt)).rowcount
+            result.batches += 1
+            result.rows_moved += moved
+            if moved < batch_size:
+                break
+            if sleep_ms:
+                await asyncio.sleep(sleep_ms / 1000)
+        async with engine.connect() as conn:
+            result.rows_skipped = await conn.scalar(_skipped_statement(model, cutoff))
+        result.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            "retention_table_archived",
+            extra={
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "retention.table": result.table,
+                "retention.rows_moved": result.rows_moved,
+                "retention.rows_skipped": result.rows_skipped,
+                "retention.batches": result.batches,
+                "duration_ms": result.duration_ms,
+            },
+        )
+        results.append(result)
+    return results
+
+
+async def run_scheduled(engine: AsyncEngine) -> None:
+    """Runs the job every RETENTION_SCHEDULE_INTERVAL_HOURS until cancelled."""
+    settings = get_settings()
+    while True:
+        try:
+            await archive_soft_deleted(
+                engine,
+                days=settings.RETENTION_DAYS,
+                batch_size=settings.RETENTION_BATCH_SIZE,
+                sleep_ms=settings.RETENTION_SLEEP_MS,
+            )
+        except Exception as exc:
+            logger.error(
+                "retention_failed",
+                extra={
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "error.code": type(exc).__name__,
+                },
+            )
+        await asyncio.sleep(settings.RETENTION_SCHEDULE_INTERVAL_HOURS * 3600)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Move rows soft-deleted more than N days ago to *_archive."
+    )
+    parser.add_argument("--days", type=int, default=settings.RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.RETENTION_BATCH_SIZE)
+    parser.add_argument(
+        "--sleep-ms",
+        type=int,
+        default=settings.RETENTION_SLEEP_MS,
+        help="pause between batches (throttling)",
+    )
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=None,
+        help="stop each table after this many batches; rerun to resume",
+    )
+    args = parser.parse_args(argv)
+
+    from app.infrastructure.db import engine_for
+
+    # bulk work, and the bulk pool allows longer statements
+    engine = engine_for("bulk")
+
+    async def _run():
+        try:
+            results = await archive_soft_deleted(
+                engine,
+                days=args.days,
+                batch_size=args.batch_size,
+                sleep_ms=args.sleep_ms,
+                max_batches=args.max_batches,
+            )
+        finally:
+            await engine.dispose()
+        for r in results:
+            print(
+                f"{r.table}: {r.rows_moved} rows moved in {r.batches} batches, "
+                f"{r.rows_skipped} left behind ({r.duration_ms} ms)"
+            )
+
+    start_logging(settings.LOG_QUEUE_SIZE)
+    try:
+        asyncio.run(_run())
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
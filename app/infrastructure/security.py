@@ -1,25 +1,36 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from passlib.context import CryptContext
-from jose import jwt
 
 from app.config.settings import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib (bcrypt) and jose (cryptography) are imported on first use: together
+# they are a sizeable share of `import app.main` and no request needs them
+# before the first login / authenticated call
+
 settings = get_settings()
 
 
+@lru_cache(maxsize=None)
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(
     subject: str, expires_delta: Optional[timedelta] = None, extra_claims: dict = None
 ) -> str:
+    from jose import jwt
+
     to_encode = {"sub": subject}
     if extra_claims:
         to_encode.update(extra_claims)
@@ -34,6 +45,8 @@ def create_access_token(
 
 
 def decode_token(token: str) -> dict:
+    from jose import jwt
+
     return jwt.decode(
         token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
     )
@@ -0,0 +1,171 @@
+"""
+Opt-in slow query recorder (DB_SLOW_QUERY_MS > 0).
+
+Statements at or above the threshold are logged as `slow_query` with the
+normalized SQL, the parameter shape (types only, never values), the duration,
+the repository method that issued it and the request_id, and are kept in a
+ring buffer (DB_SLOW_QUERY_BUFFER_SIZE) served by GET /api/v1/admin/slow-queries.
+
+Outside production (DB_SLOW_QUERY_EXPLAIN, default: APP_ENV is not prod) the
+plan is captured too, on its own connection in a background task so the
+request is not delayed: `EXPLAIN (ANALYZE, BUFFERS)` for SELECTs and a plain
+`EXPLAIN` for writes, which ANALYZE would execute a second time. Only one
+EXPLAIN runs at a time; slow queries arriving meanwhile are stored without
+a plan.
+"""
+
+import asyncio
+import re
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event
+
+from app.config.settings import get_settings
+from app.infrastructure.db_stats import current_db_stats
+from app.infrastructure.logging import JsonLogger
+
+settings = get_settings()
+logger = JsonLogger(service="slow_queries")
+
+_WHITESPACE = re.compile(r"\s+")
+# `IN ($1, $2, ... $n)` from expanding bind params: one shape for any n
+_PLACEHOLDER_LIST = re.compile(r"(?:\$\d+|\?)(?:\s*,\s*(?:\$\d+|\?))+")
+_REPOSITORY_MODULES = "app.infrastructure.repositories."
+
+
+def normalize_sql(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("...", statement)
+
+
+def param_shape(params: Any, limit: int = 50) -> Any:
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        shape = [type(value).__name__ for value in params[:limit]]
+        if len(params) > limit:
+            shape.append(f"... {len(params)} total")
+        return shape
+    return type(params).__name__
+
+
+def _frames():
+    frame = sys._getframe(1)
+    current = getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        # async engines run the driver call in a child greenlet; the awaiting
+        # coroutines (repository methods) are on the parent's stack
+        current = current.parent
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def calling_repository_method() -> Optional[str]:
+    for frame in _frames():
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_REPOSITORY_MODULES) and "self" in frame.f_locals:
+            owner = type(frame.f_locals["self"]).__name__
+            if owner != "SQLAlchemyRepository":
+                return f"{owner}.{frame.f_code.co_name}"
+    return None
+
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms: float, capacity: int = 100, explain=False):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._explaining = False
+        self._tasks: set = set()
+
+    def instrument(self, engine) -> None:
+        """Watches `engine`; relies on the start time set by track_queries."""
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _check(conn, cursor, statement, params, context, executemany):
+            started = getattr(context, "_query_started", None)
+            if started is None or statement.startswith("EXPLAIN"):
+                return
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.record(engine, statement, params, duration_ms, executemany)
+
+    def record(self, engine, statement, params, duration_ms, executemany=False):
+        stats = current_db_stats()
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "request_id": stats.request_id if stats else None,
+            "duration_ms": round(duration_ms, 2),
+            "statement": normalize_sql(statement),
+            "params": param_shape(
+                params[0]
+                if executemany and params and isinstance(params[0], (list, tuple, dict))
+                else params
+            ),
+            "caller": calling_repository_method(),
+            "plan": None,
+        }
+        self.entries.append(entry)
+        logger.warning(
+            "slow_query",
+            {
+                "timestamp": entry["timestamp"],
+                "request_id": entry["request_id"],
+                "duration_ms": entry["duration_ms"],
+                "db.statement": entry["statement"][:1000],
+                "db.params": entry["params"],
+                "db.caller": entry["caller"],
+            },
+        )
+        if (
+            self.explain
+            and not executemany
+            and not self._explaining
+            and engine.dialect.name == "postgresql"
+        ):
+            self._explaining = True
+            task = asyncio.get_running_loop().create_task(
+                self._capture_plan(engine, entry, statement, params)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _capture_plan(self, engine, entry, statement, params) -> None:
+        # a WITH may wrap a DELETE/UPDATE (retention), so only plain SELECTs
+        is_select = statement.lstrip().upper().startswith("SELECT")
+        options = "ANALYZE, BUFFERS" if is_select else "COSTS"
+        try:
+            async with engine.connect() as conn:  # rolled back on exit
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN ({options}) {statement}", tuple(params or ())
+                )
+                entry["plan"] = "\n".join(row[0] for row in result)
+        except Exception as exc:
+            entry["plan"] = f"EXPLAIN failed: {exc.__class__.__name__}: {exc}"
+        finally:
+            self._explaining = False
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Newest first."""
+        return list(reversed(self.entries))
+
+
+recorder = SlowQueryRecorder(
+    threshold_ms=settings.DB_SLOW_QUERY_MS,
+    capacity=settings.DB_SLOW_QUERY_BUFFER_SIZE,
+    explain=(
+        settings.APP_ENV not in ("prod", "production")
+        if settings.DB_SLOW_QUERY_EXPLAIN is None
+        else settings.DB_SLOW_QUERY_EXPLAIN
+    ),
+)
@@ -0,0 +1,420 @@
+"""
+Lightweight request tracing (OTEL_ENABLED), modelled on OpenTelemetry.
+
+Span tree per request:
+- `GET /api/v1/offers/{offer_id}` (server): root span opened by
+  `TracingMiddleware`, carrying the request_id
+- `GetOfferById.execute`: one span per use case call
+- `OfferRepositorySQLAlchemy.get_by_id`: one span per repository call
+- `SELECT` (client): one span per SQL statement, from engine events
+
+Use cases and repositories are not edited: `instrument_application()` wraps
+their coroutine methods at startup, so nothing is wrapped (and nothing is
+paid) with tracing disabled. Inside a request that is not sampled the
+wrappers return after one ContextVar lookup.
+
+Propagation and sampling: an incoming W3C `traceparent` is continued (same
+trace id, its sampled flag is honoured); otherwise a trace id is created
+and sampled head-based with OTEL_SAMPLING_RATIO, from the trace id like
+OpenTelemetry's TraceIdRatioBased sampler.
+
+Exporters (OTEL_TRACES_EXPORTER), called once per finished trace:
+- `memory`: keeps recent spans in `exporter.spans` (tests, debugging)
+- `otlp_file`: appends one OTLP/JSON `resourceSpans` line per trace to
+  OTEL_EXPORTER_OTLP_FILE, readable by the collector's otlpjsonfile receiver
+  (local testing; writes happen on the event loop)
+- `none`
+"""
+
+import functools
+import inspect
+import importlib
+import pkgutil
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy import event
+
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class _Trace:
+    __slots__ = ("spans",)
+
+    def __init__(self):
+        self.spans: List["Span"] = []
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "_trace",
+    )
+
+    def __init__(self, trace, trace_id, parent_id, name, kind, attributes):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.error: Optional[str] = None
+        self._trace = trace
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.error = str(exc) or exc.__class__.__name__
+        self.attributes["exception.type"] = exc.__class__.__name__
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        self._trace.spans.append(self)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The active span of a sampled trace, if any."""
+    return _current_span.get()
+
+
+# -----------------------------
+# Exporters
+# -----------------------------
+
+
+class InMemorySpanExporter:
+    def __init__(self, maxlen: int = 10000):
+        self.spans: Deque[Span] = deque(maxlen=maxlen)
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": _otlp_value(service_name)}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app.infrastructure.tracing"},
+                        "spans": [
+                            {
+                                "traceId": span.trace_id,
+                                "spanId": span.span_id,
+                                "parentSpanId": span.parent_id or "",
+                                "name": span.name,
+                                "kind": _SPAN_KINDS[span.kind],
+                                "startTimeUnixNano": str(span.start_ns),
+                                "endTimeUnixNano": str(span.end_ns),
+                                "attributes": [
+                                    {"key": key, "value": _otlp_value(value)}
+                                    for key, value in span.attributes.items()
+                                    if value is not None
+                                ],
+                                "status": (
+                                    {"code": 2, "message": span.error}
+                                    if span.error is not None
+                                    else {"code": 1}
+                                ),
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OTLPFileSpanExporter:
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]) -> None:
+        line = orjson.dumps(to_otlp_json(spans, self.service_name))
+        with open(self.path, "ab") as fh:
+            fh.write(line + b"\n")
+
+
+class NoopSpanExporter:
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+
+# -----------------------------
+# Tracer
+# -----------------------------
+
+
+class Tracer:
+    def __init__(self, exporter, sampling_ratio: float = 1.0):
+        self.exporter = exporter
+        self.sampling_ratio = sampling_ratio
+        self._bound = int(max(0.0, min(sampling_ratio, 1.0)) * (1 << 64))
+
+    def _sampled(self, trace_id: str) -> bool:
+        # lower 64 bits of the trace id, as TraceIdRatioBased does
+        return int(trace_id[16:], 16) < self._bound
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Optional[Span]]:
+        """Root (server) span; yields None when the trace is not sampled."""
+        parent_id = None
+        match = _TRACEPARENT.match(traceparent or "")
+        if (
+            match
+            and match.group(1) != _INVALID_TRACE_ID
+            and match.group(2) != _INVALID_SPAN_ID
+        ):
+            trace_id, parent_id = match.group(1), match.group(2)
+            sampled = bool(int(match.group(3), 16) & 0x01)
+        else:
+            trace_id = f"{random.getrandbits(128):032x}"
+            sampled = self._sampled(trace_id)
+        if not sampled:
+            yield None
+            return
+
+        trace = _Trace()
+        span = Span(trace, trace_id, parent_id, name, "server", attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_error(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self.exporter.export(trace.spans)
+
+    def child(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Span]:
+        """Starts (not activates) a child of the current span, if any."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(
+            parent._trace, parent.trace_id, parent.span_id, name, kind, attributes
+        )
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Optional[Span]]:
+        span = self.child(name, kind, attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_error(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+
+def _build_exporter():
+    if settings.OTEL_TRACES_EXPORTER == "otlp_file":
+        return OTLPFileSpanExporter(settings.OTEL_EXPORTER_OTLP_FILE, settings.APP_NAME)
+    if settings.OTEL_TRACES_EXPORTER == "none":
+        return NoopSpanExporter()
+    return InMemorySpanExporter()
+
+
+exporter = _build_exporter()
+tracer = Tracer(exporter, settings.OTEL_SAMPLING_RATIO)
+
+
+# -----------------------------
+# Instrumentation
+# -----------------------------
+
+
+class TracingMiddleware:
+    """Root span per HTTP request; runs inside ObservabilityMiddleware."""
+
+    def __init__(self, app, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        method = scope["method"]
+        with self.tracer.start_trace(
+            method,
+            traceparent,
+            {
+                "http.request.method": method,
+                "url.path": scope["path"],
+                "request_id": scope.get("request_id"),
+            },
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+            scope["trace_id"] = span.trace_id
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.error = f"HTTP {message['status']}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
+
+
+def _traced(fn, span_name: str):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _current_span.get() is None:
+            return await fn(*args, **kwargs)
+        with tracer.start_span(span_name):
+            return await fn(*args, **kwargs)
+
+    wrapper.__wrapped_by_tracing__ = True
+    return wrapper
+
+
+def trace_methods(cls, names=None) -> None:
+    """Wraps the coroutine methods defined on `cls` (all public ones by default)."""
+    for name, member in list(vars(cls).items()):
+        if names is not None and name not in names:
+            continue
+        if names is None and name.startswith("_"):
+            continue
+        if not inspect.iscoroutinefunction(member) or hasattr(
+            member, "__wrapped_by_tracing__"
+        ):
+            continue
+        setattr(cls, name, _traced(member, f"{cls.__name__}.{name}"))
+
+
+def _classes_in_package(package_name: str):
+    package = importlib.import_module(package_name)
+    for module_info in pkgutil.iter_modules(package.__path__):
+        module = importlib.import_module(f"{package_name}.{module_info.name}")
+        for member in vars(module).values():
+            if inspect.isclass(member) and member.__module__ == module.__name__:
+                yield member
+
+
+def instrument_engine(engine) -> None:
+    """One client span per SQL statement run inside a sampled trace."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, params, context, executemany):
+        span = tracer.child(
+            statement.split(None, 1)[0].upper() if statement else "SQL",
+            "client",
+            {"db.system": system, "db.statement": " ".join(statement.split())[:2000]},
+        )
+        if span is not None and context is not None:
+            context._trace_span = span
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, params, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            span.record_error(exception_context.original_exception)
+            span.end()
+
+
+def instrument_application() -> None:
+    """Spans for every use case `execute` and SQLAlchemy repository method."""
+    from app.infrastructure.repositories.base_repository_sqlalchemy import (
+        SQLAlchemyRepository,
+    )
+
+    for cls in _classes_in_package("app.application"):
+        if inspect.iscoroutinefunction(vars(cls).get("execute")):
+            trace_methods(cls, names=("execute",))
+    for cls in _classes_in_package("app.infrastructure.repositories"):
+        if issubclass(cls, SQLAlchemyRepository) and cls is not SQLAlchemyRepository:
+            trace_methods(cls)
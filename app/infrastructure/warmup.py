@@ -0,0 +1,165 @@
+"""
+Startup warm-up, run by the lifespan in a background task.
+
+Without it the first requests on a new worker pay for the TCP/TLS handshake
+and authentication to Postgres, asyncpg's type introspection on every new
+connection, SQLAlchemy compiling each statement (the compiled cache is per
+engine) and an empty roles cache. `warm_up()`:
+
+1. opens WARMUP_CONNECTIONS pool connections at once, on the primary and on
+   the replica when configured, and returns them to the pool;
+2. runs the hot repository reads with ids that match nothing, one round per
+   warmed connection and concurrently, so the compiled statements are cached
+   and asyncpg prepares them on the connections they land on;
+3. loads the roles cache (reference data).
+
+`state.ready` is set when it finishes. A failure or timeout is logged and
+still marks the worker ready: the database itself is the readiness probe's
+concern, and a worker that started during a database blip must not be kept
+out of rotation forever.
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.settings import get_settings
+from app.infrastructure.logging import JsonLogger
+from app.infrastructure.read_replica import start_routing
+from app.infrastructure.repositories.application_repository_sqlalchemy import (
+    ApplicationRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.candidate_profile_repository_sqlalchemy import (
+    CandidateProfileRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.institution_repository_sqlalchemy import (
+    InstitutionRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.offer_repository_sqlalchemy import (
+    OfferRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.program_repository_sqlalchemy import (
+    ProgramRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.role_repository_sqlalchemy import (
+    RoleRepositorySQLAlchemy,
+    role_cache,
+)
+from app.infrastructure.repositories.user_repository_sqlalchemy import (
+    UserRepositorySQLAlchemy,
+)
+
+settings = get_settings()
+logger = JsonLogger(service="warmup")
+
+_NO_ID = UUID(int=0)
+
+
+class WarmupState:
+    def __init__(self):
+        self.ready = False
+        self.duration_ms: Optional[int] = None
+        self.error: Optional[str] = None
+
+
+state = WarmupState()
+
+
+async def open_connections(engine: AsyncEngine, count: int) -> int:
+    """Checks out up to `count` connections at the same time, then releases them."""
+    # connections above pool_size are overflow and would be closed on release
+    count = min(count, engine.pool.size())
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(count))
+        )
+    return count
+
+
+async def prime_hot_reads(pin_primary: bool = False) -> int:
+    """One pass over the read paths most requests go through; returns the count."""
+    # gather() runs each pass in its own task, so this routing state is local
+    start_routing(pin_primary=pin_primary)
+    offers = OfferRepositorySQLAlchemy()
+    institutions = InstitutionRepositorySQLAlchemy()
+    programs = ProgramRepositorySQLAlchemy()
+    users = UserRepositorySQLAlchemy()
+    candidates = CandidateProfileRepositorySQLAlchemy()
+    applications = ApplicationRepositorySQLAlchemy()
+    reads = [
+        lambda: offers.list(),
+        lambda: offers.get_by_id(_NO_ID),
+        lambda: institutions.list(),
+        lambda: institutions.get_by_id(_NO_ID),
+        lambda: programs.list(),
+        lambda: programs.get_by_id(_NO_ID),
+        lambda: users.get_by_id(_NO_ID),
+        lambda: users.get_by_email(""),
+        lambda: candidates.get_by_user_id(_NO_ID),
+        lambda: applications.list_by_candidate_profile(_NO_ID),
+    ]
+    for read in reads:
+        await read()
+    return len(reads)
+
+
+async def load_reference_data() -> int:
+    role_cache.clear()
+    return len(await RoleRepositorySQLAlchemy().list(limit=1000))
+
+
+async def _warm_up(primary: AsyncEngine, replica: Optional[AsyncEngine]) -> dict:
+    count = settings.WARMUP_CONNECTIONS or settings.DB_POOL_SIZE
+    primary_connections = await open_connections(primary, count)
+    replica_connections = (
+        await open_connections(replica, count) if replica is not None else 0
+    )
+    # replica passes run unpinned, so their SELECTs are routed to the replica
+    queries = sum(
+        await asyncio.gather(
+            *(prime_hot_reads(pin_primary=True) for _ in range(primary_connections)),
+            *(prime_hot_reads(pin_primary=False) for _ in range(replica_connections)),
+        )
+    )
+    roles = await load_reference_data()
+    return {
+        "warmup.connections": primary_connections + replica_connections,
+        "warmup.queries": queries,
+        "warmup.roles": roles,
+    }
+
+
+async def warm_up(primary: AsyncEngine, replica: Optional[AsyncEngine] = None):
+    started = time.perf_counter()
+    try:
+        fields = await asyncio.wait_for(
+            _warm_up(primary, replica), settings.WARMUP_TIMEOUT_S
+        )
+    except Exception as exc:
+        state.error = f"{exc.__class__.__name__}: {exc}"[:500]
+        state.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.warning(
+            "warmup_failed",
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "error.type": exc.__class__.__name__,
+                "warmup.duration_ms": state.duration_ms,
+            },
+        )
+    else:
+        state.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            "warmup_completed",
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "warmup.duration_ms": state.duration_ms,
+                **fields,
+            },
+        )
+    finally:
+        state.ready = True
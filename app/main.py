@@ -1,28 +1,130 @@
-import time
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
+from functools import lru_cache
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
 from fastapi.openapi.utils import get_openapi
 
 from app.config.settings import get_settings
-from app.infrastructure.logging import JsonLogger, mask_ip, mask_user_id
-from app.infrastructure.request_id_middleware import RequestIdMiddleware, get_request_id
+from app.infrastructure.db import engine, engine_for, pools, read_engine
+from app.infrastructure.read_replica import ReadYourWritesMiddleware
+from app.infrastructure.log_sampling import RequestLogSampler
+from app.infrastructure import metrics, tracing, warmup
+from app.infrastructure.admission import AdmissionControlMiddleware
+from app.infrastructure.circuit_breaker import StaleReadsMiddleware
+from app.infrastructure.deadlines import DeadlineMiddleware
+from app.infrastructure.health import ReadinessProbe, loop_lag_monitor
+from app.infrastructure.logging import (
+    JsonLogger,
+    log_pipeline_stats,
+    shutdown_logging,
+    start_logging,
+)
+from app.infrastructure.observability_middleware import ObservabilityMiddleware
 
 from app.presentation.exception_handlers import register_exception_handlers
 from app.presentation.offer_router import router as offer_router
 from app.presentation.institution_router import router as institution_router
 from app.presentation.program_router import router as program_router
+from app.presentation.responses import json_response
 from app.presentation.schemas import ErrorEnvelope
 from app.presentation.user_router import router as user_router
 from app.presentation.auth_router import router as auth_router
 from app.presentation.candidate_profile_router import router as candidate_profile_router
 from app.presentation.application_router import router as application_router
+from app.presentation.admin_router import router as admin_router
 
 settings = get_settings()
 
-app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_logging(settings.LOG_QUEUE_SIZE)
+    # readiness stays false until the pool and caches are warm (warmup.py)
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(warmup.warm_up(engine, read_engine))
+    else:
+        warmup.state.ready = True
+    loop_lag_task = asyncio.create_task(loop_lag_monitor.run())
+    metrics_task = None
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        metrics_task = asyncio.create_task(
+            metrics.run_flusher(
+                settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL_S
+            )
+        )
+    # optional in-process retention schedule; the CLI
+    # (`python -m app.infrastructure.retention`) is the primary entry point
+    retention_task = None
+    if settings.RETENTION_SCHEDULE_ENABLED:
+        from app.infrastructure.retention import (
+            run_scheduled as run_retention_schedule,
+        )
+
+        retention_task = asyncio.create_task(run_retention_schedule(engine_for("bulk")))
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    warmup.state.ready = False
+    loop_lag_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await loop_lag_task
+    if retention_task is not None:
+        retention_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await retention_task
+    if metrics_task is not None:
+        metrics_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await metrics_task
+    # close pooled connections instead of leaving them to be dropped
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+    for pool_engine in pools.values():
+        await pool_engine.dispose()
+    logger.info(
+        "log_pipeline_stopping",
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "log.dropped": log_pipeline_stats()["dropped"],
+        },
+    )
+    # flush queued log lines before the process exits
+    shutdown_logging()
+
+
+# /openapi.json, /docs and /redoc are registered below so the document can be
+# served from the prebuilt file
+app = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.APP_VERSION,
+    lifespan=lifespan,
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+)
 register_exception_handlers(app)
-app.add_middleware(RequestIdMiddleware)
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    primary_engine=engine,
+    replica_engine=read_engine,
+    refresh_interval_ms=settings.DB_REPLICA_LAG_CHECK_INTERVAL_MS,
+)
+if settings.OTEL_ENABLED:
+    tracing.instrument_application()
+    # runs inside ObservabilityMiddleware (added last) and sees request_id
+    app.add_middleware(tracing.TracingMiddleware)
 
 
 def custom_openapi():
@@ -49,6 +151,48 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+
+@lru_cache(maxsize=None)
+def openapi_document() -> bytes:
+    if settings.OPENAPI_PREBUILT_FILE:
+        try:
+            with open(settings.OPENAPI_PREBUILT_FILE, "rb") as fh:
+                return fh.read()
+        except OSError:
+            # fall back to generating it, e.g. a local run without the build step
+            logger.warning(
+                "openapi_prebuilt_missing",
+                {"timestamp": datetime.now(timezone.utc).isoformat()},
+            )
+    return orjson.dumps(app.openapi())
+
+
+@app.get("/openapi.json", include_in_schema=False)
+def openapi_json():
+    return Response(openapi_document(), media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+def swagger_ui():
+    return get_swagger_ui_html(
+        openapi_url="/openapi.json",
+        title=f"{settings.APP_NAME} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+def redoc():
+    return get_redoc_html(
+        openapi_url="/openapi.json", title=f"{settings.APP_NAME} - ReDoc"
+    )
+
+
 # ----------------------------------
 # Routers
 # ----------------------------------
@@ -59,6 +203,33 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/health/live")
+def health_live():
+    return {"status": "ok"}
+
+
+readiness_probe = ReadinessProbe(
+    [("primary", engine)] + ([("replica", read_engine)] if read_engine else [])
+)
+
+
+@app.get("/health/ready")
+async def health_ready():
+    ready, checks = await readiness_probe.check()
+    return json_response(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    snapshots = metrics.collect_snapshots(settings.METRICS_MULTIPROC_DIR)
+    return Response(metrics.render(snapshots), media_type=metrics.CONTENT_TYPE)
+
+
 app.include_router(
     auth_router,
     responses={
@@ -129,47 +300,31 @@ app.include_router(
     },
 )
 
-logger = JsonLogger(service="main")
-
+app.include_router(
+    admin_router,
+    responses={
+        401: {"model": ErrorEnvelope},
+        403: {"model": ErrorEnvelope},
+        500: {"model": ErrorEnvelope},
+    },
+)
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start = time.perf_counter()
-    error_code = None
-    error_type = None
-
-    try:
-        response = await call_next(request)
-        status_code = response.status_code
-        return response
-    except Exception as exc:
-        status_code = 500
-        error_code = getattr(exc, "error_code", None)
-        error_type = exc.__class__.__name__
-        raise
-    finally:
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        request_id = get_request_id(request)
-        client_ip = mask_ip(request.client.host if request.client else None)
-
-        route = request.scope.get("route")
-        path_template = getattr(route, "path", request.url.path)
-
-        user_id = None
-
-        logger.info(
-            "request_completed",
-            {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "request_id": request_id,
-                "http.method": request.method,
-                "http.path": request.url.path,
-                "http.route": path_template,
-                "http.status_code": status_code,
-                "duration_ms": duration_ms,
-                "client_ip": client_ip,
-                "user_id": mask_user_id(user_id) if user_id else None,
-                "error.code": error_code,
-                "error.type": error_type,
-            },
-        )
+logger = JsonLogger(service="main")
+request_log_sampler = RequestLogSampler(
+    rate=settings.LOG_SAMPLE_RATE,
+    slow_request_ms=settings.LOG_SLOW_REQUEST_MS,
+    route_rates=settings.LOG_SAMPLE_RATE_BY_ROUTE,
+)
+# per route class request deadlines, inside admission control
+app.add_middleware(DeadlineMiddleware)
+# per route class concurrency limits / load shedding, inside the access log
+app.add_middleware(AdmissionControlMiddleware)
+# stale public listings while the database circuit is open, before admission
+app.add_middleware(StaleReadsMiddleware)
+# outermost: request id, timing, metrics and the access log
+app.add_middleware(
+    ObservabilityMiddleware,
+    settings=settings,
+    logger=logger,
+    sampler=request_log_sampler,
+)
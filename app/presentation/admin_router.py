@@ -0,0 +1,18 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from app.infrastructure.slow_queries import recorder as slow_query_recorder
+from app.presentation.auth_decorators import require_auth, require_roles
+from app.presentation.responses import json_response
+from app.presentation.schemas import SlowQueryRead
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryRead])
+@require_auth
+@require_roles("sys_admin")
+async def list_slow_queries():
+    # recorder entries are plain dicts already in the response shape
+    return json_response(slow_query_recorder.recent())
@@ -1,7 +1,7 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.application_use_cases import (
@@ -13,6 +13,9 @@ from app.application.application_use_cases import (
 )
 from app.domain.errors import NotFoundError
 from app.infrastructure.db import get_db
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
 from app.infrastructure.repositories.application_repository_sqlalchemy import (
     ApplicationRepositorySQLAlchemy,
 )
@@ -23,6 +26,8 @@ from app.infrastructure.repositories.offer_repository_sqlalchemy import (
     OfferRepositorySQLAlchemy,
 )
 from app.presentation.auth_decorators import require_auth, require_roles
+from app.presentation.etag import parse_if_match, set_etag
+from app.presentation.responses import json_response, list_response
 from app.presentation.schemas import (
     ApplicationCreate,
     ApplicationRead,
@@ -32,16 +37,20 @@ from app.presentation.schemas import (
 router = APIRouter(prefix="/api/v1/applications", tags=["applications"])
 
 
-def get_application_repo(db: AsyncSession = Depends(get_db)):
-    return ApplicationRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
 
+def get_application_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return ApplicationRepositorySQLAlchemy(uow=uow)
 
-def get_offer_repo(db: AsyncSession = Depends(get_db)):
-    return OfferRepositorySQLAlchemy(lambda: db)
 
+def get_offer_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return OfferRepositorySQLAlchemy(uow=uow)
 
-def get_profile_repo(db: AsyncSession = Depends(get_db)):
-    return CandidateProfileRepositorySQLAlchemy(lambda: db)
+
+def get_profile_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return CandidateProfileRepositorySQLAlchemy(uow=uow)
 
 
 @router.post("/", response_model=ApplicationRead, status_code=status.HTTP_201_CREATED)
@@ -52,10 +61,14 @@ async def create_application(
     app_repo: ApplicationRepositorySQLAlchemy = Depends(get_application_repo),
     offer_repo: OfferRepositorySQLAlchemy = Depends(get_offer_repo),
     profile_repo: CandidateProfileRepositorySQLAlchemy = Depends(get_profile_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = CreateApplication(app_repo, offer_repo, profile_repo)
+    use_case = CreateApplication(app_repo, offer_repo, profile_repo, uow)
     application = await use_case.execute(app_in.candidate_profile_id, app_in.offer_id)
-    return ApplicationRead.from_domain(application)
+    return json_response(
+        ApplicationRead.from_domain(application),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.get("/{application_id}", response_model=ApplicationRead)
@@ -70,7 +83,9 @@ async def get_application(
             message="Application not found",
             details=[{"field": "id", "reason": "not found"}],
         )
-    return ApplicationRead.from_domain(application)
+    response = json_response(ApplicationRead.from_domain(application))
+    set_etag(response, application.version)
+    return response
 
 
 @router.get(
@@ -84,26 +99,26 @@ async def list_by_candidate(
 ):
     use_case = ListApplicationsByCandidate(repo)
     apps = await use_case.execute(candidate_profile_id, limit=limit, offset=offset)
-    return [ApplicationRead.from_domain(a) for a in apps]
+    return list_response(ApplicationRead, apps)
 
 
 @router.put("/{application_id}", response_model=ApplicationRead)
 async def update_application(
     application_id: UUID,
     app_in: ApplicationUpdate,
+    if_match: Optional[str] = Header(None),
     repo: ApplicationRepositorySQLAlchemy = Depends(get_application_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = UpdateApplication(repo)
-    application = await repo.get_by_id(application_id)
-    if not application:
-        raise NotFoundError(
-            message="Application not found",
-            details=[{"field": "id", "reason": "not found"}],
-        )
-    for field, value in app_in.dict(exclude_unset=True).items():
-        setattr(application, field, value)
-    updated = await use_case.execute(application)
-    return ApplicationRead.from_domain(updated)
+    use_case = UpdateApplication(repo, uow)
+    updated = await use_case.execute(
+        application_id,
+        app_in.model_dump(exclude_unset=True),
+        expected_version=parse_if_match(if_match),
+    )
+    response = json_response(ApplicationRead.from_domain(updated))
+    set_etag(response, updated.version)
+    return response
 
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -111,7 +126,8 @@ async def delete_application(
     application_id: UUID,
     deleted_by: UUID,
     repo: ApplicationRepositorySQLAlchemy = Depends(get_application_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = DeleteApplication(repo)
+    use_case = DeleteApplication(repo, uow)
     await use_case.execute(application_id, deleted_by)
     return None
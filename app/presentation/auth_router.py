@@ -3,6 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.user_use_cases import AuthenticateUser
 from app.infrastructure.db import get_db
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
 from app.infrastructure.repositories.user_repository_sqlalchemy import (
     UserRepositorySQLAlchemy,
 )
@@ -15,6 +18,7 @@ from app.infrastructure.repositories.institution_repository_sqlalchemy import (
 from app.infrastructure.repositories.candidate_profile_repository_sqlalchemy import (
     CandidateProfileRepositorySQLAlchemy,
 )
+from app.presentation.responses import json_response
 from app.presentation.schemas import (
     TokenResponse,
     UserLogin,
@@ -26,20 +30,24 @@ from app.application.registration_use_cases import RegisterUser
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
 
-def get_user_repo(db: AsyncSession = Depends(get_db)):
-    return UserRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
 
+def get_user_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return UserRepositorySQLAlchemy(uow=uow)
 
-def get_institution_repo(db: AsyncSession = Depends(get_db)):
-    return InstitutionRepositorySQLAlchemy(lambda: db)
 
+def get_institution_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return InstitutionRepositorySQLAlchemy(uow=uow)
 
-def get_candidate_repo(db: AsyncSession = Depends(get_db)):
-    return CandidateProfileRepositorySQLAlchemy(lambda: db)
 
+def get_candidate_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return CandidateProfileRepositorySQLAlchemy(uow=uow)
 
-def get_role_repo(db: AsyncSession = Depends(get_db)):
-    return RoleRepositorySQLAlchemy(lambda: db)
+
+def get_role_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return RoleRepositorySQLAlchemy(uow=uow)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -49,10 +57,12 @@ async def login(
     use_case = AuthenticateUser(repo)
     result = await use_case.execute(user_in.email, user_in.password)
     # result contains access_token, token_type, user
-    return {
-        "access_token": result["access_token"],
-        "token_type": result.get("token_type", "bearer"),
-    }
+    return json_response(
+        TokenResponse(
+            access_token=result["access_token"],
+            token_type=result.get("token_type", "bearer"),
+        )
+    )
 
 
 @router.post("/register", response_model=UserRead, status_code=201)
@@ -62,13 +72,14 @@ async def register(
     institution_repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
     candidate_repo: CandidateProfileRepositorySQLAlchemy = Depends(get_candidate_repo),
     role_repo: RoleRepositorySQLAlchemy = Depends(get_role_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = RegisterUser(user_repo, institution_repo, candidate_repo, role_repo)
+    use_case = RegisterUser(user_repo, institution_repo, candidate_repo, role_repo, uow)
     user = await use_case.execute(
         reg_in.email,
         reg_in.password,
         reg_in.roles,
         reg_in.institution_id,
-        reg_in.candidate_profile.dict() if reg_in.candidate_profile else None,
+        reg_in.candidate_profile.model_dump() if reg_in.candidate_profile else None,
     )
-    return UserRead.from_domain(user)
+    return json_response(UserRead.from_domain(user), status_code=201)
@@ -15,6 +15,9 @@ from app.application.candidate_profile_use_cases import (
     DeleteCandidateProfile,
 )
 from app.infrastructure.db import get_db
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
 from app.presentation.schemas import (
     CandidateProfileCreate,
     CandidateProfileRead,
@@ -26,12 +29,16 @@ from app.domain.errors import NotFoundError
 router = APIRouter(prefix="/api/v1/candidate-profiles", tags=["candidate-profiles"])
 
 
-def get_candidate_repo(db: AsyncSession = Depends(get_db)):
-    return CandidateProfileRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
+
+def get_candidate_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return CandidateProfileRepositorySQLAlchemy(uow=uow)
 
 
-def get_user_repo(db: AsyncSession = Depends(get_db)):
-    return UserRepositorySQLAlchemy(lambda: db)
+def get_user_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return UserRepositorySQLAlchemy(uow=uow)
 
 
 # @router.post(
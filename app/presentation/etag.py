@@ -0,0 +1,46 @@
+"""
+ETag / If-Match helpers for optimistic concurrency on versioned resources.
+
+The ETag of a resource is its `version` column, quoted (e.g. `"3"`).
+Clients send it back in `If-Match` on PUT; a stale value yields 412.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Response
+
+from app.domain.errors import PreconditionFailedError
+
+
+def format_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers["ETag"] = format_etag(version)
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Returns the expected version from an `If-Match` header.
+
+    - missing header or `*`: None (unconditional update)
+    - `"3"` / `W/"3"` / `3`: 3
+    - anything else can never match a version, so it fails the precondition
+    """
+    if if_match is None:
+        return None
+    value = if_match.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    if not value.isdigit():
+        raise PreconditionFailedError(
+            message="If-Match does not match any version of this resource.",
+            details=[{"field": "If-Match", "reason": "invalid etag"}],
+        )
+    return int(value)
@@ -14,10 +14,12 @@ from typing import Any, Optional
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
 from starlette import status
 
 from app.domain.errors import AppError
-from app.infrastructure.request_id_middleware import get_request_id
+from app.infrastructure.deadlines import current_deadline, db_timeout_reason
+from app.infrastructure.observability_middleware import get_request_id
 
 # ----------------------------
 # Error envelope helpers
@@ -31,6 +33,7 @@ def _error_response(
     message: str,
     http_status: int,
     details: Optional[list[dict[str, Any]]] = None,
+    retry_after_s: Optional[int] = None,
 ) -> JSONResponse:
     request_id = get_request_id(request)
 
@@ -48,6 +51,8 @@ def _error_response(
     # Propagate correlation id to clients (ADR-009)
     if request_id:
         response.headers["X-Request-Id"] = request_id
+    if retry_after_s is not None:
+        response.headers["Retry-After"] = str(retry_after_s)
 
     return response
 
@@ -67,6 +72,7 @@ async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
         message=exc.message,
         http_status=exc.http_status,
         details=exc.details,
+        retry_after_s=getattr(exc, "retry_after_s", None),
     )
 
 
@@ -97,6 +103,27 @@ async def validation_error_handler(
     )
 
 
+async def db_error_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+    """
+    statement_timeout / lock_timeout become 504 DEADLINE_EXCEEDED (same as the
+    request deadline); any other database error is left to the 500 handler.
+    """
+    reason = db_timeout_reason(exc)
+    if reason is None:
+        raise exc
+    deadline = current_deadline()
+    detail = {"reason": reason}
+    if deadline is not None:
+        detail["route_class"] = deadline.route_class
+    return _error_response(
+        request=request,
+        code="DEADLINE_EXCEEDED",
+        message="Request took too long and was cancelled.",
+        http_status=status.HTTP_504_GATEWAY_TIMEOUT,
+        details=[detail],
+    )
+
+
 async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """
     Handles unexpected errors. Do not leak internal details.
@@ -123,4 +150,5 @@ def register_exception_handlers(app) -> None:
     """
     app.add_exception_handler(AppError, app_error_handler)
     app.add_exception_handler(RequestValidationError, validation_error_handler)
+    app.add_exception_handler(DBAPIError, db_error_handler)
     app.add_exception_handler(Exception, unhandled_exception_handler)
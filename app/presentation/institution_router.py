@@ -1,7 +1,7 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.institution_use_cases import (
@@ -11,11 +11,16 @@ from app.application.institution_use_cases import (
     ListInstitutions,
     UpdateInstitution,
 )
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_db, use_pool
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
 from app.infrastructure.repositories.institution_repository_sqlalchemy import (
     InstitutionRepositorySQLAlchemy,
 )
 from app.presentation.auth_decorators import require_auth, require_roles
+from app.presentation.etag import parse_if_match, set_etag
+from app.presentation.responses import json_response, list_response
 from app.presentation.schemas import (
     InstitutionCreate,
     InstitutionRead,
@@ -25,8 +30,12 @@ from app.presentation.schemas import (
 router = APIRouter(prefix="/api/v1/institutions", tags=["institutions"])
 
 
-def get_institution_repo(db: AsyncSession = Depends(get_db)):
-    return InstitutionRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
+
+def get_institution_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return InstitutionRepositorySQLAlchemy(uow=uow)
 
 
 @router.post("/", response_model=InstitutionRead, status_code=status.HTTP_201_CREATED)
@@ -35,10 +44,13 @@ def get_institution_repo(db: AsyncSession = Depends(get_db)):
 async def create_institution(
     inst_in: InstitutionCreate,
     repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = CreateInstitution(repo)
-    inst = await use_case.execute(**inst_in.dict())
-    return InstitutionRead.from_domain(inst)
+    use_case = CreateInstitution(repo, uow)
+    inst = await use_case.execute(**inst_in.model_dump())
+    return json_response(
+        InstitutionRead.from_domain(inst), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("/", response_model=List[InstitutionRead])
@@ -50,7 +62,7 @@ async def list_institutions(
 ):
     use_case = ListInstitutions(repo)
     items = await use_case.execute(name=name, limit=limit, offset=offset)
-    return [InstitutionRead.from_domain(i) for i in items]
+    return list_response(InstitutionRead, items)
 
 
 @router.get("/{institution_id}", response_model=InstitutionRead)
@@ -67,7 +79,9 @@ async def get_institution_by_id(
             message="Institution not found",
             details=[{"field": "id", "reason": "not found"}],
         )
-    return InstitutionRead.from_domain(inst)
+    response = json_response(InstitutionRead.from_domain(inst))
+    set_etag(response, inst.version)
+    return response
 
 
 @router.put("/{institution_id}", response_model=InstitutionRead)
@@ -76,24 +90,26 @@ async def get_institution_by_id(
 async def update_institution(
     institution_id: UUID,
     inst_in: InstitutionUpdate,
+    if_match: Optional[str] = Header(None),
     repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = UpdateInstitution(repo)
-    inst = await repo.get_by_id(institution_id)
-    if not inst:
-        from app.domain.errors import NotFoundError
-
-        raise NotFoundError(
-            message="Institution not found",
-            details=[{"field": "id", "reason": "not found"}],
-        )
-    for field, value in inst_in.dict(exclude_unset=True).items():
-        setattr(inst, field, value)
-    updated = await use_case.execute(inst)
-    return InstitutionRead.from_domain(updated)
-
-
-@router.delete("/{institution_id}", status_code=status.HTTP_204_NO_CONTENT)
+    use_case = UpdateInstitution(repo, uow)
+    updated = await use_case.execute(
+        institution_id,
+        inst_in.model_dump(exclude_unset=True),
+        expected_version=parse_if_match(if_match),
+    )
+    response = json_response(InstitutionRead.from_domain(updated))
+    set_etag(response, updated.version)
+    return response
+
+
+@router.delete(
+    "/{institution_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(use_pool("bulk"))],
+)
 @require_auth
 @require_roles("sys_admin")
 async def delete_institution(
@@ -101,7 +117,8 @@ async def delete_institution(
     deleted_by: UUID,
     reason: Optional[str] = None,
     repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = DeleteInstitution(repo)
+    use_case = DeleteInstitution(repo, uow)
     await use_case.execute(institution_id, deleted_by, reason)
     return None
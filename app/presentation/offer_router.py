@@ -1,7 +1,7 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status, Request
+from fastapi import APIRouter, Depends, Header, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.offer_use_cases import (
@@ -12,7 +12,10 @@ from app.application.offer_use_cases import (
     UpdateOffer,
 )
 from app.domain.offer import OfferStatus, OfferType
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_db, use_pool
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
 from app.infrastructure.repositories.institution_repository_sqlalchemy import (
     InstitutionRepositorySQLAlchemy,
 )
@@ -29,6 +32,8 @@ from app.infrastructure.repositories.program_repository_sqlalchemy import (
     ProgramRepositorySQLAlchemy,
 )
 from app.presentation.auth_decorators import require_auth, require_roles
+from app.presentation.etag import parse_if_match, set_etag
+from app.presentation.responses import json_response, list_response
 from app.presentation.schemas import (
     ApplicationRead,
     OfferCreate,
@@ -39,24 +44,28 @@ from app.presentation.schemas import (
 router = APIRouter(prefix="/api/v1/offers", tags=["offers"])
 
 
-def get_offer_repo(db: AsyncSession = Depends(get_db)):
-    return OfferRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
 
+def get_offer_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return OfferRepositorySQLAlchemy(uow=uow)
 
-def get_institution_repo(db: AsyncSession = Depends(get_db)):
-    return InstitutionRepositorySQLAlchemy(lambda: db)
 
+def get_institution_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return InstitutionRepositorySQLAlchemy(uow=uow)
 
-def get_program_repo(db: AsyncSession = Depends(get_db)):
-    return ProgramRepositorySQLAlchemy(lambda: db)
 
+def get_program_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return ProgramRepositorySQLAlchemy(uow=uow)
 
-def get_application_repo(db: AsyncSession = Depends(get_db)):
-    return ApplicationRepositorySQLAlchemy(lambda: db)
 
+def get_application_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return ApplicationRepositorySQLAlchemy(uow=uow)
 
-def get_user_repo(db: AsyncSession = Depends(get_db)):
-    return UserRepositorySQLAlchemy(lambda: db)
+
+def get_user_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return UserRepositorySQLAlchemy(uow=uow)
 
 
 @router.post("/", response_model=OfferRead, status_code=status.HTTP_201_CREATED)
@@ -67,10 +76,13 @@ async def create_offer(
     repo: OfferRepositorySQLAlchemy = Depends(get_offer_repo),
     inst_repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
     prog_repo: ProgramRepositorySQLAlchemy = Depends(get_program_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = CreateOffer(repo, inst_repo, prog_repo)
-    offer = await use_case.execute(**offer_in.dict())
-    return OfferRead.from_domain(offer)
+    use_case = CreateOffer(repo, inst_repo, prog_repo, uow)
+    offer = await use_case.execute(**offer_in.model_dump())
+    return json_response(
+        OfferRead.from_domain(offer), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("/", response_model=List[OfferRead])
@@ -90,7 +102,7 @@ async def list_offers(
         limit=limit,
         offset=offset,
     )
-    return [OfferRead.from_domain(o) for o in offers]
+    return list_response(OfferRead, offers)
 
 
 @router.get("/{offer_id}", response_model=OfferRead)
@@ -106,10 +118,16 @@ async def get_offer_by_id(
         raise NotFoundError(
             message="Offer not found", details=[{"field": "id", "reason": "not found"}]
         )
-    return OfferRead.from_domain(offer)
+    response = json_response(OfferRead.from_domain(offer))
+    set_etag(response, offer.version)
+    return response
 
 
-@router.get("/{offer_id}/applications", response_model=List[ApplicationRead])
+@router.get(
+    "/{offer_id}/applications",
+    response_model=List[ApplicationRead],
+    dependencies=[Depends(use_pool("bulk"))],
+)
 @require_auth
 @require_roles("institution_admin", "sys_admin")
 async def list_applications_for_offer(
@@ -132,9 +150,7 @@ async def list_applications_for_offer(
     apps = await use_case.execute(
         offer_id, requester_id, requester_roles, limit=limit, offset=offset
     )
-    from app.presentation.schemas import ApplicationRead
-
-    return [ApplicationRead.from_domain(a) for a in apps]
+    return list_response(ApplicationRead, apps)
 
 
 @router.put("/{offer_id}", response_model=OfferRead)
@@ -143,23 +159,26 @@ async def list_applications_for_offer(
 async def update_offer(
     offer_id: UUID,
     offer_in: OfferUpdate,
+    if_match: Optional[str] = Header(None),
     repo: OfferRepositorySQLAlchemy = Depends(get_offer_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = UpdateOffer(repo)
-    offer = await repo.get_by_id(offer_id)
-    if not offer:
-        from app.domain.errors import NotFoundError
-
-        raise NotFoundError(
-            message="Offer not found", details=[{"field": "id", "reason": "not found"}]
-        )
-    for field, value in offer_in.dict(exclude_unset=True).items():
-        setattr(offer, field, value)
-    updated = await use_case.execute(offer)
-    return OfferRead.from_domain(updated)
+    use_case = UpdateOffer(repo, uow)
+    updated = await use_case.execute(
+        offer_id,
+        offer_in.model_dump(exclude_unset=True),
+        expected_version=parse_if_match(if_match),
+    )
+    response = json_response(OfferRead.from_domain(updated))
+    set_etag(response, updated.version)
+    return response
 
 
-@router.delete("/{offer_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{offer_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(use_pool("bulk"))],
+)
 @require_auth
 @require_roles("institution_admin", "sys_admin")
 async def delete_offer(
@@ -167,7 +186,8 @@ async def delete_offer(
     deleted_by: UUID,
     reason: Optional[str] = None,
     repo: OfferRepositorySQLAlchemy = Depends(get_offer_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = DeleteOffer(repo)
+    use_case = DeleteOffer(repo, uow)
     await use_case.execute(offer_id, deleted_by, reason)
     return None
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Header, Query, status
 from typing import List, Optional
 from uuid import UUID
 from app.infrastructure.repositories.program_repository_sqlalchemy import (
@@ -14,7 +14,12 @@ from app.application.program_use_cases import (
     UpdateProgram,
     DeleteProgram,
 )
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_db, use_pool
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
+from app.presentation.etag import parse_if_match, set_etag
+from app.presentation.responses import json_response, list_response
 from app.presentation.schemas import ProgramCreate, ProgramRead, ProgramUpdate
 from app.domain.program import Program
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,12 +27,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 router = APIRouter(prefix="/api/v1/programs", tags=["programs"])
 
 
-def get_program_repo(db: AsyncSession = Depends(get_db)):
-    return ProgramRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
+
+def get_program_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return ProgramRepositorySQLAlchemy(uow=uow)
 
 
-def get_institution_repo(db: AsyncSession = Depends(get_db)):
-    return InstitutionRepositorySQLAlchemy(lambda: db)
+def get_institution_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return InstitutionRepositorySQLAlchemy(uow=uow)
 
 
 @router.post("/", response_model=ProgramRead, status_code=status.HTTP_201_CREATED)
@@ -35,10 +44,13 @@ async def create_program(
     payload: ProgramCreate,
     repo: ProgramRepositorySQLAlchemy = Depends(get_program_repo),
     inst_repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = CreateProgram(repo, inst_repo)
-    program = await use_case.execute(**payload.dict())
-    return ProgramRead.from_domain(program)
+    use_case = CreateProgram(repo, inst_repo, uow)
+    program = await use_case.execute(**payload.model_dump())
+    return json_response(
+        ProgramRead.from_domain(program), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("/", response_model=List[ProgramRead])
@@ -52,7 +64,7 @@ async def list_programs(
     items = await use_case.execute(
         institution_id=institution_id, limit=limit, offset=offset
     )
-    return [ProgramRead.from_domain(i) for i in items]
+    return list_response(ProgramRead, items)
 
 
 @router.get("/{program_id}", response_model=ProgramRead)
@@ -69,37 +81,42 @@ async def get_program_by_id(
             message="Program not found",
             details=[{"field": "id", "reason": "not found"}],
         )
-    return ProgramRead.from_domain(item)
+    response = json_response(ProgramRead.from_domain(item))
+    set_etag(response, item.version)
+    return response
 
 
 @router.put("/{program_id}", response_model=ProgramRead)
 async def update_program(
     program_id: UUID,
     payload: ProgramUpdate,
+    if_match: Optional[str] = Header(None),
     repo: ProgramRepositorySQLAlchemy = Depends(get_program_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = UpdateProgram(repo)
-    program = await repo.get_by_id(program_id)
-    if not program:
-        from app.domain.errors import NotFoundError
-
-        raise NotFoundError(
-            message="Program not found",
-            details=[{"field": "id", "reason": "not found"}],
-        )
-    for field, value in payload.dict(exclude_unset=True).items():
-        setattr(program, field, value)
-    updated = await use_case.execute(program)
-    return ProgramRead.from_domain(updated)
+    use_case = UpdateProgram(repo, uow)
+    updated = await use_case.execute(
+        program_id,
+        payload.model_dump(exclude_unset=True),
+        expected_version=parse_if_match(if_match),
+    )
+    response = json_response(ProgramRead.from_domain(updated))
+    set_etag(response, updated.version)
+    return response
 
 
-@router.delete("/{program_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{program_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(use_pool("bulk"))],
+)
 async def delete_program(
     program_id: UUID,
     deleted_by: UUID,
     reason: Optional[str] = None,
     repo: ProgramRepositorySQLAlchemy = Depends(get_program_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
 ):
-    use_case = DeleteProgram(repo)
+    use_case = DeleteProgram(repo, uow)
     await use_case.execute(program_id, deleted_by, reason)
     return None
@@ -0,0 +1,75 @@
+"""
+orjson-backed responses for the routers.
+
+Endpoints return a ready `ORJSONResponse` instead of a model. FastAPI then
+skips its own pass over the result (re-validating it against
+`response_model` and encoding it again); `response_model` stays on the route
+only to document the schema in OpenAPI.
+
+- `json_response(model)`: encodes an already-validated schema instance (or
+  dicts / SQLAlchemy rows) with orjson; UUIDs, datetimes and enums are
+  encoded natively.
+- `list_response(Schema, items)`: validates and dumps a whole list of domain
+  entities (or rows) with a single `TypeAdapter(list[Schema])`, reading them
+  by attribute, instead of one `Schema.from_domain` per item.
+
+Datetimes use `Z` for UTC, the same wire format pydantic produced before.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.infrastructure.metrics import registry as metrics_registry
+
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if hasattr(obj, "_asdict"):  # SQLAlchemy Row / namedtuple
+        return obj._asdict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+metrics_registry.register_lru_cache("response_list_adapter", _list_adapter)
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def list_response(
+    schema: type[BaseModel],
+    items: Iterable[Any],
+    status_code: int = 200,
+) -> ORJSONResponse:
+    adapter = _list_adapter(schema)
+    models = adapter.validate_python(list(items), from_attributes=True)
+    # one dump_python call for the whole list (UUIDs/datetimes stay native
+    # for orjson) instead of a model_dump() per item
+    return ORJSONResponse(adapter.dump_python(models), status_code=status_code)
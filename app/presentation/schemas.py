@@ -4,11 +4,26 @@ from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field, constr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, constr, field_validator
 
 from app.domain.offer import Offer, OfferStatus, OfferType
 from app.domain.role import Role as RoleDomain
 
+
+def _not_null(*fields: str):
+    """
+    PATCH fields that may be left out but not sent as null: the columns are
+    NOT NULL, and a null would otherwise only fail in the database.
+    """
+
+    def check(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+    return field_validator(*fields, mode="before")(check)
+
+
 # -----------------------------
 # Offers
 # -----------------------------
@@ -33,6 +48,10 @@ class OfferUpdate(BaseModel):
     application_deadline: Optional[date] = None
     program_id: Optional[UUID] = None
 
+    not_null = _not_null(
+        "title", "type", "status", "publication_date", "application_deadline"
+    )
+
 
 class OfferRead(BaseModel):
     id: UUID
@@ -49,10 +68,11 @@ class OfferRead(BaseModel):
     deleted_at: Optional[datetime]
     deleted_by: Optional[UUID]
     deletion_reason: Optional[str]
+    version: int = 1
 
     @classmethod
     def from_domain(cls, offer: Offer):
-        return cls(**offer.__dict__)
+        return cls.model_validate(offer, from_attributes=True)
 
 
 # -----------------------------
@@ -91,9 +111,13 @@ class UserRead(BaseModel):
 
     @classmethod
     def from_domain(cls, user):
-        data = user.__dict__.copy()
-        # LGPD/Security: never expose hashed_password
-        data.pop("hashed_password", None)
+        # LGPD/Security: only declared fields are read, so hashed_password
+        # is never exposed
+        data = {
+            name: getattr(user, name, None)
+            for name in cls.model_fields
+            if name != "roles"
+        }
 
         roles: List[Dict[str, Any]] = []
         if getattr(user, "roles", None):
@@ -168,8 +192,8 @@ class ErrorBody(BaseModel):
 class ErrorEnvelope(BaseModel):
     error: ErrorBody
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "error": {
                     "code": "VALIDATION_ERROR",
@@ -184,6 +208,7 @@ class ErrorEnvelope(BaseModel):
                 }
             }
         }
+    )
 
 
 # -----------------------------
@@ -200,6 +225,8 @@ class InstitutionUpdate(BaseModel):
     name: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
 
+    not_null = _not_null("name")
+
 
 class InstitutionRead(BaseModel):
     id: UUID
@@ -210,10 +237,11 @@ class InstitutionRead(BaseModel):
     deleted_at: Optional[datetime]
     deleted_by: Optional[UUID]
     deletion_reason: Optional[str]
+    version: int = 1
 
     @classmethod
     def from_domain(cls, institution):
-        return cls(**institution.__dict__)
+        return cls.model_validate(institution, from_attributes=True)
 
 
 class ProgramCreate(BaseModel):
@@ -226,6 +254,8 @@ class ProgramUpdate(BaseModel):
     name: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
 
+    not_null = _not_null("name")
+
 
 class ProgramRead(BaseModel):
     id: UUID
@@ -237,10 +267,11 @@ class ProgramRead(BaseModel):
     deleted_at: Optional[datetime]
     deleted_by: Optional[UUID]
     deletion_reason: Optional[str]
+    version: int = 1
 
     @classmethod
     def from_domain(cls, program):
-        return cls(**program.__dict__)
+        return cls.model_validate(program, from_attributes=True)
 
 
 # -----------------------------
@@ -282,6 +313,8 @@ class CandidateProfileUpdate(BaseModel):
     date_of_birth: Optional[date] = None
     cpf: Optional[str] = Field(default=None, max_length=14)
 
+    not_null = _not_null("full_name")
+
 
 class CandidateProfileRead(BaseModel):
     id: UUID
@@ -294,10 +327,11 @@ class CandidateProfileRead(BaseModel):
     deleted_at: Optional[datetime]
     deleted_by: Optional[UUID]
     deletion_reason: Optional[str]
+    version: int = 1
 
     @classmethod
     def from_domain(cls, profile):
-        return cls(**profile.__dict__)
+        return cls.model_validate(profile, from_attributes=True)
 
 
 # -----------------------------
@@ -313,6 +347,8 @@ class ApplicationCreate(BaseModel):
 class ApplicationUpdate(BaseModel):
     status: Optional[str] = None
 
+    not_null = _not_null("status")
+
 
 class ApplicationRead(BaseModel):
     id: UUID
@@ -324,11 +360,27 @@ class ApplicationRead(BaseModel):
     deleted_at: Optional[datetime]
     deleted_by: Optional[UUID]
     deletion_reason: Optional[str]
+    version: int = 1
 
     @classmethod
     def from_domain(cls, app):
-        return cls(**app.__dict__)
+        return cls.model_validate(app, from_attributes=True)
+
+
+# -----------------------------
+# Admin
+# -----------------------------
+
+
+class SlowQueryRead(BaseModel):
+    timestamp: datetime
+    request_id: Optional[str]
+    duration_ms: float
+    statement: str
+    params: Any
+    caller: Optional[str]
+    plan: Optional[str]
 
 
 # resolve forward refs
-UserUpdate.update_forward_refs()
+UserUpdate.model_rebuild()
@@ -11,7 +11,10 @@ from app.application.user_use_cases import (
     UpdateUser,
 )
 from app.domain.errors import ForbiddenError, NotFoundError
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_db, use_pool
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
 from app.infrastructure.repositories.application_repository_sqlalchemy import (
     ApplicationRepositorySQLAlchemy,
 )
@@ -25,25 +28,30 @@ from app.infrastructure.repositories.user_repository_sqlalchemy import (
     UserRepositorySQLAlchemy,
 )
 from app.presentation.auth_decorators import require_auth, require_roles
+from app.presentation.responses import json_response, list_response
 from app.presentation.schemas import ApplicationRead, UserCreate, UserRead, UserUpdate
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
 
-def get_user_repo(db: AsyncSession = Depends(get_db)):
-    return UserRepositorySQLAlchemy(lambda: db)
+def get_uow(db: AsyncSession = Depends(get_db)):
+    return SQLAlchemyUnitOfWork(db)
+
 
+def get_user_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return UserRepositorySQLAlchemy(uow=uow)
 
-def get_institution_repo(db: AsyncSession = Depends(get_db)):
-    return InstitutionRepositorySQLAlchemy(lambda: db)
 
+def get_institution_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return InstitutionRepositorySQLAlchemy(uow=uow)
 
-def get_application_repo(db: AsyncSession = Depends(get_db)):
-    return ApplicationRepositorySQLAlchemy(lambda: db)
 
+def get_application_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return ApplicationRepositorySQLAlchemy(uow=uow)
 
-def get_profile_repo(db: AsyncSession = Depends(get_db)):
-    return CandidateProfileRepositorySQLAlchemy(lambda: db)
+
+def get_profile_repo(uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    return CandidateProfileRepositorySQLAlchemy(uow=uow)
 
 
 # @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
@@ -86,15 +94,16 @@ async def update_user(
     repo: UserRepositorySQLAlchemy = Depends(get_user_repo),
     inst_repo: InstitutionRepositorySQLAlchemy = Depends(get_institution_repo),
     profile_repo: CandidateProfileRepositorySQLAlchemy = Depends(get_profile_repo),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
     request: Request = None,
 ):
-    use_case = UpdateUser(repo, inst_repo, profile_repo)
+    use_case = UpdateUser(repo, inst_repo, uow, profile_repo)
 
     requester = getattr(request.state, "user", None)
     if not requester:
         raise ForbiddenError(message="Not authenticated")
 
-    updates = user_in.dict(exclude_unset=True)
+    updates = user_in.model_dump(exclude_unset=True)
 
     updated = await use_case.execute(
         user_id=user_id,
@@ -103,7 +112,7 @@ async def update_user(
         requester_roles=getattr(requester, "roles", []),
     )
 
-    return UserRead.from_domain(updated)
+    return json_response(UserRead.from_domain(updated))
 
 
 # @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -117,7 +126,11 @@ async def update_user(
 #     return None
 
 
-@router.get("/{user_id}/applications", response_model=List[ApplicationRead])
+@router.get(
+    "/{user_id}/applications",
+    response_model=List[ApplicationRead],
+    dependencies=[Depends(use_pool("bulk"))],
+)
 @require_auth
 @require_roles("candidate", "sys_admin")
 async def list_user_applications(
@@ -153,4 +166,4 @@ async def list_user_applications(
 
     use_case = ListApplicationsByCandidate(app_repo)
     apps = await use_case.execute(profile.id, limit=limit, offset=offset)
-    return [ApplicationRead.from_domain(a) for a in apps]
+    return list_response(ApplicationRead, apps)
@@ -0,0 +1,46 @@
+"""
+Admission limits follow the pool sizes; queue timeouts shed (user-047).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure.admission import ConcurrencyLimiter, Overloaded, pool_limits
+
+SHARES = {"auth": 0.2, "writes": 0.3, "reads": 0.4, "exports": 0.1}
+
+
+def pool_settings(pool_size, max_overflow, pools):
+    return SimpleNamespace(
+        DB_POOL_SIZE=pool_size,
+        DB_MAX_OVERFLOW=max_overflow,
+        DB_POOLS=pools,
+        ADMISSION_POOL_SHARES=SHARES,
+    )
+
+
+def test_limits_are_shares_of_the_main_pool_and_exports_get_bulk():
+    settings = pool_settings(20, 10, {"bulk": {"pool_size": 3, "max_overflow": 2}})
+    assert pool_limits(settings) == {"auth": 6, "writes": 9, "reads": 12, "exports": 5}
+
+
+def test_without_bulk_pool_exports_share_the_main_pool():
+    assert pool_limits(pool_settings(5, 0, {}))["exports"] == 1
+
+
+def test_limits_grow_with_the_pool():
+    small = pool_limits(pool_settings(5, 0, {}))
+    large = pool_limits(pool_settings(50, 0, {}))
+    assert all(large[name] > small[name] for name in ("auth", "writes", "reads"))
+
+
+async def test_queue_timeout_sheds_and_keeps_the_cause():
+    limiter = ConcurrencyLimiter("writes", 1)
+    await limiter.acquire(critical=False, max_wait_ms=10)
+    with pytest.raises(Overloaded) as info:
+        await limiter.acquire(critical=False, max_wait_ms=10)
+    assert info.value.reason == "queue_timeout"
+    assert isinstance(info.value.__cause__, asyncio.TimeoutError)
+    assert limiter.queued == 0 and limiter.shed["queue_timeout"] == 1
@@ -0,0 +1,140 @@
+"""
+Database circuit breaker: what counts as an outage, and the unit of work's
+commit / rollback going through it (user-050).
+"""
+
+import pytest
+from sqlalchemy import exc as sa_exc
+
+from app.domain.errors import ServiceUnavailableError
+from app.infrastructure.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    is_connection_failure,
+)
+from app.infrastructure.repositories import unit_of_work_sqlalchemy
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
+
+
+class DriverError(Exception):
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def dbapi_error(sqlstate) -> sa_exc.DBAPIError:
+    return sa_exc.OperationalError("SELECT 1", {}, DriverError(sqlstate))
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ConnectionRefusedError("refused"),
+        TimeoutError("connect timed out"),
+        dbapi_error("08006"),
+        dbapi_error("57P01"),
+        dbapi_error("57P03"),
+    ],
+)
+def test_outages(error):
+    assert is_connection_failure(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        sa_exc.TimeoutError("QueuePool limit of size 5 overflow 10 reached"),
+        dbapi_error("57014"),
+        dbapi_error("55P03"),
+        dbapi_error("23505"),
+        ValueError("not a database error"),
+    ],
+)
+def test_not_outages(error):
+    assert not is_connection_failure(error)
+
+
+class FakeSession:
+    def __init__(self, error=None):
+        self.error = error
+        self.commits = 0
+        self.rollbacks = 0
+
+    def in_transaction(self):
+        return True
+
+    async def commit(self):
+        self.commits += 1
+        if self.error:
+            raise self.error
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker("database", failure_threshold=2, reset_timeout_s=60)
+    monkeypatch.setattr(unit_of_work_sqlalchemy, "database_breaker", breaker)
+    return breaker
+
+
+async def test_failed_commits_open_the_circuit(breaker):
+    uow = SQLAlchemyUnitOfWork(FakeSession(ConnectionRefusedError("refused")))
+    for _ in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            async with uow:
+                await uow.commit()
+    assert breaker.state == OPEN
+
+
+async def test_open_circuit_rejects_commit_but_not_rollback(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    session = FakeSession()
+    uow = SQLAlchemyUnitOfWork(session)
+    with pytest.raises(ServiceUnavailableError):
+        async with uow:
+            await uow.commit()
+    # the commit never reached the session; the rollback on the way out did
+    assert session.commits == 0
+    assert session.rollbacks == 1
+
+
+async def guarded_call(breaker, error=None):
+    try:
+        async with breaker.guard():
+            if error is not None:
+                raise error
+    except Exception:
+        pass
+
+
+POOL_TIMEOUT = sa_exc.TimeoutError("QueuePool limit of size 5 overflow 10 reached")
+
+
+@pytest.mark.parametrize("inconclusive", [POOL_TIMEOUT, dbapi_error("57014")])
+async def test_timeouts_keep_the_failure_count(inconclusive):
+    breaker = CircuitBreaker("database", failure_threshold=3, reset_timeout_s=60)
+    await guarded_call(breaker, ConnectionRefusedError("refused"))
+    await guarded_call(breaker, ConnectionRefusedError("refused"))
+    await guarded_call(breaker, inconclusive)
+    assert breaker.failures == 2 and breaker.state == CLOSED
+    await guarded_call(breaker, ConnectionRefusedError("refused"))
+    assert breaker.state == OPEN
+
+
+async def test_pool_timeout_on_the_half_open_probe_gives_no_verdict():
+    breaker = CircuitBreaker("database", failure_threshold=1, reset_timeout_s=0)
+    await guarded_call(breaker, ConnectionRefusedError("refused"))
+    assert breaker.state == OPEN
+
+    await guarded_call(breaker, POOL_TIMEOUT)
+    assert breaker.state == HALF_OPEN
+    # the next call is the probe again, and it decides
+    await guarded_call(breaker)
+    assert breaker.state == CLOSED
@@ -0,0 +1,66 @@
+"""
+Named pools (user-049): RoutingSession's choice of engine, and the route
+dependency leaving the pool name as it found it.
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure import db
+from app.infrastructure.read_replica import start_routing
+
+
+@pytest.fixture
+async def engines(monkeypatch):
+    bulk = create_async_engine("sqlite+aiosqlite://")
+    replica = create_async_engine("sqlite+aiosqlite://")
+    monkeypatch.setattr(db, "pools", {"bulk": bulk})
+    monkeypatch.setattr(db, "read_engine", replica)
+    yield bulk, replica
+    await bulk.dispose()
+    await replica.dispose()
+
+
+def test_named_pool_then_primary_after_a_flush_then_replica(engines):
+    bulk, replica = engines
+    query = select(func.count())
+    start_routing(pin_primary=False)
+    session = db.RoutingSession()
+
+    # inside the pool, reads and flushes alike
+    with db.using_pool("bulk"):
+        assert session.get_bind(clause=query) is bulk.sync_engine
+        session._flushing = True
+        assert session.get_bind() is bulk.sync_engine
+    # a flush outside it goes to the primary, and so do the reads after it
+    assert session.get_bind() is db.engine.sync_engine
+    session._flushing = False
+    assert session.get_bind(clause=query) is db.engine.sync_engine
+
+    # a session in a request that has not written reads from the replica
+    start_routing(pin_primary=False)
+    assert db.RoutingSession().get_bind(clause=query) is replica.sync_engine
+
+
+def test_unknown_pool_falls_back_to_default_routing(engines):
+    _, replica = engines
+    start_routing(pin_primary=False)
+    with db.using_pool("reports"):
+        assert (
+            db.RoutingSession().get_bind(clause=select(func.count()))
+            is replica.sync_engine
+        )
+
+
+async def test_use_pool_is_reset_after_the_request(asgi_request):
+    app = FastAPI()
+
+    @app.get("/export", dependencies=[Depends(db.use_pool("bulk"))])
+    async def export():
+        return {"pool": db._pool_name.get()}
+
+    response = await asgi_request(app, "GET", "/export")
+    assert response["body"] == b'{"pool":"bulk"}'
+    assert db._pool_name.get() is None
@@ -0,0 +1,83 @@
+"""
+Database timeouts under a request deadline (user-048): the pooled
+connection's own statement_timeout covers most transactions, SET LOCAL only
+when the request has less time left than that.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.infrastructure import deadlines
+from app.infrastructure.deadlines import Deadline
+
+
+class FakeConnection:
+    def __init__(self, statement_timeout_ms):
+        self.info = {"statement_timeout_ms": statement_timeout_ms}
+        self.executed = []
+
+    class dialect:
+        name = "postgresql"
+
+    def execute(self, statement, params):
+        self.executed.append(params)
+
+
+@pytest.fixture
+def deadline():
+    tokens = []
+
+    def start(timeout_ms: int):
+        tokens.append(deadlines._deadline.set(Deadline("reads", timeout_ms)))
+
+    yield start
+    for token in reversed(tokens):
+        deadlines._deadline.reset(token)
+
+
+def test_no_round_trip_while_the_connection_default_is_shorter(deadline):
+    deadline(5000)
+    connection = FakeConnection(statement_timeout_ms=3000)
+    deadlines._apply_db_timeouts(None, None, connection)
+    assert connection.executed == []
+
+
+def test_set_local_when_less_time_is_left_than_the_default(deadline):
+    deadline(1000)
+    connection = FakeConnection(statement_timeout_ms=3000)
+    deadlines._apply_db_timeouts(None, None, connection)
+    [params] = connection.executed
+    assert 0 < int(params["statement_timeout"]) <= 1000
+
+
+def test_connection_without_default_always_gets_the_deadline(deadline):
+    deadline(60_000)
+    connection = FakeConnection(statement_timeout_ms=0)
+    deadlines._apply_db_timeouts(None, None, connection)
+    assert len(connection.executed) == 1
+
+
+def test_outside_requests_nothing_is_sent():
+    connection = FakeConnection(statement_timeout_ms=3000)
+    deadlines._apply_db_timeouts(None, None, connection)
+    assert connection.executed == []
+
+
+def test_connections_remember_their_statement_timeout():
+    engine = create_engine("sqlite://")
+
+    class AsyncEngineLike:
+        sync_engine = engine
+
+    deadlines.instrument_engine(AsyncEngineLike, statement_timeout_ms=2500)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert connection.info["statement_timeout_ms"] == 2500
+    engine.dispose()
+
+
+def test_server_settings_are_strings():
+    assert deadlines.server_settings(3000, 2000) == {
+        "statement_timeout": "3000",
+        "lock_timeout": "2000",
+    }
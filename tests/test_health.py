@@ -0,0 +1,46 @@
+"""
+Readiness pool check reads the engine's own pool (user-046).
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.health import pool_saturation
+from app.infrastructure.pool_metrics import InstrumentedAsyncQueuePool, instrument_pool
+
+
+@pytest.fixture
+async def pooled_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'health.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=2,
+        max_overflow=1,
+    )
+    # the metrics name need not match anything the probe is told
+    instrument_pool(engine.pool, "health-test", max_overflow=1)
+    yield engine
+    await engine.dispose()
+
+
+async def test_saturation_counts_overflow_in_capacity(pooled_engine):
+    assert pool_saturation(pooled_engine) == {
+        "checked_out": 0,
+        "capacity": 3,
+        "saturation": 0.0,
+        "ok": True,
+    }
+    connections = [await pooled_engine.connect() for _ in range(3)]
+    try:
+        saturated = pool_saturation(pooled_engine)
+        assert saturated["checked_out"] == 3
+        assert saturated["saturation"] == 1.0
+        assert not saturated["ok"]
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+async def test_pools_without_a_queue_are_never_saturated(sqlite_engine):
+    # StaticPool
+    assert pool_saturation(sqlite_engine)["ok"]
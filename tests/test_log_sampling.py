@@ -0,0 +1,53 @@
+"""
+request_completed sampling (user-038): errors and slow requests are always
+kept, fast ones with the route's rate, and the weight is 1 / rate.
+"""
+
+import pytest
+
+from app.infrastructure.log_sampling import RequestLogSampler
+
+
+class Draws:
+    """Returns the given values in turn, standing in for random.random."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def __call__(self):
+        return self.values.pop(0)
+
+
+def sampler(*draws, rate=0.1, route_rates=None):
+    return RequestLogSampler(
+        rate=rate, slow_request_ms=500, route_rates=route_rates, rng=Draws(*draws)
+    )
+
+
+@pytest.mark.parametrize(
+    "status_code, duration_ms, failed",
+    [(500, 10, False), (404, 10, False), (200, 10, True), (200, 500, False)],
+)
+def test_errors_and_slow_requests_are_always_kept(status_code, duration_ms, failed):
+    # no draws: the sampler must not even roll
+    assert sampler().weight("/offers", status_code, duration_ms, failed) == 1.0
+
+
+def test_fast_requests_are_kept_below_the_rate():
+    s = sampler(0.05, 0.1, 0.99)
+    assert s.weight("/offers", 200, 10) == 10.0
+    # the rate is exclusive
+    assert s.weight("/offers", 200, 10) is None
+    assert s.weight("/offers", 204, 10) is None
+
+
+def test_route_rate_overrides_the_default():
+    s = sampler(0.005, 0.5, rate=0.5, route_rates={"/health": 0.01})
+    assert s.weight("/health", 200, 1) == 100.0
+    assert s.weight("/offers", 200, 1) is None
+
+
+@pytest.mark.parametrize("rate, weight", [(1.0, 1.0), (0.0, None), (0.3, 3.333)])
+def test_rate_bounds_and_rounding(rate, weight):
+    # a draw of 0.0 keeps every line that can be sampled at all
+    assert sampler(0.0, rate=rate).weight("/offers", 200, 1) == weight
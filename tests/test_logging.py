@@ -0,0 +1,40 @@
+"""
+Background log handler (user-037): the entry point owns the listener, and
+the queue is sized when it starts.
+"""
+
+import logging
+
+from app.infrastructure import logging as app_logging
+from app.infrastructure.logging import BackgroundLogHandler, JsonLogger
+
+
+def record(message="x") -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_creating_a_logger_does_not_start_the_listener():
+    JsonLogger(service="test_logging")
+    assert not app_logging._handler.running
+
+
+def test_stopped_handler_writes_synchronously(capsys):
+    handler = BackgroundLogHandler(maxsize=1)
+    handler.emit(record({"message": "before startup"}))
+    assert '"before startup"' in capsys.readouterr().err
+    assert handler.stats()["queued"] == 0
+
+
+def test_start_sizes_the_queue_and_stop_drains_it(capsys):
+    handler = BackgroundLogHandler(maxsize=10000)
+    handler.start(maxsize=2)
+    try:
+        assert handler.stats()["capacity"] == 2
+        for n in range(3):
+            handler.emit(record({"n": n}))
+    finally:
+        handler.stop()
+    written = capsys.readouterr().err
+    # the listener may already have taken some, so at most one was dropped
+    assert handler.dropped <= 1
+    assert written.count('"n"') == 3 - handler.dropped
@@ -0,0 +1,105 @@
+"""
+ObservabilityMiddleware (user-043): request id echo / generation, the route
+label of the RED metrics and their status classes.
+"""
+
+import re
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+from app.infrastructure import metrics
+from app.infrastructure.log_sampling import RequestLogSampler
+from app.infrastructure.observability_middleware import ObservabilityMiddleware
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.lines = []
+
+    def info(self, message, payload):
+        self.lines.append((message, payload))
+
+    warning = info
+
+
+def header(response: dict, name: str) -> Optional[str]:
+    return next((v for k, v in response["headers"] if k.lower() == name.lower()), None)
+
+
+def inner_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=409)
+        if item_id < 0:
+            raise RuntimeError("boom")
+        return JSONResponse({"id": item_id}, status_code=201)
+
+    return app
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    return registry
+
+
+@pytest.fixture
+def logger():
+    return RecordingLogger()
+
+
+@pytest.fixture
+def app(registry, logger):
+    settings = SimpleNamespace(
+        APP_ENV="test",
+        DB_DETECT_N_PLUS_ONE=False,
+        DB_N_PLUS_ONE_THRESHOLD=5,
+        METRICS_ENABLED=True,
+    )
+    return ObservabilityMiddleware(
+        inner_app(), settings, logger, RequestLogSampler(rate=1.0)
+    )
+
+
+async def test_request_id_is_echoed(app, logger, asgi_request):
+    response = await asgi_request(app, "GET", "/items/1", {"X-Request-Id": "abc-123"})
+    assert header(response, "X-Request-Id") == "abc-123"
+    assert logger.lines[-1][1]["request_id"] == "abc-123"
+
+
+async def test_request_id_is_generated(app, asgi_request):
+    response = await asgi_request(app, "GET", "/items/1")
+    assert re.fullmatch(r"req_[0-9a-f]{16}", header(response, "X-Request-Id"))
+
+
+async def test_unmatched_requests_share_one_route_label(app, registry, asgi_request):
+    for path in ("/nope", "/other/path"):
+        assert (await asgi_request(app, "GET", path))["status"] == 404
+    assert registry.requests[("GET", "<unmatched>", "4xx")].count == 2
+    assert all(route == "<unmatched>" for _, route, _ in registry.requests)
+
+
+async def test_metrics_by_status_class(app, registry, logger, asgi_request):
+    await asgi_request(app, "GET", "/items/1")
+    await asgi_request(app, "GET", "/items/0")
+    with pytest.raises(RuntimeError):
+        await asgi_request(app, "GET", "/items/-1")
+
+    route = "/items/{item_id}"
+    assert {key: s.count for key, s in registry.requests.items()} == {
+        ("GET", route, "2xx"): 1,
+        ("GET", route, "4xx"): 1,
+        ("GET", route, "5xx"): 1,
+    }
+    failed = logger.lines[-1][1]
+    assert failed["http.status_code"] == 500
+    assert failed["error.type"] == "RuntimeError"
+    assert failed["http.route"] == route
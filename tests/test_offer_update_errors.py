@@ -0,0 +1,138 @@
+"""
+PATCH /offers errors: explicit nulls are rejected by the schema, and
+IntegrityErrors are mapped on SQLSTATE + constraint name (user-030).
+"""
+
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pydantic
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.domain.errors import NotFoundError, ValidationError
+from app.domain.institution import Institution
+from app.domain.offer import Offer, OfferType
+from app.infrastructure.repositories.base_repository_sqlalchemy import (
+    integrity_violation,
+)
+from app.infrastructure.repositories.institution_repository_sqlalchemy import (
+    InstitutionRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.offer_repository_sqlalchemy import (
+    OfferRepositorySQLAlchemy,
+)
+from app.presentation.schemas import OfferUpdate
+
+
+class AsyncpgError(Exception):
+    """Stands in for the asyncpg exception (structured fields only)."""
+
+    def __init__(self, constraint_name=None, column_name=None):
+        super().__init__("message text is not looked at")
+        self.constraint_name = constraint_name
+        self.column_name = column_name
+
+
+class AdaptedError(Exception):
+    """Stands in for SQLAlchemy's asyncpg adapter error (carries the SQLSTATE)."""
+
+    def __init__(self, sqlstate, cause):
+        super().__init__("message text is not looked at")
+        self.sqlstate = sqlstate
+        self.__cause__ = cause
+
+
+def integrity_error(sqlstate, **fields) -> IntegrityError:
+    return IntegrityError(
+        "UPDATE offers ...", {}, AdaptedError(sqlstate, AsyncpgError(**fields))
+    )
+
+
+def test_integrity_violation_reads_driver_fields():
+    violation = integrity_violation(
+        integrity_error("23514", constraint_name="ck_offer_deadline_after_publication")
+    )
+    assert violation.sqlstate == "23514"
+    assert violation.constraint == "ck_offer_deadline_after_publication"
+    assert violation.column is None
+
+
+@pytest.mark.parametrize("field", ["title", "type", "status", "application_deadline"])
+def test_offer_update_rejects_null_for_not_null_columns(field):
+    with pytest.raises(pydantic.ValidationError):
+        OfferUpdate(**{field: None})
+
+
+def test_offer_update_allows_null_for_nullable_columns_and_omission():
+    update = OfferUpdate(description=None, program_id=None)
+    assert update.model_dump(exclude_unset=True) == {
+        "description": None,
+        "program_id": None,
+    }
+    assert OfferUpdate(application_deadline=date(2030, 1, 1)).model_dump(
+        exclude_unset=True
+    ) == {"application_deadline": date(2030, 1, 1)}
+
+
+@pytest.fixture
+async def offer_repo(session_factory):
+    institution = await InstitutionRepositorySQLAlchemy(
+        session_factory=session_factory
+    ).create(Institution(name="Instituto"))
+    repo = OfferRepositorySQLAlchemy(session_factory=session_factory)
+    now = datetime.utcnow()
+    offer = await repo.create(
+        Offer(
+            institution_id=institution.id,
+            title="Oferta",
+            type=OfferType.COURSE,
+            publication_date=now,
+            application_deadline=now + timedelta(days=2),
+        )
+    )
+    return repo, offer
+
+
+def failing_update(error: IntegrityError):
+    async def _update_returning(*args, **kwargs):
+        raise error
+
+    return _update_returning
+
+
+@pytest.mark.parametrize(
+    "error, expected, field",
+    [
+        (
+            integrity_error(
+                "23514", constraint_name="ck_offer_deadline_after_publication"
+            ),
+            ValidationError,
+            "application_deadline",
+        ),
+        (
+            integrity_error("23503", constraint_name="offers_program_id_fkey"),
+            NotFoundError,
+            "program_id",
+        ),
+        (integrity_error("23502", column_name="title"), ValidationError, "title"),
+    ],
+)
+async def test_update_fields_maps_on_sqlstate(
+    offer_repo, monkeypatch, error, expected, field
+):
+    repo, offer = offer_repo
+    monkeypatch.setattr(repo, "_update_returning", failing_update(error))
+    with pytest.raises(expected) as info:
+        await repo.update_fields(offer.id, {field: None})
+    assert info.value.details[0]["field"] == field
+
+
+async def test_update_fields_reraises_unrecognised_violations(offer_repo, monkeypatch):
+    repo, offer = offer_repo
+    # a check constraint the repository does not know about
+    error = integrity_error("23514", constraint_name="ck_some_other_check")
+    monkeypatch.setattr(repo, "_update_returning", failing_update(error))
+    with pytest.raises(IntegrityError):
+        await repo.update_fields(offer.id, {"program_id": uuid4()})
@@ -0,0 +1,69 @@
+"""
+Statement budgets of the public endpoints (user-040): a page costs the same
+number of queries whether it holds one row or many.
+"""
+
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from app.domain.institution import Institution
+from app.domain.offer import Offer, OfferType
+from app.domain.program import Program
+from app.infrastructure.repositories.institution_repository_sqlalchemy import (
+    InstitutionRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.offer_repository_sqlalchemy import (
+    OfferRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.program_repository_sqlalchemy import (
+    ProgramRepositorySQLAlchemy,
+)
+
+ROWS = 12
+
+
+@pytest.fixture
+async def catalog(session_factory):
+    """ROWS institutions, each with one program and one offer."""
+    institutions = InstitutionRepositorySQLAlchemy(session_factory=session_factory)
+    programs = ProgramRepositorySQLAlchemy(session_factory=session_factory)
+    offers = OfferRepositorySQLAlchemy(session_factory=session_factory)
+    now = datetime.utcnow()
+    created = []
+    for n in range(ROWS):
+        institution = await institutions.create(Institution(name=f"Instituto {n}"))
+        program = await programs.create(
+            Program(institution_id=institution.id, name=f"Programa {n}")
+        )
+        created.append(
+            await offers.create(
+                Offer(
+                    institution_id=institution.id,
+                    program_id=program.id,
+                    title=f"Oferta {n}",
+                    type=OfferType.COURSE,
+                    publication_date=now,
+                    application_deadline=now + timedelta(days=30),
+                )
+            )
+        )
+    return created
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/v1/offers/", "/api/v1/institutions/", "/api/v1/programs/"]
+)
+async def test_list_endpoints_cost_one_query_per_page(api, query_budget, catalog, path):
+    with query_budget(1):
+        response = await api("GET", f"{path}?limit={ROWS}")
+    assert response["status"] == 200
+    assert len(orjson.loads(response["body"])) == ROWS
+
+
+async def test_offer_detail_costs_one_query(api, query_budget, catalog):
+    with query_budget(1):
+        response = await api("GET", f"/api/v1/offers/{catalog[0].id}")
+    assert response["status"] == 200
+    assert orjson.loads(response["body"])["title"] == "Oferta 0"
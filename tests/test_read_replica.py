@@ -0,0 +1,221 @@
+"""
+Read-your-writes with a read replica (user-027).
+
+The unit tests drive ReadYourWritesMiddleware with fake engines reporting
+WAL positions. The integration test needs a real primary + streaming
+replica (`make db-replica-up`, then `make test-replica`) and is skipped
+unless TEST_DATABASE_URL and TEST_DATABASE_READ_URL are set.
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, func, insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure import db
+from app.infrastructure.read_replica import (
+    CONSISTENCY_COOKIE,
+    CONSISTENCY_HEADER,
+    ReadYourWritesMiddleware,
+    ReplicaLagTracker,
+    mark_primary_write,
+    parse_lsn,
+    reads_pinned_to_primary,
+    start_routing,
+)
+
+
+def header(response: dict, name: str) -> Optional[str]:
+    return next((v for k, v in response["headers"] if k.lower() == name.lower()), None)
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeEngine:
+    """Answers the LSN probes with `lsn`; `fail` makes it unreachable."""
+
+    def __init__(self, lsn: str):
+        self.lsn = lsn
+        self.fail = False
+        self.queries = 0
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        if self.fail:
+            raise ConnectionRefusedError("replica down")
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.queries += 1
+        return FakeResult(self.lsn)
+
+
+async def routing_app(scope, receive, send):
+    """POST simulates a write on the primary; GET reports where reads go."""
+    if scope["method"] == "POST":
+        mark_primary_write()
+    body = b"primary" if reads_pinned_to_primary() else b"replica"
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture
+def engines():
+    return FakeEngine("0/3000060"), FakeEngine("0/3000000")
+
+
+@pytest.fixture
+def app(engines):
+    primary, replica = engines
+    return ReadYourWritesMiddleware(
+        routing_app, primary, replica, refresh_interval_ms=0
+    )
+
+
+async def test_write_returns_consistency_token(app, asgi_request):
+    response = await asgi_request(app, "POST", "/items")
+    assert header(response, CONSISTENCY_HEADER) == "0/3000060"
+    assert f"{CONSISTENCY_COOKIE}=0/3000060" in header(response, "set-cookie")
+
+
+async def test_read_with_token_stays_on_primary_while_replica_is_behind(
+    app, engines, asgi_request
+):
+    _, replica = engines
+    token = header(await asgi_request(app, "POST", "/items"), CONSISTENCY_HEADER)
+
+    behind = await asgi_request(app, "GET", "/items", {CONSISTENCY_HEADER: token})
+    assert behind["body"] == b"primary"
+    assert header(behind, "set-cookie") is None
+
+    replica.lsn = "0/3000060"
+    caught_up = await asgi_request(
+        app, "GET", "/items", {"cookie": f"{CONSISTENCY_COOKIE}={token}"}
+    )
+    assert caught_up["body"] == b"replica"
+    assert "Max-Age=0" in header(caught_up, "set-cookie")
+
+
+async def test_read_without_token_goes_to_replica(app, asgi_request):
+    response = await asgi_request(app, "GET", "/items")
+    assert response["body"] == b"replica"
+
+
+async def test_unreachable_replica_counts_as_lagging(engines):
+    _, replica = engines
+    replica.fail = True
+    tracker = ReplicaLagTracker(replica, refresh_interval_ms=0)
+    assert not await tracker.caught_up(parse_lsn("0/1"))
+
+
+async def test_tracker_caches_replica_position(engines):
+    _, replica = engines
+    tracker = ReplicaLagTracker(replica, refresh_interval_ms=60_000)
+    await tracker.caught_up(parse_lsn("0/1"))
+    await tracker.caught_up(parse_lsn("0/2"))
+    assert replica.queries == 1
+
+
+async def test_routing_session_follows_the_pin(monkeypatch):
+    replica = create_async_engine("sqlite+aiosqlite://")
+    monkeypatch.setattr(db, "read_engine", replica)
+    session = db.RoutingSession()
+    query = select(func.count())
+
+    start_routing(pin_primary=False)
+    assert session.get_bind(clause=query) is replica.sync_engine
+    start_routing(pin_primary=True)
+    assert session.get_bind(clause=query) is db.engine.sync_engine
+    await replica.dispose()
+
+
+# -----------------------------
+# Primary + streaming replica
+# -----------------------------
+
+PRIMARY_URL = os.environ.get("TEST_DATABASE_URL")
+REPLICA_URL = os.environ.get("TEST_DATABASE_READ_URL")
+
+probe = Table("rw_probe", MetaData(), Column("id", Integer, primary_key=True))
+
+
+def _asyncpg(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://")
+
+
+@pytest.fixture
+async def replicated(monkeypatch):
+    if not (PRIMARY_URL and REPLICA_URL):
+        pytest.skip("needs TEST_DATABASE_URL and TEST_DATABASE_READ_URL")
+    primary = create_async_engine(_asyncpg(PRIMARY_URL))
+    replica = create_async_engine(_asyncpg(REPLICA_URL))
+    monkeypatch.setattr(db, "engine", primary)
+    monkeypatch.setattr(db, "read_engine", replica)
+    async with primary.begin() as conn:
+        await conn.run_sync(probe.metadata.create_all)
+    # wait for the table to reach the replica before pausing replay
+    for _ in range(100):
+        async with replica.connect() as conn:
+            if await conn.scalar(text("SELECT to_regclass('rw_probe') IS NOT NULL")):
+                break
+        await asyncio.sleep(0.1)
+    async with replica.connect() as conn:
+        await conn.execute(text("SELECT pg_wal_replay_pause()"))
+    try:
+        yield primary, replica
+    finally:
+        async with replica.connect() as conn:
+            await conn.execute(text("SELECT pg_wal_replay_resume()"))
+        async with primary.begin() as conn:
+            await conn.run_sync(probe.metadata.drop_all)
+        await primary.dispose()
+        await replica.dispose()
+
+
+async def probe_app(scope, receive, send):
+    """POST inserts a row; GET /<id> says whether it is visible and where."""
+    async with db.SessionLocal() as session:
+        if scope["method"] == "POST":
+            row_id = await session.scalar(insert(probe).returning(probe.c.id))
+            await session.commit()
+            body = str(row_id)
+        else:
+            row_id = int(scope["path"].strip("/"))
+            found = await session.scalar(select(probe.c.id).where(probe.c.id == row_id))
+            in_recovery = await session.scalar(select(func.pg_is_in_recovery()))
+            body = f"{found is not None},{'replica' if in_recovery else 'primary'}"
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body.encode()})
+
+
+async def test_read_your_writes_against_a_lagging_replica(replicated, asgi_request):
+    primary, replica = replicated
+    app = ReadYourWritesMiddleware(probe_app, primary, replica, refresh_interval_ms=0)
+
+    written = await asgi_request(app, "POST", "/")
+    token = header(written, CONSISTENCY_HEADER)
+    assert token is not None
+    row_id = written["body"].decode()
+
+    with_token = await asgi_request(
+        app, "GET", f"/{row_id}", {CONSISTENCY_HEADER: token}
+    )
+    assert with_token["body"] == b"True,primary"
+
+    # replay is paused: a read without the token hits the replica and misses
+    without_token = await asgi_request(app, "GET", f"/{row_id}")
+    assert without_token["body"] == b"False,replica"
@@ -0,0 +1,116 @@
+"""
+Registration and profile updates commit once, through one unit of work
+(user-028).
+"""
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.application.candidate_profile_use_cases import UpdateCandidateProfile
+from app.application.registration_use_cases import RegisterUser
+from app.domain.errors import ConflictError
+from app.domain.role import Role
+from app.infrastructure.repositories.candidate_profile_repository_sqlalchemy import (
+    CandidateProfileRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.institution_repository_sqlalchemy import (
+    InstitutionRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.role_repository_sqlalchemy import (
+    RoleRepositorySQLAlchemy,
+    role_cache,
+)
+from app.infrastructure.repositories.sqlalchemy_models import UserModel
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
+from app.infrastructure.repositories.user_repository_sqlalchemy import (
+    UserRepositorySQLAlchemy,
+)
+
+PASSWORD = "Senha#123"
+
+
+@pytest.fixture
+async def roles(session_factory):
+    role_cache.clear()
+    await RoleRepositorySQLAlchemy(session_factory=session_factory).create(
+        Role(name="candidate")
+    )
+    yield
+    role_cache.clear()
+
+
+@pytest.fixture
+def commits(sqlite_engine):
+    """COMMITs sent on the engine while the test runs."""
+    sent = []
+
+    def _commit(conn):
+        sent.append(conn)
+
+    event.listen(sqlite_engine.sync_engine, "commit", _commit)
+    yield sent
+    event.remove(sqlite_engine.sync_engine, "commit", _commit)
+
+
+async def register(session, full_name="Maria Silva"):
+    uow = SQLAlchemyUnitOfWork(session)
+    use_case = RegisterUser(
+        UserRepositorySQLAlchemy(uow=uow),
+        InstitutionRepositorySQLAlchemy(uow=uow),
+        CandidateProfileRepositorySQLAlchemy(uow=uow),
+        RoleRepositorySQLAlchemy(uow=uow),
+        uow,
+    )
+    return await use_case.execute(
+        "maria@example.com",
+        PASSWORD,
+        ["candidate"],
+        candidate_profile={"full_name": full_name, "cpf": "12345678900"},
+    )
+
+
+async def test_registration_commits_once(session_factory, roles, commits, sql_log):
+    async with session_factory() as session:
+        stats = sql_log()
+        user = await register(session)
+    assert len(commits) == 1
+    # the profile use case takes the new user as is, no read-back
+    assert not any("FROM users" in sql for sql in stats.statements)
+
+    profiles = CandidateProfileRepositorySQLAlchemy(session_factory=session_factory)
+    profile = await profiles.get_by_user_id(user.id)
+    assert profile.full_name == "Maria Silva"
+
+
+async def test_profile_update_commits_once(session_factory, roles, commits):
+    async with session_factory() as session:
+        user = await register(session)
+    profiles = CandidateProfileRepositorySQLAlchemy(session_factory=session_factory)
+    profile = await profiles.get_by_user_id(user.id)
+    commits.clear()
+
+    async with session_factory() as session:
+        uow = SQLAlchemyUnitOfWork(session)
+        use_case = UpdateCandidateProfile(
+            CandidateProfileRepositorySQLAlchemy(uow=uow), uow
+        )
+        updated = await use_case.execute(
+            profile.id, {"full_name": "Maria S."}, profile.version
+        )
+    assert len(commits) == 1
+    assert updated.full_name == "Maria S."
+
+
+async def test_failed_profile_insert_rolls_back_the_user(
+    session_factory, roles, commits
+):
+    async with session_factory() as session:
+        # full_name is NOT NULL
+        with pytest.raises(ConflictError):
+            await register(session, full_name=None)
+    assert commits == []
+
+    async with session_factory() as session:
+        assert await session.scalar(select(func.count()).select_from(UserModel)) == 0
@@ -0,0 +1,95 @@
+"""
+Writes are a single INSERT ... RETURNING / UPDATE ... RETURNING round trip,
+with no follow-up SELECT to refresh the row (user-029).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.institution import Institution
+from app.domain.offer import Offer, OfferStatus, OfferType
+from app.domain.program import Program
+from app.infrastructure.repositories.institution_repository_sqlalchemy import (
+    InstitutionRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.offer_repository_sqlalchemy import (
+    OfferRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.program_repository_sqlalchemy import (
+    ProgramRepositorySQLAlchemy,
+)
+
+
+def assert_single_returning(stats, verb: str) -> None:
+    statements = list(stats.statements)
+    assert stats.queries == 1, statements
+    sql = statements[0].lstrip().upper()
+    assert sql.startswith(verb), statements
+    assert "RETURNING" in sql, statements
+
+
+@pytest.fixture
+async def institution(session_factory):
+    repo = InstitutionRepositorySQLAlchemy(session_factory=session_factory)
+    return await repo.create(Institution(name="Instituto", description="d"))
+
+
+@pytest.fixture
+async def program(session_factory, institution):
+    repo = ProgramRepositorySQLAlchemy(session_factory=session_factory)
+    return await repo.create(Program(institution_id=institution.id, name="Programa"))
+
+
+async def test_institution_create_and_update(session_factory, sql_log):
+    repo = InstitutionRepositorySQLAlchemy(session_factory=session_factory)
+
+    stats = sql_log()
+    created = await repo.create(Institution(name="A", description="d"))
+    assert_single_returning(stats, "INSERT")
+    assert created.id is not None and created.name == "A"
+
+    created.name = "B"
+    stats = sql_log()
+    updated = await repo.update(created)
+    assert_single_returning(stats, "UPDATE")
+    assert updated.name == "B"
+
+
+async def test_program_create_and_update(session_factory, sql_log, institution):
+    repo = ProgramRepositorySQLAlchemy(session_factory=session_factory)
+
+    stats = sql_log()
+    created = await repo.create(Program(institution_id=institution.id, name="P"))
+    assert_single_returning(stats, "INSERT")
+
+    created.name = "P2"
+    stats = sql_log()
+    updated = await repo.update(created)
+    assert_single_returning(stats, "UPDATE")
+    assert updated.name == "P2"
+
+
+async def test_offer_create_and_update(session_factory, sql_log, institution, program):
+    repo = OfferRepositorySQLAlchemy(session_factory=session_factory)
+    now = datetime.utcnow()
+    offer = Offer(
+        institution_id=institution.id,
+        program_id=program.id,
+        title="Oferta",
+        description="d",
+        type=list(OfferType)[0],
+        status=list(OfferStatus)[0],
+        publication_date=now,
+        application_deadline=now + timedelta(days=7),
+    )
+
+    stats = sql_log()
+    created = await repo.create(offer)
+    assert_single_returning(stats, "INSERT")
+    assert created.version == 1
+
+    stats = sql_log()
+    updated = await repo.update_fields(created.id, {"title": "Nova"})
+    assert_single_returning(stats, "UPDATE")
+    assert updated.title == "Nova" and updated.version == 2
@@ -0,0 +1,31 @@
+"""
+Retention statements, compiled for Postgres (the job relies on DML in CTEs,
+which SQLite does not support) (user-032).
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.retention import _plan
+
+CUTOFF = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def compiled_plan() -> dict[str, str]:
+    return {
+        model.__tablename__: str(stmt.compile(dialect=postgresql.dialect()))
+        for model, stmt in _plan(CUTOFF, batch_size=100)
+    }
+
+
+def test_users_archive_leaves_out_the_password_hash():
+    sql = compiled_plan()["users"]
+    assert "INSERT INTO users_archive" in sql
+    assert "hashed_password" not in sql
+
+
+def test_profiles_are_archived_before_their_users():
+    tables = list(compiled_plan())
+    assert tables.index("candidate_profiles") < tables.index("users")
+    assert tables.index("applications") < tables.index("candidate_profiles")
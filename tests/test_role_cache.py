@@ -0,0 +1,37 @@
+"""
+Role list cache (user-045): a miss inside a unit of work reads through the
+unit of work's session, not the module-level SessionLocal.
+"""
+
+import pytest
+
+from app.domain.role import Role
+from app.infrastructure.repositories.role_repository_sqlalchemy import (
+    RoleRepositorySQLAlchemy,
+    role_cache,
+)
+from app.infrastructure.repositories.unit_of_work_sqlalchemy import (
+    SQLAlchemyUnitOfWork,
+)
+
+
+@pytest.fixture(autouse=True)
+def cold_cache():
+    role_cache.clear()
+    yield
+    role_cache.clear()
+
+
+async def test_cache_miss_reads_through_the_unit_of_work(session_factory, sql_log):
+    await RoleRepositorySQLAlchemy(session_factory=session_factory).create(
+        Role(name="candidate")
+    )
+    async with session_factory() as session:
+        # no session_factory: the default (SessionLocal) points at Postgres
+        repo = RoleRepositorySQLAlchemy(uow=SQLAlchemyUnitOfWork(session))
+        stats = sql_log()
+        assert [r.name for r in await repo.list()] == ["candidate"]
+        assert stats.queries == 1, list(stats.statements)
+        # served from the cache now
+        assert [r.name for r in await repo.list()] == ["candidate"]
+        assert stats.queries == 1
@@ -0,0 +1,114 @@
+"""
+Chunked cascading soft delete (user-031): every level is marked, in chunks,
+with one shared deleted_at, and versioned rows get their version bumped.
+"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.domain.institution import Institution
+from app.domain.offer import Offer, OfferStatus, OfferType
+from app.domain.program import Program
+from app.infrastructure.repositories.institution_repository_sqlalchemy import (
+    InstitutionRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.offer_repository_sqlalchemy import (
+    OfferRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.program_repository_sqlalchemy import (
+    ProgramRepositorySQLAlchemy,
+)
+from app.infrastructure.repositories.soft_delete_cascade import SoftDeleteCascade
+from app.infrastructure.repositories.sqlalchemy_models import (
+    ApplicationModel,
+    CandidateProfileModel,
+    InstitutionModel,
+    OfferModel,
+    ProgramModel,
+    UserModel,
+)
+
+OFFERS = 5  # more than two chunks of 2, the last one partial
+
+
+@pytest.fixture
+async def institution_id(session_factory):
+    """One institution, one program, OFFERS offers with an application each."""
+    institution = await InstitutionRepositorySQLAlchemy(
+        session_factory=session_factory
+    ).create(Institution(name="Instituto"))
+    program = await ProgramRepositorySQLAlchemy(session_factory=session_factory).create(
+        Program(institution_id=institution.id, name="Programa")
+    )
+    offers = OfferRepositorySQLAlchemy(session_factory=session_factory)
+    now = datetime.utcnow()
+    offer_ids = []
+    for n in range(OFFERS):
+        offer = await offers.create(
+            Offer(
+                institution_id=institution.id,
+                program_id=program.id,
+                title=f"Oferta {n}",
+                type=OfferType.COURSE,
+                publication_date=now,
+                application_deadline=now + timedelta(days=30),
+            )
+        )
+        offer_ids.append(offer.id)
+
+    user_id, profile_id = uuid4(), uuid4()
+    async with session_factory() as session:
+        await session.execute(
+            insert(UserModel).values(
+                id=user_id, email="c@example.com", hashed_password="x"
+            )
+        )
+        await session.execute(
+            insert(CandidateProfileModel).values(
+                id=profile_id, user_id=user_id, full_name="Candidata"
+            )
+        )
+        await session.execute(
+            insert(ApplicationModel),
+            [
+                {"candidate_profile_id": profile_id, "offer_id": offer_id}
+                for offer_id in offer_ids
+            ],
+        )
+        await session.commit()
+    return institution.id
+
+
+async def test_institution_cascade_in_chunks(session_factory, sql_log, institution_id):
+    deleted_by = uuid4()
+    async with session_factory() as session:
+        cascade = SoftDeleteCascade(session, deleted_by, "encerrada", chunk_size=2)
+        stats = sql_log()
+        assert await cascade.institution(institution_id) == 1
+        await session.commit()
+
+    # 2 + 2 + 1 rows
+    offer_updates = sum(
+        count
+        for sql, count in stats.statements.items()
+        if sql.startswith("UPDATE offers")
+    )
+    assert offer_updates == 3
+
+    assert cascade.counts == {
+        "applications": OFFERS,
+        "offers": OFFERS,
+        "programs": 1,
+        "institutions": 1,
+    }
+    async with session_factory() as session:
+        offers = (await session.scalars(select(OfferModel))).all()
+        assert {o.status for o in offers} == {OfferStatus.DELETED}
+        assert {o.version for o in offers} == {2}
+        for model in (ApplicationModel, OfferModel, ProgramModel, InstitutionModel):
+            rows = (await session.scalars(select(model))).all()
+            assert {r.deleted_at for r in rows} == {cascade.deleted_at}, model
+            assert {r.deleted_by for r in rows} == {deleted_by}, model